@@ -0,0 +1,8 @@
+"""
+오프라인 벤치마크
+
+OpenAI·Tavily·Yahoo Finance 대신 결정적인 로컬 대체 구현을 사용하여
+도구, ReAct Agent, 웹 검색 워크플로우의 지연 시간·호출 수·메모리를 측정합니다.
+
+    python -m python.bench --help
+"""
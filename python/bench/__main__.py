@@ -0,0 +1,181 @@
+"""
+오프라인 벤치마크 실행
+
+사용법:
+    python -m python.bench                          # 전체 실행, 표 출력
+    python -m python.bench --json bench.json        # 결과 저장
+    python -m python.bench --baseline bench.json    # 기준 결과와 비교 (회귀 시 종료 코드 1)
+    python -m python.bench --latency-scale 0        # 모의 지연 없이 순수 오버헤드만 측정
+    python -m python.bench --tool-output kv         # 간결 도구 출력 형식으로 측정
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from python.bench.fakes import FakeEnvironment, FakeLatency, install_fakes
+from python.bench.scenarios import bench_react_agent, bench_tools, bench_web_search_cached, bench_web_search_graph
+from python.models.tool_output import OUTPUT_MODES, configure_tool_output
+
+
+SCENARIOS = ("tools", "react_agent", "web_search_graph", "web_search_cached")
+GRAPH_SCENARIOS = SCENARIOS[1:]
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    with install_fakes(FakeLatency().scaled(args.latency_scale)) as env:
+        return _run_scenarios(env, args)
+
+
+def _run_scenarios(env: FakeEnvironment, args: argparse.Namespace) -> Dict[str, Any]:
+    configure_tool_output(mode=args.tool_output)
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "latency_scale": args.latency_scale,
+            "iterations": args.iterations,
+            "rounds": args.rounds,
+            "concurrency": args.concurrency,
+            "tool_output": args.tool_output,
+            "scenarios": args.only or list(SCENARIOS),
+        }
+    }
+    selected = args.only or list(SCENARIOS)
+
+    if "tools" in selected:
+        report["tools"] = bench_tools(env, iterations=args.iterations)
+    if "react_agent" in selected:
+        report["react_agent"] = bench_react_agent(env, rounds=args.rounds, concurrency=args.concurrency).as_dict()
+    if "web_search_graph" in selected:
+        report["web_search_graph"] = bench_web_search_graph(env, rounds=args.rounds, concurrency=args.concurrency).as_dict()
+    if "web_search_cached" in selected:
+        report["web_search_cached"] = bench_web_search_cached(env, rounds=args.rounds, concurrency=args.concurrency).as_dict()
+    return report
+
+
+# ============================================
+# 출력
+# ============================================
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines: List[str] = []
+
+    tools = report.get("tools")
+    if tools:
+        lines.append("[도구]")
+        lines.append(f"{'도구':<26}{'콜드(ms)':>10}{'import':>9}{'웜 p50':>9}{'웜 p95':>9}{'bytes':>8}{'tokens':>8}")
+        for name, r in tools.items():
+            lines.append(
+                f"{name:<26}{r['cold_ms']:>10.1f}{r['import_ms']:>9.1f}"
+                f"{r['warm']['p50_ms']:>9.2f}{r['warm']['p95_ms']:>9.2f}"
+                f"{r['result_bytes']:>8}{r['result_tokens']:>8}"
+            )
+        lines.append("")
+
+    for scenario in GRAPH_SCENARIOS:
+        r = report.get(scenario)
+        if not r:
+            continue
+        lat = r["latency"]
+        lines.append(f"[{scenario}] 질의 {r['queries']}건, p50 {lat['p50_ms']:.1f}ms, p95 {lat['p95_ms']:.1f}ms, {r['throughput_qps']:.2f} qps")
+        lines.append(f"  {'노드':<20}{'횟수':>6}{'p50(ms)':>10}{'p95(ms)':>10}{'합계(ms)':>11}")
+        for node, s in r["nodes"].items():
+            lines.append(f"  {node:<20}{s['count']:>6}{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['total_ms']:>11.1f}")
+        calls = ", ".join(f"{k} {v}" for k, v in r["per_query"].items())
+        lines.append(f"  질의당: {calls}")
+        lines.append(f"  메모리: 최대 {r['memory']['peak_kb']}KB, 잔류 {r['memory']['retained_kb']}KB")
+        pre = r.get("pre_eval")
+        if pre:
+            lines.append(
+                f"  사전 평가: 로컬 결정 {pre['hit_rate'] * 100:.0f}% "
+                f"(충분 {pre['accepted']}, 부족 {pre['rejected']}, LLM 위임 {pre['escalated']})"
+            )
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+# ============================================
+# 기준 결과 비교
+# ============================================
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    기준 결과 대비 회귀 목록
+
+    - 지연 시간(p50): (1 + tolerance)배 초과
+    - 질의당 호출 수(LLM·도구·외부 조회): 증가
+    - 최대 메모리: (1 + tolerance)배 초과
+    """
+    regressions: List[str] = []
+
+    def check_latency(label: str, now: float, before: float) -> None:
+        if before > 0 and now > before * (1 + tolerance):
+            regressions.append(f"{label}: {before:.2f}ms → {now:.2f}ms (+{(now / before - 1) * 100:.0f}%)")
+
+    for name, r in current.get("tools", {}).items():
+        base = baseline.get("tools", {}).get(name)
+        if base:
+            check_latency(f"tools.{name} 웜 p50", r["warm"]["p50_ms"], base["warm"]["p50_ms"])
+
+    for scenario in GRAPH_SCENARIOS:
+        r, base = current.get(scenario), baseline.get(scenario)
+        if not r or not base:
+            continue
+        check_latency(f"{scenario} p50", r["latency"]["p50_ms"], base["latency"]["p50_ms"])
+        for node, s in r["nodes"].items():
+            if node in base["nodes"]:
+                check_latency(f"{scenario}.{node} p50", s["p50_ms"], base["nodes"][node]["p50_ms"])
+        for key, value in r["per_query"].items():
+            before = base["per_query"].get(key)
+            if before is not None and value > before:
+                regressions.append(f"{scenario} 질의당 {key}: {before} → {value}")
+        before_kb = base["memory"].get("peak_kb", 0)
+        if before_kb > 0 and r["memory"]["peak_kb"] > before_kb * (1 + tolerance):
+            regressions.append(f"{scenario} 최대 메모리: {before_kb}KB → {r['memory']['peak_kb']}KB")
+
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="OpenAI/Tavily/Yahoo 없이 도구와 Agent 그래프를 벤치마크합니다.")
+    parser.add_argument("--only", nargs="+", choices=SCENARIOS, help="실행할 시나리오")
+    parser.add_argument("--iterations", type=int, default=20, help="도구별 웜 호출 반복 횟수")
+    parser.add_argument("--rounds", type=int, default=3, help="그래프 질의 목록 반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=1, help="그래프 질의 동시 실행 수 (2 이상이면 ainvoke)")
+    parser.add_argument("--tool-output", choices=OUTPUT_MODES, default="verbose", help="도구 결과 출력 형식")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="모의 지연 시간 배율 (0이면 지연 없음)")
+    parser.add_argument("--json", type=Path, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", type=Path, help="비교할 기준 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="지연 시간·메모리 허용 증가율")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print(format_report(report))
+
+    if args.json:
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"결과 저장: {args.json}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        options = ("latency_scale", "iterations", "rounds", "concurrency", "tool_output", "scenarios")
+        if any(baseline.get("meta", {}).get(k) != report["meta"][k] for k in options):
+            print("주의: 기준 결과와 실행 옵션이 달라 비교가 정확하지 않을 수 있습니다.")
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("성능 회귀:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("성능 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,511 @@
+"""
+벤치마크용 로컬 대체 구현
+
+OpenAI·Tavily·Yahoo Finance를 호출하지 않고, 결정적인 결과와
+설정 가능한 지연 시간으로 같은 인터페이스를 흉내 냅니다.
+- FakeChatModel: 질문 키워드로 도구 호출을 계획하는 채팅 모델
+- SyntheticYahoo: 티커별 시드로 생성한 합성 OHLCV·기업 정보 업스트림
+- SyntheticPriceStore: 임시 디렉터리의 가격 저장소
+- DelayedSearchBackend: 지연 시간을 더한 로컬 검색 백엔드
+"""
+
+import asyncio
+import re
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict
+
+from python.models.fundamentals import FundamentalsCache, set_fundamentals_cache
+from python.models.llm_cache import LLMResponseCache, set_llm_cache
+from python.models.market_data import MarketDataClient, set_market_data
+from python.models.metrics import estimate_tokens, upstream_call
+from python.models.price_store import PriceStore, set_price_store
+from python.models.rate_limit import get_rate_limiter
+from python.models.search import LocalSearchBackend, SearchClient, set_search_backend
+
+
+# ============================================
+# 지연 시간 설정
+# ============================================
+
+@dataclass
+class FakeLatency:
+    """대체 구현별 모의 지연 시간 (초)"""
+    llm: float = 0.02
+    search: float = 0.03
+    price: float = 0.02
+    info: float = 0.01
+
+    def scaled(self, factor: float) -> "FakeLatency":
+        return FakeLatency(
+            llm=self.llm * factor,
+            search=self.search * factor,
+            price=self.price * factor,
+            info=self.info * factor
+        )
+
+
+class CallCounter:
+    """스레드 안전 호출 카운터 (대체 구현끼리 공유)"""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+# ============================================
+# 합성 시세
+# ============================================
+
+SYNTHETIC_YEARS = 5
+
+
+def _seed(ticker: str) -> int:
+    return zlib.crc32(ticker.upper().encode("utf-8"))
+
+
+def synthetic_ohlcv(
+    ticker: str,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    years: int = SYNTHETIC_YEARS
+) -> pd.DataFrame:
+    """
+    티커별로 결정적인 일봉 OHLCV (기하 랜덤 워크)
+
+    오늘 기준 최근 years년치를 같은 시드로 만든 뒤 [start, end) 구간을 잘라내므로,
+    구간을 나눠 조회해도 같은 날짜의 값은 같습니다.
+    """
+    today = pd.Timestamp.now().normalize()
+    index = pd.bdate_range(today - pd.DateOffset(years=years), today)
+    rng = np.random.default_rng(_seed(ticker))
+
+    base = 20_000.0 + (_seed(ticker) % 180_000) if ticker.upper().endswith((".KS", ".KQ")) else 50.0 + (_seed(ticker) % 400)
+    close = base * np.exp(np.cumsum(rng.normal(0.0003, 0.015, len(index))))
+    spread = np.abs(rng.normal(0.0, 0.01, len(index)))
+    open_ = close * (1 + rng.normal(0.0, 0.005, len(index)))
+    frame = pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) * (1 + spread),
+            "Low": np.minimum(open_, close) * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(100_000, 5_000_000, len(index)).astype(float),
+        },
+        index=index
+    )
+    if start is not None:
+        frame = frame[frame.index >= start]
+    if end is not None:
+        frame = frame[frame.index < end]
+    return frame
+
+
+class SyntheticPriceStore(PriceStore):
+    """
+    임시 디렉터리를 쓰는 가격 저장소
+
+    디스크 저장·증분 동기화 로직은 PriceStore 그대로 사용하므로
+    저장소 자체의 비용도 함께 측정됩니다. 내려받기는 공용 시세 계층(market_data.py)을
+    거쳐 SyntheticYahoo가 처리합니다.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, **kwargs: Any):
+        # 지정하지 않으면 임시 디렉터리 (cleanup() 또는 프로세스 종료 시 삭제)
+        self._tmpdir = None if cache_dir else tempfile.TemporaryDirectory(prefix="bench-prices-")
+        super().__init__(cache_dir=cache_dir or Path(self._tmpdir.name), **kwargs)
+
+    def cleanup(self) -> None:
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+
+def synthetic_info(ticker: str) -> Dict[str, Any]:
+    """합성 기업 정보 (yf.Ticker(...).info의 일부 필드)"""
+    rng = np.random.default_rng(_seed(ticker))
+    close = float(synthetic_ohlcv(ticker)["Close"].iloc[-1])
+    return {
+        "longName": f"{ticker} Synthetic Corp",
+        "sector": "Technology",
+        "industry": "Semiconductors",
+        "marketCap": int(close * rng.integers(10_000_000, 6_000_000_000)),
+        "trailingPE": round(float(rng.uniform(5, 40)), 2),
+        "priceToBook": round(float(rng.uniform(0.5, 8)), 2),
+        "dividendYield": round(float(rng.uniform(0, 0.04)), 4),
+        "fiftyTwoWeekHigh": round(close * 1.25, 2),
+        "fiftyTwoWeekLow": round(close * 0.75, 2),
+        "website": f"https://example.com/{ticker.lower()}",
+    }
+
+
+class SyntheticYahoo:
+    """
+    Yahoo Finance 대신 합성 시세·기업 정보를 반환하는 업스트림 (일봉만 생성)
+
+    market_data.py의 YahooUpstream 인터페이스를 구현하므로 single-flight·속도 제한·재시도는
+    실제 구현과 같은 경로를 거칩니다.
+    """
+
+    def __init__(self, latency: Optional[FakeLatency] = None, counter: Optional[CallCounter] = None):
+        self.latency = latency or FakeLatency()
+        self.counter = counter or CallCounter()
+
+    def history(
+        self,
+        ticker: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        self.counter.add("price_download")
+        time.sleep(self.latency.price)
+        return synthetic_ohlcv(ticker, start, end)
+
+    def download(
+        self,
+        tickers: Sequence[str],
+        interval: str,
+        start: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        """yf.download(group_by="ticker")와 같은 (티커, 컬럼) 2단 컬럼 형식"""
+        self.counter.add("price_download")
+        time.sleep(self.latency.price)
+        return pd.concat({t: synthetic_ohlcv(t, start) for t in tickers}, axis=1)
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        self.counter.add("info")
+        time.sleep(self.latency.info)
+        return synthetic_info(ticker)
+
+
+# ============================================
+# 검색
+# ============================================
+
+BENCH_DOCUMENTS: List[Dict[str, Any]] = [
+    {
+        "title": "삼성전자 3분기 실적 발표, 반도체 회복세",
+        "content": "삼성전자가 3분기 영업이익 개선을 발표했다. 메모리 반도체 가격 반등과 HBM 수요 증가가 주가 동향에 영향을 주고 있다. " * 3,
+        "url": "https://example.com/news/samsung-q3",
+    },
+    {
+        "title": "SK하이닉스 HBM 공급 확대",
+        "content": "SK하이닉스는 HBM 생산 능력을 늘리고 있으며 최근 주가는 사상 최고치 부근이다. " * 3,
+        "url": "https://example.com/news/hynix-hbm",
+    },
+    {
+        "title": "Apple quarterly results and iPhone demand",
+        "content": "Apple reported revenue growth driven by services. Analysts discuss AAPL stock outlook and recent news. " * 3,
+        "url": "https://example.com/news/apple-results",
+    },
+    {
+        "title": "분산 투자의 원칙",
+        "content": "분산 투자는 자산 간 상관관계를 낮춰 포트폴리오 변동성을 줄이는 주식 투자 기본 원칙이다. " * 3,
+        "url": "https://example.com/guide/diversification",
+    },
+    {
+        "title": "코스피 시장 동향",
+        "content": "외국인 순매수와 환율 하락으로 코스피가 상승했다. 반도체 대형주가 지수 상승을 이끌었다. " * 3,
+        "url": "https://example.com/news/kospi-trend",
+    },
+]
+
+
+class DelayedSearchBackend:
+    """지연 시간을 더한 로컬 검색 백엔드"""
+
+    def __init__(
+        self,
+        documents: Sequence[Dict[str, Any]] = BENCH_DOCUMENTS,
+        latency: float = 0.0,
+        counter: Optional[CallCounter] = None,
+        max_results: int = 3
+    ):
+        self.local = LocalSearchBackend(documents, max_results=max_results)
+        self.latency = latency
+        self.counter = counter or CallCounter()
+
+    def search(self, query: str, raw_content: bool = False) -> List[Dict[str, Any]]:
+        self.counter.add("search")
+        get_rate_limiter("tavily").acquire()
+        with upstream_call():
+            time.sleep(self.latency)
+            return self.local.search(query, raw_content)
+
+    async def asearch(self, query: str, raw_content: bool = False) -> List[Dict[str, Any]]:
+        self.counter.add("search")
+        await get_rate_limiter("tavily").aacquire()
+        with upstream_call():
+            await asyncio.sleep(self.latency)
+            return self.local.search(query, raw_content)
+
+
+# ============================================
+# 채팅 모델
+# ============================================
+
+# 질문 속 종목명 → 티커
+TICKER_ALIASES = {
+    "삼성전자": "005930.KS",
+    "SK하이닉스": "000660.KS",
+    "애플": "AAPL",
+    "Apple": "AAPL",
+    "테슬라": "TSLA",
+}
+
+_TICKER_PATTERN = re.compile(r"\b\d{6}\.K[SQ]\b|\b[A-Z]{2,5}\b")
+
+
+def extract_tickers(text: str) -> List[str]:
+    """질문에서 티커를 등장 순서대로 추출합니다."""
+    found = [t for t in _TICKER_PATTERN.findall(text) if t not in ("HBM", "RSI", "MACD", "ATR", "SMA", "EMA", "PER", "PBR")]
+    for alias, ticker in TICKER_ALIASES.items():
+        if alias in text:
+            found.append(ticker)
+    return list(dict.fromkeys(found))
+
+
+def plan_tool_calls(query: str, available: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    질문 키워드로 도구 호출을 계획합니다.
+
+    실제 LLM의 한 단계 병렬 도구 호출(AIMessage.tool_calls)을 흉내 냅니다.
+    """
+    tickers = extract_tickers(query) or ["005930.KS"]
+    calls: List[Dict[str, Any]] = []
+
+    def add(name: str, args: Dict[str, Any]) -> None:
+        if name in available:
+            calls.append({"name": name, "args": args})
+
+    if any(k in query for k in ("스크리닝", "종목 중", "종목군")) and "screen_universe" in available:
+        window = int(m.group(1)) if (m := re.search(r"(\d+)일", query)) else 20
+        args: Dict[str, Any] = {"window": window}
+        if "거래량" in query:
+            args["min_volume_ratio"] = 1.0
+        add("screen_universe", args)
+        return calls
+
+    if len(tickers) > 1 and "get_stock_prices" in available:
+        add("get_stock_prices", {"tickers": tickers})
+    elif "주가" in query or "가격" in query or not calls:
+        for t in tickers:
+            add("get_stock_price", {"ticker": t})
+    if "이동평균" in query:
+        window = int(m.group(1)) if (m := re.search(r"(\d+)일", query)) else 20
+        add("calculate_moving_average", {"ticker": tickers[0], "window": window})
+    if "백테스트" in query or "검증" in query:
+        add("backtest_ma_signal", {"tickers": tickers})
+    if any(k in query for k in ("기술적", "과매수", "RSI", "MACD")):
+        add("analyze_technicals", {"ticker": tickers[0]})
+    if any(k in query for k in ("기업 정보", "재무", "PER", "시가총액")):
+        add("get_company_info", {"ticker": tickers[0]})
+    if any(k in query for k in ("뉴스", "동향", "검색")):
+        add("search_web", {"query": query})
+    return calls
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    결정적인 응답을 돌려주는 채팅 모델
+
+    - 도구가 바인딩되어 있고 마지막 사람 메시지 이후 도구 결과가 없으면 도구 호출을 계획
+    - 도구 결과가 있으면 결과를 요약한 최종 답변
+    - 도구가 없으면 프롬프트에 검색 자료가 있는지에 따라 답변 (notebook 2)
+    - with_structured_output은 스키마 필드를 규칙으로 채움
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    latency: float = 0.0
+    counter: CallCounter
+    bound_tools: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-invest-chat"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "FakeChatModel":
+        names = [convert_to_openai_tool(t)["function"]["name"] for t in tools]
+        return self.model_copy(update={"bound_tools": names})
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        self._count(messages)
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        self._count(messages)
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    def _count(self, messages: List[BaseMessage]) -> None:
+        """호출 수와 프롬프트 토큰 수 (추정) 기록"""
+        self.counter.add("llm")
+        self.counter.add("llm_prompt_tokens", sum(estimate_tokens(str(m.content)) for m in messages))
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        last_human = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=-1)
+        query = str(messages[last_human].content) if last_human >= 0 else ""
+        tool_results = [m for m in messages[last_human + 1:] if isinstance(m, ToolMessage)]
+
+        if self.bound_tools and not tool_results:
+            planned = plan_tool_calls(query, self.bound_tools)
+            if planned:
+                return AIMessage(
+                    content="",
+                    tool_calls=[
+                        {**call, "id": f"call_{i}", "type": "tool_call"}
+                        for i, call in enumerate(planned)
+                    ]
+                )
+
+        if tool_results:
+            summary = "\n".join(
+                f"- {m.name}: {str(m.content).strip().splitlines()[0] if str(m.content).strip() else ''}"
+                for m in tool_results
+            )
+            return AIMessage(content=f"도구 {len(tool_results)}건의 결과를 바탕으로 답변합니다.\n{summary}")
+
+        if "[출처" in query:
+            sources = len(re.findall(r"\[출처 \d+\]", query))
+            return AIMessage(content=f"검색 자료 {sources}건의 [출처]를 인용한 답변입니다. 구체적인 수치와 날짜를 포함합니다.")
+        return AIMessage(content="일반적인 투자 원칙에 기반한 답변입니다.")
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> RunnableLambda:
+        def respond(prompt: Any) -> Any:
+            text = prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+            self.counter.add("llm")
+            self.counter.add("llm_prompt_tokens", estimate_tokens(text))
+            time.sleep(self.latency)
+            return schema(**structured_fields(schema, text))
+        return RunnableLambda(respond)
+
+
+REALTIME_KEYWORDS = ("현재", "최근", "주가", "뉴스", "동향", "오늘")
+
+
+def structured_fields(schema: Any, prompt: str) -> Dict[str, Any]:
+    """
+    스키마 필드를 규칙으로 채웁니다.
+
+    평가 스키마(score/needs_more_info)는 답변에 출처 인용이 있으면 높은 점수,
+    실시간 정보가 필요한 질문인데 출처가 없으면 추가 정보 필요로 판정합니다.
+    """
+    cited = "[출처]" in prompt or "출처를 인용" in prompt
+    realtime = any(k in prompt.split("답변:")[0] for k in REALTIME_KEYWORDS)
+    values: Dict[str, Any] = {}
+    for name, info in schema.model_fields.items():
+        if name == "score":
+            values[name] = 18 if cited or not realtime else 8
+        elif name == "needs_more_info":
+            values[name] = realtime and not cited
+        elif info.annotation is str:
+            values[name] = "벤치마크 평가"
+        elif info.annotation is bool:
+            values[name] = False
+        elif info.annotation is int:
+            values[name] = 0
+    return values
+
+
+# ============================================
+# 설치
+# ============================================
+
+@dataclass
+class FakeEnvironment:
+    """install_fakes()가 설치한 대체 구현 묶음"""
+    latency: FakeLatency
+    counter: CallCounter
+    llm: FakeChatModel
+    market_data: MarketDataClient
+    price_store: SyntheticPriceStore
+    fundamentals: FundamentalsCache
+    search: SearchClient
+    llm_cache: LLMResponseCache
+    tmpdir: Optional[tempfile.TemporaryDirectory] = None   # cache_dir를 지정하지 않았을 때의 임시 디렉터리
+
+    def close(self) -> None:
+        """LLM 응답 캐시·검색 연결을 닫고 임시 디렉터리를 삭제합니다."""
+        self.llm_cache.close()
+        self.search.close()
+        if self.tmpdir is not None:
+            self.tmpdir.cleanup()
+
+    def __enter__(self) -> "FakeEnvironment":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+# 마지막으로 설치한 대체 구현 (반환값을 보관하지 않아도 임시 디렉터리가 사용 중에 지워지지 않도록)
+_installed: Optional[FakeEnvironment] = None
+
+
+def install_fakes(
+    latency: Optional[FakeLatency] = None,
+    cache_dir: Optional[Path] = None
+) -> FakeEnvironment:
+    """
+    공용 시세 계층·가격 저장소·기본 정보 캐시·검색 클라이언트를 대체 구현으로 교체합니다.
+    대체 구현도 실제 구현처럼 제공자별 속도 제한(rate_limit.py)을 거칩니다.
+    LLM 응답 캐시는 임시 경로의 빈 캐시로 교체합니다. (사용자 캐시를 건드리지 않도록)
+
+    도구(tools.py)는 공용 인스턴스를 사용하므로 코드 변경 없이 오프라인으로 동작합니다.
+    cache_dir를 지정하지 않으면 가격 저장소와 LLM 응답 캐시를 임시 디렉터리에 두며,
+    close()(또는 with 블록 종료)나 프로세스 종료 시 삭제됩니다.
+    """
+    global _installed
+    latency = latency or FakeLatency()
+    counter = CallCounter()
+    tmpdir = None
+    if cache_dir is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="bench-")
+        cache_dir = Path(tmpdir.name)
+    _installed = FakeEnvironment(
+        latency=latency,
+        counter=counter,
+        llm=FakeChatModel(latency=latency.llm, counter=counter),
+        market_data=set_market_data(MarketDataClient(upstream=SyntheticYahoo(latency, counter))),
+        price_store=set_price_store(SyntheticPriceStore(cache_dir)),
+        fundamentals=set_fundamentals_cache(FundamentalsCache()),
+        search=set_search_backend(DelayedSearchBackend(latency=latency.search, counter=counter)),
+        llm_cache=set_llm_cache(LLMResponseCache(Path(cache_dir) / "llm_cache.sqlite3")),
+        tmpdir=tmpdir
+    )
+    return _installed
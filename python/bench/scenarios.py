@@ -0,0 +1,354 @@
+"""
+벤치마크 시나리오
+
+- 도구: tools.py의 각 도구를 콜드/웜 상태로 반복 호출
+- ReAct Agent: notebook 3의 create_react_agent 구성
+- 웹 검색 워크플로우: web_search_workflow.py (notebook 2)의 generate → qa_eval → web_search 그래프
+  (LLM 응답 캐시 없이 / 반복 질문에 응답 캐시 사용)
+
+시나리오는 지연 시간 분포, 노드별 시간, 질의당 호출 수, 메모리 사용량을 반환합니다.
+"""
+
+import asyncio
+import gc
+import statistics
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.prebuilt import create_react_agent
+
+from python.bench.fakes import FakeEnvironment
+from python.models.compaction import MessageCompactor
+from python.models.metrics import collect_calls
+from python.models.search import get_search_client
+from python.models.tools import AVAILABLE_TOOLS, TOOL_REGISTRY
+from python.models.pre_eval import PreEvaluator
+from python.models.web_search_workflow import build_graph, initial_state
+
+
+# ============================================
+# 측정 도구
+# ============================================
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """초 단위 표본 → 밀리초 요약 통계"""
+    if not samples:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "mean_ms": 0.0, "total_ms": 0.0}
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "count": len(samples),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "total_ms": round(sum(ordered) * 1000, 3),
+    }
+
+
+class NodeTimer(BaseCallbackHandler):
+    """
+    LangGraph 노드별 실행 시간 수집 콜백
+
+    노드 실행(run 이름 == langgraph_node)의 시작·종료 시각으로 노드별 시간을 기록합니다.
+    (조건부 엣지 함수는 출발 노드의 시간에 포함)
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self._runs: Dict[UUID, Any] = {}   # run_id → (이름, 시작 시각)
+        self._lock = threading.Lock()
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> None:
+        name = kwargs.get("name")
+        if name is None or name != (metadata or {}).get("langgraph_node"):
+            return
+        with self._lock:
+            self._runs[run_id] = (name, time.perf_counter())
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def _finish(self, run_id: UUID) -> None:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is None:
+                return
+            name, started = run
+            self.samples.setdefault(name, []).append(time.perf_counter() - started)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {name: summarize(samples) for name, samples in self.samples.items()}
+
+
+def measure_peak_memory(run: Callable[[], Any]) -> Dict[str, float]:
+    """run()을 한 번 실행하는 동안의 Python 힙 최대 증가량 (KB)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        run()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_kb": round((peak - baseline) / 1024, 1), "retained_kb": round((current - baseline) / 1024, 1)}
+
+
+@dataclass
+class ScenarioResult:
+    """시나리오 하나의 측정 결과"""
+    name: str
+    queries: int
+    latency: Dict[str, float]
+    throughput_qps: float
+    nodes: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    per_query: Dict[str, float] = field(default_factory=dict)
+    memory: Dict[str, float] = field(default_factory=dict)
+    pre_eval: Dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "queries": self.queries,
+            "latency": self.latency,
+            "throughput_qps": self.throughput_qps,
+            "nodes": self.nodes,
+            "per_query": self.per_query,
+            "memory": self.memory,
+            "pre_eval": self.pre_eval,
+        }
+
+
+def _per_query(before: Dict[str, int], after: Dict[str, int], queries: int) -> Dict[str, float]:
+    return {
+        name: round((after.get(name, 0) - before.get(name, 0)) / queries, 3)
+        for name in sorted(set(before) | set(after))
+    }
+
+
+# ============================================
+# 도구 벤치마크
+# ============================================
+
+# 도구별 대표 인자
+TOOL_ARGUMENTS: Dict[str, Dict[str, Any]] = {
+    "search_web": {"query": "삼성전자 최근 주가 동향"},
+    "get_stock_price": {"ticker": "005930.KS"},
+    "get_stock_prices": {"tickers": ["005930.KS", "000660.KS", "AAPL"]},
+    "calculate_moving_average": {"ticker": "005930.KS", "window": 20},
+    "analyze_technicals": {"ticker": "005930.KS"},
+    "get_company_info": {"ticker": "AAPL"},
+    "screen_universe": {"universe": "KOSPI_LARGE", "window": 20, "min_volume_ratio": 1.0},
+    "backtest_ma_signal": {"tickers": ["005930.KS", "000660.KS", "AAPL"]},
+}
+
+
+def bench_tools(env: FakeEnvironment, iterations: int = 20) -> Dict[str, Dict[str, Any]]:
+    """
+    도구별 콜드(첫 호출: 지연 import + 최초 조회)와 웜(캐시 적중) 지연 시간
+
+    웜 호출은 도구 구현 자체의 오버헤드(파싱·계산·문자열 생성)를 보여 줍니다.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for t in AVAILABLE_TOOLS:
+        args = TOOL_ARGUMENTS.get(t.name)
+        if args is None:
+            continue
+
+        with collect_calls() as calls:
+            started = time.perf_counter()
+            t.invoke(args)
+            cold = time.perf_counter() - started
+
+            warm = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                t.invoke(args)
+                warm.append(time.perf_counter() - started)
+
+        descriptor = TOOL_REGISTRY.descriptor(t.name)
+        results[t.name] = {
+            "cold_ms": round(cold * 1000, 3),
+            "import_ms": round(descriptor.import_seconds * 1000, 3) if descriptor else 0.0,
+            "cold_upstream_ms": round(calls[0].upstream_seconds * 1000, 3) if calls else 0.0,
+            "warm": summarize(warm),
+            "result_bytes": calls[-1].result_bytes if calls else 0,
+            "result_tokens": calls[-1].result_tokens if calls else 0,
+            "errors": sum(1 for c in calls if c.error),
+        }
+    return results
+
+
+# ============================================
+# ReAct Agent (notebook 3)
+# ============================================
+
+REACT_SYSTEM_PROMPT = """당신은 전문 주식 투자 분석가입니다.
+사용자의 투자 관련 질문에 데이터 기반으로 답변하고, 필요한 경우 제공된 도구를 사용하여 정보를 수집하세요."""
+
+REACT_QUERIES = [
+    "삼성전자 현재 주가 알려줘",
+    "삼성전자(005930.KS)의 현재 주가와 20일 이동평균을 비교하고, 최근 관련 뉴스도 검색해서 투자 의견을 제시해줘",
+    "Apple(AAPL) 주식의 기업 정보와 최근 3개월 주가 추이를 분석해줘",
+    "삼성전자와 SK하이닉스 주가를 비교해줘",
+    "AAPL이 과매수 구간인지 기술적 지표로 분석해줘",
+]
+
+
+def build_react_agent(env: FakeEnvironment, tools: Optional[Sequence[Any]] = None):
+    """notebook 3과 같은 구성의 ReAct Agent (대체 LLM 사용, 메시지 압축 포함)"""
+    return create_react_agent(
+        env.llm, list(tools or AVAILABLE_TOOLS), prompt=REACT_SYSTEM_PROMPT, pre_model_hook=MessageCompactor()
+    )
+
+
+def bench_react_agent(
+    env: FakeEnvironment,
+    queries: Sequence[str] = REACT_QUERIES,
+    rounds: int = 3,
+    concurrency: int = 1
+) -> ScenarioResult:
+    """ReAct Agent 질의 지연 시간·처리량·노드별 시간"""
+    agent = build_react_agent(env)
+    inputs = [{"messages": [{"role": "user", "content": q}]} for q in queries] * rounds
+    return _run_graph("react_agent", env, agent, inputs, concurrency=concurrency)
+
+
+# ============================================
+# 웹 검색 워크플로우 (notebook 2)
+# ============================================
+
+def build_web_search_graph(
+    env: FakeEnvironment,
+    use_response_cache: bool = False,
+    pre_evaluator: Optional[PreEvaluator] = None
+):
+    """notebook 2 워크플로우 (web_search_workflow.build_graph)를 대체 LLM·검색으로 구성"""
+    return build_graph(
+        llm=env.llm,
+        search=get_search_client().search,
+        response_cache=env.llm_cache,
+        use_response_cache=use_response_cache,
+        pre_evaluator=pre_evaluator
+    )
+
+
+WEB_SEARCH_QUERIES = [
+    "2025년 10월 삼성전자 주식의 현재 주가와 최근 동향을 알려줘",
+    "주식 투자 시 분산 투자의 중요성에 대해 설명해줘",
+    "SK하이닉스 최근 뉴스 알려줘",
+    "코스피 오늘 시장 동향은?",
+]
+
+
+def bench_web_search_graph(
+    env: FakeEnvironment,
+    queries: Sequence[str] = WEB_SEARCH_QUERIES,
+    rounds: int = 3,
+    concurrency: int = 1
+) -> ScenarioResult:
+    """웹 검색 워크플로우 질의 지연 시간·처리량·노드별 시간"""
+    pre_evaluator = PreEvaluator()
+    graph = build_web_search_graph(env, pre_evaluator=pre_evaluator)
+    inputs = [initial_state(q) for q in queries] * rounds
+    result = _run_graph("web_search_graph", env, graph, inputs, concurrency=concurrency)
+    result.pre_eval = pre_evaluator.stats.as_dict()
+    return result
+
+
+def bench_web_search_cached(
+    env: FakeEnvironment,
+    queries: Sequence[str] = WEB_SEARCH_QUERIES,
+    rounds: int = 3,
+    concurrency: int = 1
+) -> ScenarioResult:
+    """
+    같은 질문이 반복될 때의 웹 검색 워크플로우 (LLM 응답 캐시 사용)
+
+    빈 캐시에서 시작하므로 첫 라운드는 미스, 이후 라운드는 적중합니다.
+    """
+    env.llm_cache.clear()
+    pre_evaluator = PreEvaluator()
+    graph = build_web_search_graph(env, use_response_cache=True, pre_evaluator=pre_evaluator)
+    inputs = [initial_state(q) for q in queries] * rounds
+    result = _run_graph("web_search_cached", env, graph, inputs, concurrency=concurrency)
+    result.pre_eval = pre_evaluator.stats.as_dict()
+    return result
+
+
+# ============================================
+# 공통 실행
+# ============================================
+
+def _run_graph(
+    name: str,
+    env: FakeEnvironment,
+    graph: Any,
+    inputs: Sequence[Dict[str, Any]],
+    concurrency: int = 1
+) -> ScenarioResult:
+    """
+    그래프에 입력을 차례로(또는 concurrency개씩 동시에) 넣고 측정합니다.
+
+    첫 입력으로 한 번 워밍업하고, 메모리는 측정 후 별도 1회 실행으로 구합니다.
+    """
+    graph.invoke(inputs[0])
+
+    timer = NodeTimer()
+    config = {"callbacks": [timer], "recursion_limit": 50}
+    before = env.counter.snapshot()
+    with collect_calls() as tool_calls:
+        started = time.perf_counter()
+        if concurrency <= 1:
+            latencies = []
+            for item in inputs:
+                t0 = time.perf_counter()
+                graph.invoke(item, config=config)
+                latencies.append(time.perf_counter() - t0)
+        else:
+            latencies = asyncio.run(_ainvoke_all(graph, inputs, config, concurrency))
+        elapsed = time.perf_counter() - started
+    after = env.counter.snapshot()
+
+    per_query = _per_query(before, after, len(inputs))
+    per_query["tool_calls"] = round(len(tool_calls) / len(inputs), 3)
+    per_query["tool_result_tokens"] = round(sum(c.result_tokens for c in tool_calls) / len(inputs), 1)
+
+    return ScenarioResult(
+        name=name,
+        queries=len(inputs),
+        latency=summarize(latencies),
+        throughput_qps=round(len(inputs) / elapsed, 3) if elapsed else 0.0,
+        nodes=timer.report(),
+        per_query=per_query,
+        memory=measure_peak_memory(lambda: graph.invoke(inputs[-1])),
+    )
+
+
+async def _ainvoke_all(graph: Any, inputs: Sequence[Dict[str, Any]], config: Dict[str, Any], concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(item: Dict[str, Any]) -> float:
+        async with semaphore:
+            t0 = time.perf_counter()
+            await graph.ainvoke(item, config=config)
+            return time.perf_counter() - t0
+
+    return list(await asyncio.gather(*(one(item) for item in inputs)))
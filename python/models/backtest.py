@@ -0,0 +1,229 @@
+"""
+이동평균 신호 백테스트
+
+calculate_moving_average는 "현재가 > N일 이동평균"이면 상승 추세, 아니면 하락 추세로 판단합니다.
+이 모듈은 같은 신호(trend_signal)를 과거 이력 전체에 적용해
+"상승 추세일 때만 보유" 전략이 실제로 효과가 있었는지 검증합니다.
+
+- 종목 × 이동평균 기간 × 보유 기간 격자를 NumPy 벡터 연산으로 한 번에 계산
+- 신호는 보유 기간마다 종가 기준으로 다시 판단하고, 다음 봉부터 반영 (미래 정보 없음)
+- 포지션이 바뀔 때마다 편도 거래 비용(bp)을 차감
+- 총수익률·연환산 수익률·적중률(보유 구간 중 수익 구간 비율)·최대 낙폭·거래 수·보유 비중,
+  그리고 같은 구간의 매수 후 보유 수익률을 보고합니다.
+
+가격은 가격 저장소(price_store.py)의 로컬 이력을 사용하므로 반복 실행 시 추가 다운로드가 없습니다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from python.models.price_store import PriceStore
+from python.models.screener import PricePanel, load_panel
+
+
+TRADING_DAYS = 252
+DEFAULT_WINDOWS = (5, 20, 60)
+DEFAULT_HOLDS = (1, 5, 20)
+DEFAULT_COST_BPS = 10.0     # 편도 거래 비용 (0.1%)
+
+
+def trend_signal(close: Any, ma: Any) -> Any:
+    """상승 추세 신호: 현재가가 이동평균 위 (스칼라·배열 모두 가능, NaN은 False)"""
+    return close > ma
+
+
+def moving_averages(close: np.ndarray, windows: Sequence[int]) -> np.ndarray:
+    """
+    (종목 수, 봉 수) 종가의 이동평균 (기간 수, 종목 수, 봉 수)
+
+    누적합으로 모든 기간을 한 번에 계산하며, 구간에 NaN이 있으면 NaN입니다.
+    """
+    n, t = close.shape
+    filled = np.nan_to_num(close, nan=0.0)
+    sums = np.concatenate([np.zeros((n, 1)), np.cumsum(filled, axis=1)], axis=1)
+    counts = np.concatenate([np.zeros((n, 1)), np.cumsum(np.isfinite(close), axis=1)], axis=1)
+
+    result = np.full((len(windows), n, t), np.nan)
+    for i, w in enumerate(windows):
+        if w > t:
+            continue
+        window_sum = sums[:, w:] - sums[:, :-w]
+        complete = counts[:, w:] - counts[:, :-w] == w
+        result[i, :, w - 1:] = np.where(complete, window_sum / w, np.nan)
+    return result
+
+
+# ============================================
+# 결과
+# ============================================
+
+@dataclass
+class GridSummary:
+    """(이동평균 기간, 보유 기간) 한 칸의 종목 평균"""
+    window: int
+    hold: int
+    total_return: float       # 평균 총수익률 (%)
+    ann_return: float         # 평균 연환산 수익률 (%)
+    excess_return: float      # 평균 초과수익률 (총수익률 - 매수 후 보유, %p)
+    hit_rate: float           # 평균 적중률 (%)
+    max_drawdown: float       # 평균 최대 낙폭 (%)
+    trades: float             # 평균 진입 횟수
+    exposure: float           # 평균 보유 비중 (%)
+
+
+@dataclass
+class BacktestResult:
+    """
+    격자 백테스트 결과
+
+    종목별 지표 배열의 모양은 (이동평균 기간 수, 보유 기간 수, 종목 수)이며
+    수익률·낙폭·적중률·보유 비중은 비율(0.1 = 10%)입니다.
+    """
+    tickers: List[str]
+    windows: List[int]
+    holds: List[int]
+    cost_bps: float
+    bars: int                           # 평가 봉 수 (가장 긴 이동평균이 계산되는 시점부터)
+    end_date: str
+    total_return: np.ndarray
+    ann_return: np.ndarray
+    hit_rate: np.ndarray
+    max_drawdown: np.ndarray
+    trades: np.ndarray
+    exposure: np.ndarray
+    buy_hold: np.ndarray                # (종목 수,)
+    missing: List[str] = field(default_factory=list)
+
+    def summary(self) -> List[GridSummary]:
+        """격자 칸별 종목 평균 (이동평균 기간 → 보유 기간 순)"""
+        rows = []
+        with np.errstate(invalid="ignore"):
+            for i, w in enumerate(self.windows):
+                for j, h in enumerate(self.holds):
+                    rows.append(GridSummary(
+                        window=w,
+                        hold=h,
+                        total_return=_mean_pct(self.total_return[i, j]),
+                        ann_return=_mean_pct(self.ann_return[i, j]),
+                        excess_return=_mean_pct(self.total_return[i, j] - self.buy_hold),
+                        hit_rate=_mean_pct(self.hit_rate[i, j]),
+                        max_drawdown=_mean_pct(self.max_drawdown[i, j]),
+                        trades=float(np.nanmean(self.trades[i, j])),
+                        exposure=_mean_pct(self.exposure[i, j]),
+                    ))
+        return rows
+
+    def best(self) -> List[Dict[str, Any]]:
+        """종목별 총수익률이 가장 높은 (이동평균 기간, 보유 기간)"""
+        flat = self.total_return.reshape(-1, len(self.tickers))
+        picks = np.argmax(np.nan_to_num(flat, nan=-np.inf), axis=0)
+        result = []
+        for k, ticker in enumerate(self.tickers):
+            i, j = divmod(int(picks[k]), len(self.holds))
+            result.append({
+                "ticker": ticker,
+                "window": self.windows[i],
+                "hold": self.holds[j],
+                "total_return_pct": float(flat[picks[k], k] * 100),
+                "buy_hold_pct": float(self.buy_hold[k] * 100),
+            })
+        return result
+
+
+def _mean_pct(values: np.ndarray) -> float:
+    return float(np.nanmean(values) * 100) if np.isfinite(values).any() else float("nan")
+
+
+# ============================================
+# 백테스트
+# ============================================
+
+def backtest_panel(
+    panel: PricePanel,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    holds: Sequence[int] = DEFAULT_HOLDS,
+    cost_bps: float = DEFAULT_COST_BPS
+) -> BacktestResult:
+    """
+    패널 전체에 대해 이동평균 신호 전략을 격자로 백테스트합니다.
+
+    모든 칸은 가장 긴 이동평균이 처음 계산되는 봉부터 같은 구간을 평가하며,
+    보유 기간 h마다 종가로 신호를 판단해 다음 h봉 동안 보유(신호 True) 또는 현금(False)입니다.
+    """
+    windows = sorted(set(int(w) for w in windows))
+    holds = sorted(set(int(h) for h in holds))
+    if not windows or windows[0] < 2:
+        raise ValueError("이동평균 기간은 2 이상이어야 합니다.")
+    if not holds or holds[0] < 1:
+        raise ValueError("보유 기간은 1 이상이어야 합니다.")
+    if not panel.tickers:
+        raise ValueError("백테스트할 데이터가 없습니다.")
+
+    close = panel.close
+    start = windows[-1] - 1
+    length = close.shape[1] - 1 - start
+    if length < 1:
+        raise ValueError(f"데이터가 부족합니다. 최소 {windows[-1] + 1}봉의 데이터가 필요합니다.")
+
+    signal = trend_signal(close[None, :, :], moving_averages(close, windows))    # (W, N, T)
+    t_idx = np.arange(start, start + length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily = np.nan_to_num(close[:, t_idx + 1] / close[:, t_idx] - 1, nan=0.0)   # (N, L)
+    log_daily = np.log1p(daily)
+    cost = cost_bps / 10_000
+
+    shape = (len(windows), len(holds), len(panel.tickers))
+    total, ann, hit, mdd, trades, exposure = (np.empty(shape) for _ in range(6))
+
+    for j, h in enumerate(holds):
+        # 보유 구간 시작 봉의 신호를 구간 내내 유지
+        starts = np.arange(0, length, h)
+        position = signal[:, :, start + (np.arange(length) // h) * h].astype(np.float64)   # (W, N, L)
+        turnover = np.abs(np.diff(position, axis=-1, prepend=0.0))
+        net = position * daily - turnover * cost
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_net = np.log1p(net)
+            equity = np.exp(np.cumsum(log_net, axis=-1))
+            peak = np.maximum(np.maximum.accumulate(equity, axis=-1), 1.0)
+            total[:, j] = equity[..., -1] - 1
+            ann[:, j] = equity[..., -1] ** (TRADING_DAYS / length) - 1
+            mdd[:, j] = (equity / peak - 1).min(axis=-1)
+
+            interval = np.expm1(np.add.reduceat(log_net, starts, axis=-1))          # (W, N, K)
+            held = signal[:, :, start + starts]
+            hit[:, j] = (held & (interval > 0)).sum(axis=-1) / held.sum(axis=-1)
+
+        trades[:, j] = ((turnover > 0) & (position > 0)).sum(axis=-1)
+        exposure[:, j] = position.mean(axis=-1)
+
+    return BacktestResult(
+        tickers=list(panel.tickers),
+        windows=windows,
+        holds=holds,
+        cost_bps=cost_bps,
+        bars=length,
+        end_date=max(panel.last_dates),
+        total_return=total,
+        ann_return=ann,
+        hit_rate=hit,
+        max_drawdown=mdd,
+        trades=trades,
+        exposure=exposure,
+        buy_hold=np.expm1(log_daily.sum(axis=-1)),
+        missing=list(panel.missing)
+    )
+
+
+def backtest(
+    tickers: Sequence[str],
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    holds: Sequence[int] = DEFAULT_HOLDS,
+    period: str = "2y",
+    cost_bps: float = DEFAULT_COST_BPS,
+    store: Optional[PriceStore] = None
+) -> BacktestResult:
+    """가격 저장소의 period 구간으로 백테스트합니다. (앞부분은 이동평균 계산에 사용)"""
+    return backtest_panel(load_panel(tickers, period=period, store=store), windows, holds, cost_bps)
@@ -0,0 +1,402 @@
+"""
+배치 질의 실행
+
+야간 리포트처럼 수백 개의 질문을 컴파일된 Agent 그래프로 동시에 처리합니다.
+
+- 전역 동시 실행 한도 (asyncio.Semaphore)
+- 제공자별 토큰 버킷 속도 제한 (LLM / Tavily / Yahoo, rate_limit.py)
+- 결과를 끝나는 대로 JSONL에 한 줄씩 기록 (중단 후 --resume으로 이어서 실행)
+- 처리량과 지연 시간 분포(p50/p95/p99) 보고
+
+사용법:
+    python -m python.models.batch queries.txt --out results.jsonl --concurrency 8 \\
+        --llm-rps 5 --tavily-rps 2 --yahoo-rps 4
+    python -m python.models.batch queries.txt --agent web_search --offline   # API 키 없이 시험
+    python -m python.models.batch queries.txt --record runs.jsonl.gz          # 실행 녹화 (cassette.py)
+
+질문 파일은 한 줄에 질문 하나(빈 줄·#으로 시작하는 줄 무시) 또는 {"query": ...} JSONL입니다.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from python.models.checkpoint import thread_config
+from python.models.rate_limit import PROVIDERS, configure_rate_limits, get_rate_limiter, rate_limit_stats
+from python.models.tool_output import OUTPUT_MODES, configure_tool_output
+
+
+DEFAULT_CONCURRENCY = 8
+
+# notebook 3의 시스템 프롬프트
+REACT_SYSTEM_PROMPT = """당신은 전문 주식 투자 분석가입니다.
+
+**역할**:
+- 사용자의 투자 관련 질문에 데이터 기반으로 답변
+- 필요한 경우 제공된 도구를 사용하여 정보 수집
+- 실시간 주가, 기업 정보, 뉴스 등을 활용한 분석
+
+**사용 가능한 도구**:
+1. search_web: 웹에서 최신 뉴스 및 정보 검색
+2. get_stock_price: 특정 주식의 가격 정보 조회
+3. get_stock_prices: 여러 종목 가격 일괄 조회 (종목 비교 시 사용)
+4. calculate_moving_average: 기술적 분석 (이동평균선)
+5. analyze_technicals: 여러 기술적 지표를 한 번에 분석 (과매수/이동평균 위치 등)
+6. get_company_info: 기업 기본 정보 및 재무 지표
+7. screen_universe: 종목군 전체를 이동평균·괴리율·거래량 조건으로 한 번에 스크리닝
+8. backtest_ma_signal: 이동평균 신호의 과거 성과 검증 (수익률·적중률·최대 낙폭)
+
+**답변 원칙**:
+- 구체적인 데이터와 출처를 제시
+- 불확실한 정보는 명시
+- 투자 결정은 사용자의 몫임을 강조
+"""
+
+
+# ============================================
+# 결과
+# ============================================
+
+@dataclass
+class BatchResult:
+    """질문 하나의 실행 결과 (JSONL 한 줄)"""
+    index: int
+    query: str
+    answer: Optional[str]
+    error: Optional[str]
+    latency_ms: float
+    started_at: float
+    thread_id: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def latency_summary(samples: Sequence[float]) -> Dict[str, float]:
+    """초 단위 표본 → 밀리초 분포 (p50/p95/p99/최대/평균)"""
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "mean_ms": 0.0}
+    ordered = sorted(samples)
+
+    def pct(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] * 1000, 1)
+
+    return {
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 1),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 1),
+    }
+
+
+@dataclass
+class BatchReport:
+    """배치 실행 요약"""
+    total: int
+    succeeded: int
+    failed: int
+    skipped: int
+    elapsed_seconds: float
+    latency: Dict[str, float]
+    rate_limits: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    @property
+    def throughput_qps(self) -> float:
+        return round((self.succeeded + self.failed) / self.elapsed_seconds, 3) if self.elapsed_seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "throughput_qps": self.throughput_qps}
+
+    def format(self) -> str:
+        lat = self.latency
+        lines = [
+            f"질의 {self.total}건: 성공 {self.succeeded}, 실패 {self.failed}, 건너뜀 {self.skipped}",
+            f"소요 {self.elapsed_seconds:.1f}s, 처리량 {self.throughput_qps:.2f} qps",
+            f"지연 시간: p50 {lat['p50_ms']:.0f}ms, p95 {lat['p95_ms']:.0f}ms, "
+            f"p99 {lat['p99_ms']:.0f}ms, 최대 {lat['max_ms']:.0f}ms",
+        ]
+        for provider, s in self.rate_limits.items():
+            if s["acquired"]:
+                lines.append(
+                    f"속도 제한 {provider}: {s['acquired']}회, 대기 {s['waits']}회 (총 {s['waited_seconds']:.1f}s)"
+                )
+        return "\n".join(lines)
+
+
+# ============================================
+# 입력·출력
+# ============================================
+
+def read_queries(path: Path) -> List[str]:
+    """질문 파일 읽기 ("-"면 표준 입력)"""
+    text = sys.stdin.read() if str(path) == "-" else Path(path).read_text(encoding="utf-8")
+    queries = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            line = json.loads(line)["query"]
+        queries.append(line)
+    return queries
+
+
+def completed_indexes(path: Path) -> Set[int]:
+    """기존 결과 파일에서 성공한 질문 번호 (--resume용)"""
+    done: Set[int] = set()
+    if not Path(path).exists():
+        return done
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue   # 중단 시 잘린 마지막 줄
+        if record.get("error") is None:
+            done.add(record["index"])
+    return done
+
+
+def react_input(query: str) -> Dict[str, Any]:
+    return {"messages": [{"role": "user", "content": query}]}
+
+
+def react_answer(state: Dict[str, Any]) -> str:
+    return str(state["messages"][-1].content)
+
+
+def workflow_answer(state: Dict[str, Any]) -> str:
+    if state.get("error"):
+        raise RuntimeError(state["error"])
+    return state.get("answer", "")
+
+
+# ============================================
+# 실행
+# ============================================
+
+async def arun_batch(
+    graph: Any,
+    queries: Sequence[str],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    make_input: Callable[[str], Dict[str, Any]] = react_input,
+    extract_answer: Callable[[Dict[str, Any]], str] = react_answer,
+    output: Optional[Path] = None,
+    skip: Iterable[int] = (),
+    config: Optional[Dict[str, Any]] = None,
+    thread_prefix: Optional[str] = None,
+    on_result: Optional[Callable[[BatchResult], None]] = None,
+    recorder: Optional[Any] = None
+) -> BatchReport:
+    """
+    질문들을 최대 concurrency개씩 동시에 그래프로 실행합니다.
+
+    Args:
+        graph: 컴파일된 그래프 (ainvoke 지원)
+        queries: 질문 목록 (결과의 index는 이 목록의 위치)
+        make_input / extract_answer: 질문 → 그래프 입력, 최종 상태 → 답변
+        output: 결과를 끝나는 순서대로 추가 기록할 JSONL 경로
+        skip: 건너뛸 질문 번호 (이전 실행에서 성공한 것 등)
+        thread_prefix: 지정하면 질문마다 thread_id "{prefix}-{index}"로 실행
+            (체크포인터가 있는 그래프라면 실패한 질문을 resume()으로 재개 가능)
+        recorder: CassetteRecorder (cassette.py). 질문마다 카세트 한 건을 녹화
+            (그래프는 recorder로 감싼 LLM·도구로 만들어야 함)
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency는 1 이상이어야 합니다.")
+    skipped = set(skip)
+    semaphore = asyncio.Semaphore(concurrency)
+    results: List[BatchResult] = []
+
+    with (open(output, "a", encoding="utf-8") if output else nullcontext()) as sink:
+
+        async def run_one(index: int, query: str) -> None:
+            async with semaphore:
+                thread_id = f"{thread_prefix}-{index}" if thread_prefix else None
+                run_config = {**(config or {}), **(thread_config(thread_id) if thread_id else {})}
+                started_at = time.time()
+                t0 = time.perf_counter()
+                recording = (
+                    recorder.recording(query, index=index, thread_id=thread_id)
+                    if recorder is not None else nullcontext()
+                )
+                try:
+                    with recording:
+                        state = await graph.ainvoke(make_input(query), run_config)
+                    answer, error = extract_answer(state), None
+                except Exception as e:
+                    answer, error = None, f"{type(e).__name__}: {e}"
+                result = BatchResult(
+                    index=index, query=query, answer=answer, error=error,
+                    latency_ms=round((time.perf_counter() - t0) * 1000, 1),
+                    started_at=started_at, thread_id=thread_id
+                )
+            results.append(result)
+            if sink is not None:
+                sink.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+                sink.flush()
+            if on_result is not None:
+                on_result(result)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            run_one(i, q) for i, q in enumerate(queries) if i not in skipped
+        ))
+        elapsed = time.perf_counter() - started
+
+    return BatchReport(
+        total=len(queries),
+        succeeded=sum(1 for r in results if r.ok),
+        failed=sum(1 for r in results if not r.ok),
+        skipped=len(queries) - len(results),
+        elapsed_seconds=round(elapsed, 3),
+        latency=latency_summary([r.latency_ms / 1000 for r in results]),
+        rate_limits=rate_limit_stats()
+    )
+
+
+def run_batch(graph: Any, queries: Sequence[str], **kwargs: Any) -> BatchReport:
+    """arun_batch의 동기 진입점 (실행 중인 이벤트 루프가 없을 때)"""
+    from python.models.search import get_search_client
+
+    async def main() -> BatchReport:
+        try:
+            return await arun_batch(graph, queries, **kwargs)
+        finally:
+            # 이 루프에서 만든 검색 연결 풀을 닫음
+            await get_search_client().aclose()
+
+    return asyncio.run(main())
+
+
+# ============================================
+# CLI
+# ============================================
+
+AGENTS = ("react", "web_search")
+
+
+def build_react_agent(llm: Any, tools: Optional[Sequence[Any]] = None) -> Any:
+    """notebook 3 구성의 ReAct Agent (시스템 프롬프트 + 메시지 압축)"""
+    from langgraph.prebuilt import create_react_agent
+    from python.models.compaction import MessageCompactor
+    from python.models.tools import AVAILABLE_TOOLS
+
+    return create_react_agent(
+        llm, list(tools or AVAILABLE_TOOLS), prompt=REACT_SYSTEM_PROMPT, pre_model_hook=MessageCompactor()
+    )
+
+
+def build_agent(
+    kind: str,
+    model: str,
+    offline: bool = False,
+    recorder: Optional[Any] = None
+) -> Tuple[Any, Callable, Callable]:
+    """
+    (그래프, make_input, extract_answer)를 만듭니다.
+
+    LLM에는 공용 "llm" 토큰 버킷을 rate_limiter로 지정합니다.
+    offline=True면 벤치마크용 대체 구현(가짜 LLM, 로컬 검색, 합성 시세)을 사용합니다.
+    recorder(CassetteRecorder)를 주면 LLM과 도구를 녹화용으로 감쌉니다. (react만 지원)
+    """
+    if offline:
+        from python.bench.fakes import install_fakes
+        llm = install_fakes().llm.model_copy(update={"rate_limiter": get_rate_limiter("llm")})
+    else:
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(model=model, temperature=0, rate_limiter=get_rate_limiter("llm"))
+
+    if kind == "react":
+        from python.models.tools import AVAILABLE_TOOLS
+        if recorder is not None:
+            return build_react_agent(recorder.wrap_model(llm), recorder.wrap_tools(AVAILABLE_TOOLS)), react_input, react_answer
+        return build_react_agent(llm), react_input, react_answer
+
+    if recorder is not None:
+        raise ValueError("실행 녹화는 react Agent만 지원합니다.")
+
+    from python.models.web_search_workflow import build_graph, initial_state
+    return build_graph(llm=llm), initial_state, workflow_answer
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="질문 파일을 Agent로 일괄 실행하고 결과를 JSONL로 기록합니다.")
+    parser.add_argument("queries", type=Path, help="질문 파일 (한 줄에 하나 또는 {\"query\": ...} JSONL, -는 표준 입력)")
+    parser.add_argument("--out", type=Path, default=Path("batch_results.jsonl"), help="결과 JSONL 경로")
+    parser.add_argument("--agent", choices=AGENTS, default="react", help="react: notebook 3, web_search: notebook 2")
+    parser.add_argument("--model", default="gpt-4o-mini", help="OpenAI 모델 이름")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 실행할 질문 수")
+    for provider in PROVIDERS:
+        parser.add_argument(f"--{provider}-rps", type=float, help=f"{provider} 초당 요청 수 한도")
+        parser.add_argument(f"--{provider}-burst", type=float, help=f"{provider} 버스트 허용량")
+    parser.add_argument("--tool-output", choices=OUTPUT_MODES, help="도구 결과 출력 형식 (kv/json은 LLM 토큰 절약)")
+    parser.add_argument("--resume", action="store_true", help="결과 파일에서 성공한 질문은 건너뛰고 이어서 기록")
+    parser.add_argument("--offline", action="store_true", help="API 키 없이 대체 구현으로 실행")
+    parser.add_argument("--report", type=Path, help="요약을 저장할 JSON 경로")
+    parser.add_argument("--record", type=Path, help="실행을 녹화할 카세트 파일 (.jsonl.gz, react만)")
+    args = parser.parse_args(argv)
+    if args.record and args.agent != "react":
+        parser.error("--record는 --agent react에서만 사용할 수 있습니다.")
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    rates = {p: getattr(args, f"{p}_rps") for p in PROVIDERS if getattr(args, f"{p}_rps") is not None}
+    bursts = {p: getattr(args, f"{p}_burst") for p in PROVIDERS if getattr(args, f"{p}_burst") is not None}
+    if rates:
+        configure_rate_limits(burst=bursts, **rates)
+    if args.tool_output:
+        configure_tool_output(mode=args.tool_output)
+
+    queries = read_queries(args.queries)
+    skip = completed_indexes(args.out) if args.resume else set()
+    if not args.resume and args.out.exists():
+        args.out.unlink()
+
+    recorder = None
+    if args.record:
+        from python.models.cassette import CassetteRecorder
+        recorder = CassetteRecorder(args.record)
+    graph, make_input, extract_answer = build_agent(args.agent, args.model, offline=args.offline, recorder=recorder)
+
+    done = [0]
+
+    def progress(result: BatchResult) -> None:
+        done[0] += 1
+        status = "✅" if result.ok else f"❌ {result.error}"
+        print(f"[{done[0]}/{len(queries) - len(skip)}] #{result.index} {result.latency_ms:.0f}ms {status}", file=sys.stderr)
+
+    report = run_batch(
+        graph, queries,
+        concurrency=args.concurrency,
+        make_input=make_input,
+        extract_answer=extract_answer,
+        output=args.out,
+        skip=skip,
+        on_result=progress,
+        recorder=recorder
+    )
+    print(report.format())
+    print(f"결과: {args.out}")
+    if recorder is not None:
+        print(f"녹화: {args.record} ({recorder.recorded}건)")
+    if args.report:
+        args.report.write_text(json.dumps(report.as_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0 if report.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
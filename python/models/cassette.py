@@ -0,0 +1,685 @@
+"""
+Agent 실행 녹화·재생 (카세트)
+
+운영 중 이상한 답변이 나와도 다시 실행하면 비용이 들고 Yahoo·Tavily·LLM이 다른 값을 돌려주므로
+같은 상황을 재현할 수 없습니다.
+
+- CassetteRecorder: LLM 응답(Thought/Action)과 도구 결과(Observation)를 실행 단위로 모아
+  압축 JSONL 카세트 파일에 한 줄씩 기록합니다. (idris/Domain/ReActAgent.idr의 ReActTrace,
+  도구 결과는 ToolExecution 필드)
+- CassettePlayer: 기록된 응답과 도구 결과를 그대로 돌려주는 LLM·도구로 현재 그래프를 다시 실행합니다.
+  네트워크 없이 메모리 속도로 동작하므로 수백 건의 회귀 검사가 몇 초 안에 끝납니다.
+
+재생 시 LLM 입력 지문이 녹화 때와 다르면(시스템 프롬프트·메시지 압축·도구 출력 형식 변경 등)
+input_drift로, 기록에 없는 도구 호출은 tool_misses로, 답변이 다르면 실패로 보고합니다.
+
+사용법:
+    recorder = CassetteRecorder("runs.jsonl.gz")
+    agent = build_react_agent(recorder.wrap_model(llm), recorder.wrap_tools(AVAILABLE_TOOLS))
+    with recorder.recording(query):
+        agent.invoke({"messages": [{"role": "user", "content": query}]})
+
+    python -m python.models.cassette show runs.jsonl.gz --id 3f2a...
+    python -m python.models.cassette replay runs.jsonl.gz
+"""
+
+import argparse
+import contextvars
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import BaseTool
+from pydantic import ConfigDict
+
+from python.models.batch import latency_summary, react_answer, react_input
+from python.models.compaction import message_tokens
+from python.models.llm_cache import fingerprint, model_id
+from python.models.memo import ToolMemoizer
+from python.models.tools import ToolExecution
+
+
+# ============================================
+# 설정
+# ============================================
+
+DEFAULT_CASSETTE_PATH = Path(
+    os.environ.get("INVEST_CACHE_DIR", Path.home() / ".cache" / "invest-with-langgraph")
+) / "cassettes.jsonl.gz"
+
+
+def messages_fingerprint(messages: Sequence[BaseMessage]) -> str:
+    """LLM 입력 지문 (메시지 종류·내용·도구 호출만 사용, 메시지 id 등은 제외)"""
+    payload = [
+        [m.type, str(m.content), [[c["name"], c.get("args", {})] for c in getattr(m, "tool_calls", None) or []]]
+        for m in messages
+    ]
+    return fingerprint(json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str))
+
+
+# ============================================
+# 카세트
+# ============================================
+
+@dataclass
+class TraceStep:
+    """ReActStep: thought(추론) / action(도구 호출) / observation(도구 결과) / answer(최종 답변)"""
+    kind: str
+    text: str = ""
+    tool_name: Optional[str] = None
+    arguments: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class Cassette:
+    """
+    실행 한 건의 녹화
+
+    responses: LLM 응답 순서대로 {"content", "tool_calls", "input", "input_tokens"}
+        (content는 메시지 내용 그대로(문자열 또는 콘텐츠 블록 목록), input은 LLM 입력 지문)
+    observations: 도구 결과 {"tool_name", "arguments", "result", "error", "created_at"}
+        (arguments는 스키마 기본값까지 채운 정규화 인자)
+    """
+    query: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    model: str = ""
+    created_at: float = field(default_factory=time.time)
+    responses: List[Dict[str, Any]] = field(default_factory=list)
+    observations: List[Dict[str, Any]] = field(default_factory=list)
+    answer: Optional[str] = None
+    error: Optional[str] = None
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def final_text(self) -> Optional[str]:
+        """도구 호출이 없는 마지막 LLM 응답"""
+        for response in reversed(self.responses):
+            if not response["tool_calls"]:
+                # 재생 답변(react_answer)과 같은 방식으로 문자열화
+                return str(response["content"])
+        return None
+
+    def trace(self) -> List[TraceStep]:
+        """Thought → Action → Observation 순서의 ReActTrace"""
+        unused = list(self.observations)
+        steps: List[TraceStep] = []
+        for response in self.responses:
+            if not response["tool_calls"]:
+                steps.append(TraceStep("answer", str(response["content"])))
+                continue
+            if response["content"]:
+                steps.append(TraceStep("thought", str(response["content"])))
+            for call in response["tool_calls"]:
+                steps.append(TraceStep("action", tool_name=call["name"], arguments=call["args"]))
+            for call in response["tool_calls"]:
+                observation = _take_observation(unused, call["name"], call["args"])
+                text = "(기록 없음)" if observation is None else observation["result"] or observation["error"] or ""
+                steps.append(TraceStep("observation", text, tool_name=call["name"]))
+        return steps
+
+    def executions(self) -> List[ToolExecution]:
+        """도구 결과를 ToolExecution으로 (ToolHistory 복원용, 예외로 끝난 호출 제외)"""
+        return [
+            ToolExecution(
+                tool_name=o["tool_name"], arguments=o["arguments"], result=o["result"],
+                call_id=f"cassette_{self.id}_{i}", created_at=o["created_at"]
+            )
+            for i, o in enumerate(self.observations)
+            if o["error"] is None
+        ]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Cassette":
+        return cls(**data)
+
+
+def _take_observation(
+    observations: List[Dict[str, Any]],
+    tool_name: str,
+    arguments: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """같은 도구의 같은 인자(정규화 인자에 포함되는 호출 인자)인 첫 기록을 꺼냅니다."""
+    for i, o in enumerate(observations):
+        if o["tool_name"] == tool_name and all(o["arguments"].get(k) == v for k, v in arguments.items()):
+            return observations.pop(i)
+    return None
+
+
+def format_trace(cassette: Cassette, limit: int = 300) -> str:
+    """카세트 한 건의 ReActTrace를 사람이 읽을 수 있게"""
+    lines = [
+        f"카세트 {cassette.id} ({time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(cassette.created_at))}, {cassette.model})",
+        f"질문: {cassette.query}",
+    ]
+    for step in cassette.trace():
+        text = step.text if len(step.text) <= limit else step.text[:limit] + "…"
+        if step.kind == "action":
+            lines.append(f"  Action: {step.tool_name}({json.dumps(step.arguments, ensure_ascii=False)})")
+        elif step.kind == "observation":
+            lines.append(f"  Observation[{step.tool_name}]: " + text.strip().replace("\n", "\n    "))
+        elif step.kind == "thought":
+            lines.append(f"  Thought: {text}")
+        else:
+            lines.append(f"  Answer: {text}")
+    if cassette.error:
+        lines.append(f"  오류: {cassette.error}")
+    return "\n".join(lines)
+
+
+# ============================================
+# 카세트 파일
+# ============================================
+
+class CassetteFile:
+    """
+    카세트 JSONL 파일 (.gz면 gzip 압축)
+
+    카세트 한 건이 한 줄이며 끝나는 대로 추가 기록합니다.
+    중단으로 잘린 마지막 줄은 읽을 때 건너뜁니다.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or DEFAULT_CASSETTE_PATH)
+        self._lock = threading.Lock()
+
+    def _open(self, mode: str) -> TextIO:
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    def append(self, cassette: Cassette) -> None:
+        line = json.dumps(cassette.as_dict(), ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._open("a") as f:
+                f.write(line + "\n")
+
+    def __iter__(self) -> Iterator[Cassette]:
+        if not self.path.exists():
+            return
+        with self._open("r") as f:
+            try:
+                for line in f:
+                    try:
+                        yield Cassette.from_dict(json.loads(line))
+                    except (json.JSONDecodeError, TypeError):
+                        continue
+            except (EOFError, gzip.BadGzipFile):
+                return   # 기록 중 중단된 gzip 멤버
+
+    def load(self) -> List[Cassette]:
+        return list(self)
+
+
+# ============================================
+# 녹화
+# ============================================
+
+# 현재 녹화 중인 실행 (recording() 블록, 그래프 노드·도구 스레드까지 전달)
+_recording: contextvars.ContextVar[Optional[Cassette]] = contextvars.ContextVar(
+    "invest_cassette_recording", default=None
+)
+
+
+class RecordingChatModel(BaseChatModel):
+    """감싼 LLM의 응답을 현재 녹화 중인 카세트에 기록하는 채팅 모델"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: Any
+    model_name: str = ""
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette-recording"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "RecordingChatModel":
+        return self.model_copy(update={"inner": self.inner.bind_tools(tools, **kwargs)})
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        # 콜백은 이 모델의 실행으로 이미 보고되므로 감싼 LLM에는 전달하지 않음
+        message = self.inner.invoke(messages, {"callbacks": []}, stop=stop, **kwargs)
+        self._record(messages, message)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        message = await self.inner.ainvoke(messages, {"callbacks": []}, stop=stop, **kwargs)
+        self._record(messages, message)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _record(self, messages: List[BaseMessage], message: BaseMessage) -> None:
+        cassette = _recording.get()
+        if cassette is None:
+            return
+        cassette.model = cassette.model or self.model_name
+        cassette.responses.append({
+            # 콘텐츠 블록 목록도 JSON으로 저장되므로 그대로 (재생 시 같은 메시지가 되도록)
+            "content": message.content,
+            "tool_calls": [
+                {"name": c["name"], "args": c.get("args", {}), "id": c.get("id")}
+                for c in getattr(message, "tool_calls", None) or []
+            ],
+            "input": messages_fingerprint(messages),
+            "input_tokens": sum(message_tokens(m) for m in messages),
+        })
+
+
+class CassetteRecorder:
+    """
+    실행 녹화기
+
+    wrap_model()·wrap_tools()로 감싼 LLM·도구를 쓰는 그래프를 recording() 블록 안에서 실행하면
+    블록이 끝날 때 카세트 한 건이 파일에 기록됩니다. 블록 밖의 호출은 기록하지 않습니다.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.file = CassetteFile(path)
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def wrap_model(self, llm: Any) -> RecordingChatModel:
+        return RecordingChatModel(inner=llm, model_name=model_id(llm))
+
+    def wrap_tools(self, tools: Sequence[BaseTool]) -> List[BaseTool]:
+        return [self._wrap(t) for t in tools]
+
+    @contextmanager
+    def recording(self, query: str, **meta: Any) -> Iterator[Cassette]:
+        """
+        블록 안의 LLM 응답·도구 결과를 카세트 한 건으로 기록합니다.
+
+        답변은 블록 안에서 cassette.answer로 지정할 수 있고, 지정하지 않으면 마지막 텍스트 응답입니다.
+        """
+        cassette = Cassette(query=query, meta=meta)
+        token = _recording.set(cassette)
+        try:
+            yield cassette
+        except BaseException as e:
+            cassette.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _recording.reset(token)
+            if cassette.answer is None and cassette.error is None:
+                cassette.answer = cassette.final_text()
+            self.file.append(cassette)
+            with self._lock:
+                self.recorded += 1
+
+    def _wrap(self, tool: BaseTool) -> BaseTool:
+        original = tool
+
+        def record(arguments: Dict[str, Any], result: Optional[str], error: Optional[str]) -> None:
+            cassette = _recording.get()
+            if cassette is not None:
+                cassette.observations.append({
+                    "tool_name": original.name,
+                    "arguments": arguments,
+                    "result": result,
+                    "error": error,
+                    "created_at": time.time(),
+                })
+
+        def func(**kwargs: Any) -> str:
+            arguments = ToolMemoizer.canonical_arguments(original, kwargs)
+            try:
+                result = original.invoke(arguments)
+            except Exception as e:
+                record(arguments, None, f"{type(e).__name__}: {e}")
+                raise
+            record(arguments, result, None)
+            return result
+
+        async def coroutine(**kwargs: Any) -> str:
+            arguments = ToolMemoizer.canonical_arguments(original, kwargs)
+            try:
+                result = await original.ainvoke(arguments)
+            except Exception as e:
+                record(arguments, None, f"{type(e).__name__}: {e}")
+                raise
+            record(arguments, result, None)
+            return result
+
+        return tool.model_copy(update={"func": func, "coroutine": coroutine})
+
+
+# ============================================
+# 재생
+# ============================================
+
+class ReplayMismatch(RuntimeError):
+    """녹화에 없는 LLM 호출 (응답 소진) 또는 엄격 모드의 기록 없는 도구 호출"""
+
+
+class ReplaySession:
+    """카세트 한 건의 재생 상태"""
+
+    def __init__(self, cassette: Cassette, strict: bool = False):
+        self.cassette = cassette
+        self.strict = strict
+        self.responses_used = 0
+        self.input_drift = 0          # LLM 입력 지문이 녹화와 다른 호출 수
+        self.tool_misses = 0          # 기록에 없는 도구 호출 수
+        self._observations = list(cassette.observations)
+        self._lock = threading.Lock()
+
+    @property
+    def unused_observations(self) -> int:
+        return len(self._observations)
+
+    def next_response(self, messages: Sequence[BaseMessage]) -> AIMessage:
+        with self._lock:
+            if self.responses_used >= len(self.cassette.responses):
+                raise ReplayMismatch(
+                    f"녹화된 LLM 응답 {len(self.cassette.responses)}개를 모두 사용했습니다. (카세트 {self.cassette.id})"
+                )
+            response = self.cassette.responses[self.responses_used]
+            self.responses_used += 1
+            if messages_fingerprint(messages) != response["input"]:
+                self.input_drift += 1
+        return AIMessage(
+            content=response["content"],
+            tool_calls=[
+                {"name": c["name"], "args": c["args"], "id": c["id"], "type": "tool_call"}
+                for c in response["tool_calls"]
+            ]
+        )
+
+    def observation(self, tool_name: str, arguments: Dict[str, Any]) -> str:
+        with self._lock:
+            recorded = _take_observation(self._observations, tool_name, arguments)
+            if recorded is None:
+                self.tool_misses += 1
+        if recorded is None:
+            message = f"녹화에 없는 도구 호출입니다: {tool_name}({json.dumps(arguments, ensure_ascii=False)})"
+            if self.strict:
+                raise ReplayMismatch(message)
+            return f"[재생 데이터 없음] {message}"
+        if recorded["error"] is not None:
+            raise RuntimeError(recorded["error"])
+        return recorded["result"]
+
+
+# 현재 재생 중인 카세트 (playing() 블록)
+_replaying: contextvars.ContextVar[Optional[ReplaySession]] = contextvars.ContextVar(
+    "invest_cassette_replaying", default=None
+)
+
+
+def _current_session() -> ReplaySession:
+    session = _replaying.get()
+    if session is None:
+        raise ReplayMismatch("재생 중인 카세트가 없습니다. CassettePlayer.playing() 블록 안에서 실행하세요.")
+    return session
+
+
+class ReplayChatModel(BaseChatModel):
+    """현재 재생 중인 카세트의 LLM 응답을 순서대로 돌려주는 채팅 모델"""
+
+    model_name: str = "cassette-replay"
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette-replay"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ReplayChatModel":
+        return self
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=_current_session().next_response(messages))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+
+@dataclass
+class ReplayResult:
+    """카세트 한 건의 재생 결과"""
+    cassette_id: str
+    query: str
+    answer: Optional[str]
+    expected: Optional[str]
+    error: Optional[str]
+    responses_used: int
+    responses_total: int
+    input_drift: int
+    tool_misses: int
+    unused_observations: int
+    latency_ms: float
+
+    @property
+    def ok(self) -> bool:
+        """같은 답변에 도달했고 녹화된 응답을 모두, 기록된 도구 결과만으로 사용"""
+        return (
+            self.error is None
+            and self.answer == self.expected
+            and self.responses_used == self.responses_total
+            and self.tool_misses == 0
+        )
+
+    @property
+    def status(self) -> str:
+        if not self.ok:
+            return "fail"
+        return "drift" if self.input_drift else "pass"
+
+    def problems(self) -> List[str]:
+        problems = []
+        if self.error:
+            problems.append(self.error)
+        if self.answer != self.expected:
+            problems.append("답변이 녹화와 다릅니다")
+        if self.error is None and self.responses_used != self.responses_total:
+            problems.append(f"LLM 응답 {self.responses_used}/{self.responses_total}개 사용")
+        if self.tool_misses:
+            problems.append(f"기록에 없는 도구 호출 {self.tool_misses}건")
+        if self.input_drift:
+            problems.append(f"LLM 입력 변경 {self.input_drift}회")
+        return problems
+
+
+@dataclass
+class RegressionReport:
+    """카세트 묶음의 재생 회귀 검사 결과"""
+    total: int
+    passed: int
+    drifted: int            # 답변은 같지만 LLM 입력이 녹화와 다름 (프롬프트·압축·도구 출력 변경)
+    failed: int
+    skipped: int            # 녹화 당시 오류로 끝난 실행
+    elapsed_seconds: float
+    latency: Dict[str, float]
+    results: List[ReplayResult] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["results"] = [
+            {**asdict(r), "status": r.status, "problems": r.problems()}
+            for r in self.results if r.status != "pass"
+        ]
+        return data
+
+    def format(self, max_problems: int = 10) -> str:
+        lines = [
+            f"카세트 {self.total}건: 통과 {self.passed}, 입력 변경 {self.drifted}, 실패 {self.failed}, 건너뜀 {self.skipped}",
+            f"소요 {self.elapsed_seconds:.2f}s, 재생 지연 p50 {self.latency['p50_ms']:.1f}ms, p95 {self.latency['p95_ms']:.1f}ms",
+        ]
+        problems = [r for r in self.results if r.status != "pass"]
+        for r in problems[:max_problems]:
+            lines.append(f"  [{r.status}] {r.cassette_id} {r.query[:40]}: {'; '.join(r.problems())}")
+        if len(problems) > max_problems:
+            lines.append(f"  ... 외 {len(problems) - max_problems}건")
+        return "\n".join(lines)
+
+
+class CassettePlayer:
+    """
+    카세트 재생기
+
+    model()·wrap_tools()로 그래프를 한 번 만들고, playing() 블록(또는 replay())마다
+    카세트 한 건의 응답·도구 결과를 돌려줍니다. 도구 결과는 (도구, 정규화된 인자)로 찾으며,
+    strict=True면 기록에 없는 도구 호출을 예외로 처리합니다.
+    """
+
+    def __init__(self, strict: bool = False):
+        self.strict = strict
+
+    def model(self) -> ReplayChatModel:
+        return ReplayChatModel()
+
+    def wrap_tools(self, tools: Sequence[BaseTool]) -> List[BaseTool]:
+        return [self._wrap(t) for t in tools]
+
+    @contextmanager
+    def playing(self, cassette: Cassette) -> Iterator[ReplaySession]:
+        session = ReplaySession(cassette, strict=self.strict)
+        token = _replaying.set(session)
+        try:
+            yield session
+        finally:
+            _replaying.reset(token)
+
+    def replay(
+        self,
+        graph: Any,
+        cassette: Cassette,
+        make_input: Callable[[str], Dict[str, Any]] = react_input,
+        extract_answer: Callable[[Dict[str, Any]], str] = react_answer
+    ) -> ReplayResult:
+        """카세트 한 건을 그래프로 다시 실행합니다."""
+        answer, error = None, None
+        started = time.perf_counter()
+        with self.playing(cassette) as session:
+            try:
+                answer = extract_answer(graph.invoke(make_input(cassette.query)))
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        return ReplayResult(
+            cassette_id=cassette.id,
+            query=cassette.query,
+            answer=answer,
+            expected=cassette.answer,
+            error=error,
+            responses_used=session.responses_used,
+            responses_total=len(cassette.responses),
+            input_drift=session.input_drift,
+            tool_misses=session.tool_misses,
+            unused_observations=session.unused_observations,
+            latency_ms=round((time.perf_counter() - started) * 1000, 2)
+        )
+
+    def regress(
+        self,
+        graph: Any,
+        cassettes: Sequence[Cassette],
+        make_input: Callable[[str], Dict[str, Any]] = react_input,
+        extract_answer: Callable[[Dict[str, Any]], str] = react_answer
+    ) -> RegressionReport:
+        """카세트들을 순서대로 재생하고 회귀 검사 결과를 모읍니다."""
+        started = time.perf_counter()
+        playable = [c for c in cassettes if c.error is None]
+        results = [self.replay(graph, c, make_input, extract_answer) for c in playable]
+        return RegressionReport(
+            total=len(cassettes),
+            passed=sum(1 for r in results if r.status == "pass"),
+            drifted=sum(1 for r in results if r.status == "drift"),
+            failed=sum(1 for r in results if r.status == "fail"),
+            skipped=len(cassettes) - len(playable),
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+            latency=latency_summary([r.latency_ms / 1000 for r in results]),
+            results=results
+        )
+
+    def _wrap(self, tool: BaseTool) -> BaseTool:
+        original = tool
+
+        def func(**kwargs: Any) -> str:
+            arguments = ToolMemoizer.canonical_arguments(original, kwargs)
+            return _current_session().observation(original.name, arguments)
+
+        async def coroutine(**kwargs: Any) -> str:
+            return func(**kwargs)
+
+        return tool.model_copy(update={"func": func, "coroutine": coroutine})
+
+
+# ============================================
+# CLI
+# ============================================
+
+def _select(cassettes: List[Cassette], ids: Optional[List[str]], limit: Optional[int]) -> List[Cassette]:
+    if ids:
+        cassettes = [c for c in cassettes if any(c.id.startswith(i) for i in ids)]
+    return cassettes[-limit:] if limit else cassettes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from python.models.batch import build_react_agent
+    from python.models.tools import AVAILABLE_TOOLS
+
+    parser = argparse.ArgumentParser(description="녹화된 Agent 실행(카세트)을 보거나 네트워크 없이 재생합니다.")
+    parser.add_argument("command", choices=("show", "replay"), help="show: ReAct 단계 출력, replay: 재생 회귀 검사")
+    parser.add_argument("path", type=Path, nargs="?", default=DEFAULT_CASSETTE_PATH, help="카세트 파일")
+    parser.add_argument("--id", action="append", help="카세트 id (앞부분만 써도 됨, 여러 번 지정 가능)")
+    parser.add_argument("--limit", type=int, help="마지막 N건만")
+    parser.add_argument("--strict", action="store_true", help="기록에 없는 도구 호출과 LLM 입력 변경도 실패로 처리")
+    parser.add_argument("--json", type=Path, help="재생 결과를 저장할 JSON 경로")
+    args = parser.parse_args(argv)
+
+    cassettes = _select(CassetteFile(args.path).load(), args.id, args.limit)
+    if not cassettes:
+        print(f"카세트가 없습니다: {args.path}", file=sys.stderr)
+        return 1
+
+    if args.command == "show":
+        print("\n\n".join(format_trace(c) for c in cassettes))
+        return 0
+
+    player = CassettePlayer(strict=args.strict)
+    graph = build_react_agent(player.model(), player.wrap_tools(AVAILABLE_TOOLS))
+    report = player.regress(graph, cassettes)
+    print(report.format())
+    if args.json:
+        args.json.write_text(json.dumps(report.as_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+    if report.failed or (args.strict and report.drifted):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,541 @@
+"""
+영구 체크포인트 + 도구 결과 재생
+
+여러 반복을 거친 실행이 마지막 단계에서 실패하면(타임아웃 등) 그때까지의
+검색·LLM·도구 호출이 모두 사라집니다.
+
+- SqliteCheckpointSaver: LangGraph 그래프 상태를 로컬 SQLite에 저장하는 체크포인터
+  (langgraph-checkpoint-sqlite 없이 표준 라이브러리 sqlite3만 사용)
+- resume(): thread_id로 마지막 체크포인트부터 실패한 단계만 다시 실행
+- ToolReplay: 스레드별로 완료된 도구 결과를 같은 DB에 기록하고, resume()으로 재개할 때만
+  같은 (도구, 인자) 호출은 실행하지 않고 기록된 결과를 돌려줌 (ToolHistory에도 기록)
+
+사용 예:
+    saver = SqliteCheckpointSaver()
+    replay = ToolReplay(saver)
+    agent = create_react_agent(llm, replay.wrap_tools(AVAILABLE_TOOLS), checkpointer=saver)
+    config = thread_config("my-thread")
+    agent.invoke({"messages": [...]}, config)   # 실패하면
+    resume(agent, "my-thread")                  # 실패한 단계부터 재개
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig, ensure_config
+from langchain_core.tools import BaseTool
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from python.models.memo import ToolMemoizer
+from python.models.tools import ToolExecution, ToolHistory, call_key, is_error_result
+
+
+# ============================================
+# 설정
+# ============================================
+
+DEFAULT_CHECKPOINT_PATH = Path(
+    os.environ.get("INVEST_CACHE_DIR", Path.home() / ".cache" / "invest-with-langgraph")
+) / "checkpoints.sqlite3"
+
+
+def new_thread_id() -> str:
+    return uuid.uuid4().hex
+
+
+# 재개 실행임을 도구에 알리는 configurable 키 (ToolReplay는 이 값이 참일 때만 기록된 결과를 재생)
+REPLAY_KEY = "replay_tools"
+
+
+def thread_config(thread_id: str, **configurable: Any) -> RunnableConfig:
+    """thread_id를 담은 실행 설정"""
+    return {"configurable": {"thread_id": thread_id, **configurable}}
+
+
+def resume_config(thread_id: str, **configurable: Any) -> RunnableConfig:
+    """실패한 실행을 재개할 때의 설정 (기록된 도구 결과 재생)"""
+    return thread_config(thread_id, **{REPLAY_KEY: True, **configurable})
+
+
+# ============================================
+# 체크포인터
+# ============================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id     TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_id     TEXT,
+    type          TEXT,
+    checkpoint    BLOB,
+    metadata_type TEXT,
+    metadata      BLOB,
+    created_at    REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id     TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel       TEXT NOT NULL,
+    version       TEXT NOT NULL,
+    type          TEXT NOT NULL,
+    value         BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id     TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id       TEXT NOT NULL,
+    idx           INTEGER NOT NULL,
+    channel       TEXT NOT NULL,
+    type          TEXT,
+    value         BLOB,
+    task_path     TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS tool_observations (
+    thread_id  TEXT NOT NULL,
+    call_key   TEXT NOT NULL,
+    tool_name  TEXT NOT NULL,
+    arguments  TEXT NOT NULL,
+    result     TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, call_key)
+);
+"""
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    SQLite 기반 LangGraph 체크포인터 (스레드·프로세스 안전)
+
+    InMemorySaver와 같은 저장 구조(체크포인트 / 채널 값 blob / 대기 중 쓰기)를
+    테이블로 옮긴 구현입니다. 비동기 메서드는 동기 메서드를 그대로 호출합니다.
+    (로컬 파일 쓰기만 하므로 이벤트 루프를 오래 막지 않음)
+    """
+
+    def __init__(self, path: Optional[Path] = None, *, serde: Optional[SerializerProtocol] = None):
+        super().__init__(serde=serde)
+        self.path = Path(path) if path else DEFAULT_CHECKPOINT_PATH
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ---------- 조회 ----------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """config의 checkpoint_id (없으면 스레드의 최신) 체크포인트를 반환합니다."""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        with self._lock:
+            conn = self._connect()
+            if checkpoint_id:
+                row = conn.execute(
+                    "SELECT checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata "
+                    "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata "
+                    "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns)
+                ).fetchone()
+            if row is None:
+                return None
+            return self._tuple(conn, thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[CheckpointTuple]:
+        """조건에 맞는 체크포인트를 최신순으로 반환합니다."""
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if config["configurable"].get("checkpoint_ns") is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(config["configurable"]["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata "
+                f"FROM checkpoints {where} ORDER BY checkpoint_id DESC",
+                params
+            ).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                if filter:
+                    metadata = self.serde.loads_typed((row[4], row[5]))
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                results.append(self._tuple(conn, thread_id, checkpoint_ns, row))
+        yield from results
+
+    # ---------- 저장 ----------
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        """체크포인트와 새 버전의 채널 값을 저장합니다."""
+        c = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+
+        blobs = []
+        for channel, version in new_versions.items():
+            type_, value = self.serde.dumps_typed(values[channel]) if channel in values else ("empty", b"")
+            blobs.append((thread_id, checkpoint_ns, channel, str(version), type_, value))
+        type_, data = self.serde.dumps_typed(c)
+        metadata_type, metadata_data = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        with self._lock:
+            conn = self._connect()
+            conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blobs)
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id, checkpoint_ns, checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_, data, metadata_type, metadata_data, time.time()
+                )
+            )
+            conn.commit()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        """태스크의 중간 쓰기를 저장합니다. (실패한 단계의 성공한 태스크 결과 보존)"""
+        configurable = config["configurable"]
+        # 일반 쓰기는 처음 것을 유지, 특수 쓰기(오류·인터럽트 등)는 덮어씀
+        regular, special = [], []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self.serde.dumps_typed(value)
+            row = (
+                configurable["thread_id"], configurable.get("checkpoint_ns", ""), configurable["checkpoint_id"],
+                task_id, WRITES_IDX_MAP.get(channel, idx), channel, type_, data, task_path
+            )
+            (special if channel in WRITES_IDX_MAP else regular).append(row)
+        with self._lock:
+            conn = self._connect()
+            conn.executemany("INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", regular)
+            conn.executemany("INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", special)
+            conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        """스레드의 체크포인트·쓰기·도구 결과를 모두 삭제합니다."""
+        with self._lock:
+            conn = self._connect()
+            for table in ("checkpoints", "blobs", "writes", "tool_observations"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            conn.commit()
+
+    def get_next_version(self, current: Optional[str], channel: None = None) -> str:
+        """문자열 정렬이 가능한 단조 증가 버전 (InMemorySaver와 같은 형식)"""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ---------- 비동기 ----------
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        return self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return self.delete_thread(thread_id)
+
+    # ---------- 도구 결과 ----------
+
+    def put_observation(self, thread_id: str, execution: ToolExecution, result: str) -> None:
+        """스레드에서 완료된 도구 결과를 기록합니다."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO tool_observations VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id, call_key(execution.tool_name, execution.arguments), execution.tool_name,
+                    json.dumps(execution.arguments, ensure_ascii=False, default=str), result, execution.created_at
+                )
+            )
+            conn.commit()
+
+    def get_observation(self, thread_id: str, tool_name: str, arguments: Dict[str, Any]) -> Optional[ToolExecution]:
+        """스레드에서 같은 (도구, 인자)로 완료된 결과를 찾습니다."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT tool_name, arguments, result, created_at FROM tool_observations "
+                "WHERE thread_id = ? AND call_key = ?",
+                (thread_id, call_key(tool_name, arguments))
+            ).fetchone()
+        return _execution(row) if row else None
+
+    def observations(self, thread_id: str) -> List[ToolExecution]:
+        """스레드의 완료된 도구 결과 (완료 순)"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT tool_name, arguments, result, created_at FROM tool_observations "
+                "WHERE thread_id = ? ORDER BY created_at",
+                (thread_id,)
+            ).fetchall()
+        return [_execution(row) for row in rows]
+
+    def thread_ids(self) -> List[str]:
+        """체크포인트가 있는 스레드 목록 (최근 순)"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT thread_id FROM checkpoints GROUP BY thread_id ORDER BY MAX(created_at) DESC"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---------- 내부 ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _tuple(self, conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str, row: Sequence[Any]) -> CheckpointTuple:
+        checkpoint_id, parent_id, type_, data, metadata_type, metadata = row
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, data))
+
+        channel_values: Dict[str, Any] = {}
+        for channel, version in checkpoint["channel_versions"].items():
+            blob = conn.execute(
+                "SELECT type, value FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, str(version))
+            ).fetchone()
+            if blob and blob[0] != "empty":
+                channel_values[channel] = self.serde.loads_typed((blob[0], blob[1]))
+
+        writes = conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+
+        return CheckpointTuple(
+            config=thread_config(thread_id, checkpoint_ns=checkpoint_ns, checkpoint_id=checkpoint_id),
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                thread_config(thread_id, checkpoint_ns=checkpoint_ns, checkpoint_id=parent_id)
+                if parent_id else None
+            ),
+            pending_writes=[(task_id, channel, self.serde.loads_typed((t, v))) for task_id, channel, t, v in writes]
+        )
+
+
+def _execution(row: Sequence[Any]) -> ToolExecution:
+    tool_name, arguments, result, created_at = row
+    return ToolExecution(
+        tool_name=tool_name,
+        arguments=json.loads(arguments),
+        result=result,
+        call_id=f"replay_{uuid.uuid4().hex[:12]}",
+        cache_hit=True,
+        created_at=created_at
+    )
+
+
+# ============================================
+# 재개
+# ============================================
+
+def resume(graph: Any, thread_id: str, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+    """
+    스레드의 마지막 체크포인트부터 실행을 이어갑니다.
+
+    이미 끝난 스레드는 다시 실행하지 않고 최종 상태를 반환합니다.
+    실패한 단계에서 성공한 태스크의 쓰기는 체크포인터에 남아 있으므로 다시 실행되지 않습니다.
+    """
+    config = _resume_config(thread_id, config)
+    snapshot = graph.get_state(config)
+    if not snapshot.next:
+        return snapshot.values
+    return graph.invoke(None, config)
+
+
+def _resume_config(thread_id: str, config: Optional[RunnableConfig]) -> RunnableConfig:
+    config = dict(config or {})
+    config["configurable"] = {**config.get("configurable", {}), **resume_config(thread_id)["configurable"]}
+    return config
+
+
+async def aresume(graph: Any, thread_id: str, config: Optional[RunnableConfig] = None) -> Dict[str, Any]:
+    """resume의 비동기 버전"""
+    config = _resume_config(thread_id, config)
+    snapshot = await graph.aget_state(config)
+    if not snapshot.next:
+        return snapshot.values
+    return await graph.ainvoke(None, config)
+
+
+# ============================================
+# 도구 결과 재생
+# ============================================
+
+class ToolReplay:
+    """
+    스레드 단위 도구 결과 재생
+
+    wrap_tools()로 감싼 도구는 실행할 때마다 결과를 실행 중인 그래프의 thread_id로 기록합니다.
+    resume()/resume_config()로 재개한 실행에서만 같은 (도구, 정규화된 인자)의 기록된 결과를
+    신선도와 무관하게 재생하므로, 재개한 실행은 실패 전 실행과 같은 관찰값을 봅니다.
+    일반 실행(같은 스레드의 다음 질문 등)은 항상 도구를 다시 실행해 최신 값을 기록합니다.
+    오류 결과와 예외는 기록하지 않습니다.
+    """
+
+    def __init__(self, saver: SqliteCheckpointSaver, history: Optional[ToolHistory] = None):
+        self.saver = saver
+        self.history = history if history is not None else ToolHistory()
+        self.replayed = 0
+        self._lock = threading.Lock()
+
+    def restore_history(self, thread_id: str) -> ToolHistory:
+        """스레드의 완료된 도구 결과를 새 ToolHistory로 복원합니다."""
+        history = ToolHistory()
+        for execution in self.saver.observations(thread_id):
+            history.add_execution(execution)
+        return history
+
+    def wrap_tools(self, tools: Sequence[BaseTool]) -> List[BaseTool]:
+        return [self._wrap(t) for t in tools]
+
+    def _wrap(self, tool: BaseTool) -> BaseTool:
+        original = tool
+
+        def lookup(arguments: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any], Optional[str]]:
+            configurable = ensure_config().get("configurable", {})
+            thread_id = configurable.get("thread_id")
+            arguments = ToolMemoizer.canonical_arguments(original, arguments)
+            if thread_id is None or not configurable.get(REPLAY_KEY):
+                return None, arguments, thread_id
+            previous = self.saver.get_observation(thread_id, original.name, arguments)
+            if previous is None:
+                return None, arguments, thread_id
+            with self._lock:
+                self.replayed += 1
+            self.history.add_execution(previous)
+            return previous.result, arguments, thread_id
+
+        def record(arguments: Dict[str, Any], thread_id: Optional[str], result: str) -> str:
+            execution = ToolExecution(
+                tool_name=original.name, arguments=arguments, result=result,
+                call_id=f"replay_{uuid.uuid4().hex[:12]}"
+            )
+            if thread_id is not None and not is_error_result(result):
+                self.saver.put_observation(thread_id, execution, result)
+            self.history.add_execution(execution)
+            return result
+
+        def func(**kwargs: Any) -> str:
+            replayed, arguments, thread_id = lookup(kwargs)
+            if replayed is not None:
+                return replayed
+            return record(arguments, thread_id, original.invoke(arguments))
+
+        async def coroutine(**kwargs: Any) -> str:
+            replayed, arguments, thread_id = lookup(kwargs)
+            if replayed is not None:
+                return replayed
+            return record(arguments, thread_id, await original.ainvoke(arguments))
+
+        return tool.model_copy(update={"func": func, "coroutine": coroutine})
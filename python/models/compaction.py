@@ -0,0 +1,170 @@
+"""
+ReAct Agent 메시지 히스토리 압축
+
+create_react_agent는 AI 메시지·도구 호출·도구 결과 전체를 messages에 쌓고
+LLM 호출마다 전부 다시 보냅니다. 도구를 여러 번 호출하는 질문(주가 + 이동평균 + 뉴스 등)은
+단계가 늘어날수록 프롬프트가 커집니다.
+
+MessageCompactor는 pre_model_hook으로 LLM 호출 직전에 실행되어
+- 시스템 프롬프트, 사용자 질문, 최종 답변, 최근 keep_steps 단계의 도구 호출·결과는 그대로 두고
+- 그 이전 단계는 "도구(인자): 결과 요약" 한 줄씩의 요약 메시지 하나로 바꿉니다.
+요약은 최근 max_digest_lines줄까지만 유지하므로 도구 호출 수와 무관하게 프롬프트 크기가 일정합니다.
+
+LLM 입력(llm_input_messages)만 바꾸고 그래프 상태는 그대로 두므로 체크포인트와
+ToolHistory에는 전체 결과가 남고, 같은 인자로 다시 호출하면 메모이제이션·재생 결과를 받습니다.
+
+사용법:
+    agent = create_react_agent(llm, tools, prompt=system_prompt, pre_model_hook=MessageCompactor())
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+
+from python.models.metrics import estimate_tokens
+from python.models.tool_output import snippet
+
+
+DEFAULT_KEEP_STEPS = 1
+DEFAULT_SUMMARY_CHARS = 120
+DEFAULT_MAX_DIGEST_LINES = 12
+
+DIGEST_HEADER = "[이전 도구 호출 요약] 전체 결과가 필요하면 같은 인자로 다시 호출하세요. (저장된 결과로 바로 응답)"
+
+
+def message_tokens(message: BaseMessage) -> int:
+    """메시지 하나의 추정 토큰 수 (도구 호출 인자 포함)"""
+    tokens = estimate_tokens(str(message.content))
+    for call in getattr(message, "tool_calls", None) or []:
+        tokens += estimate_tokens(call["name"] + json.dumps(call.get("args", {}), ensure_ascii=False))
+    return tokens
+
+
+def summarize_observation(text: str, limit: int = DEFAULT_SUMMARY_CHARS) -> str:
+    """도구 결과 요약: 줄마다 앞부분만 남겨 " | "로 잇고 limit자까지 자릅니다."""
+    lines = [line.strip() for line in str(text).splitlines()]
+    parts = [line if len(line) <= 60 else line[:60] + "…" for line in lines if line and line != "---"]
+    return snippet(" | ".join(parts), limit)
+
+
+def _format_args(args: Dict[str, Any]) -> str:
+    return ", ".join(
+        f"{k}={json.dumps(v, ensure_ascii=False) if not isinstance(v, str) else v}"
+        for k, v in args.items()
+    )
+
+
+@dataclass
+class CompactionStats:
+    """압축 전후 추정 토큰 수"""
+    calls: int = 0
+    compacted: int = 0          # 요약이 적용된 호출 수
+    steps_summarized: int = 0   # 요약으로 바뀐 도구 호출 단계 수 (누적)
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "compacted": self.compacted,
+            "steps_summarized": self.steps_summarized,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "saved_tokens": self.saved_tokens,
+        }
+
+
+class MessageCompactor:
+    """
+    LLM 호출 전 메시지 히스토리 압축 (create_react_agent의 pre_model_hook)
+
+    단계 = 도구를 호출한 AI 메시지 + 그 호출들의 ToolMessage.
+    최근 keep_steps 단계만 원문으로 두고, 이전 단계는 요약 메시지 하나로 합칩니다.
+    요약 메시지는 첫 번째로 요약된 단계 자리에 들어가므로 사용자 질문·최종 답변과의
+    순서가 유지됩니다.
+    """
+
+    def __init__(
+        self,
+        keep_steps: int = DEFAULT_KEEP_STEPS,
+        summary_chars: int = DEFAULT_SUMMARY_CHARS,
+        max_digest_lines: int = DEFAULT_MAX_DIGEST_LINES
+    ):
+        if keep_steps < 1:
+            raise ValueError("keep_steps는 1 이상이어야 합니다.")
+        self.keep_steps = keep_steps
+        self.summary_chars = summary_chars
+        self.max_digest_lines = max_digest_lines
+        self.stats = CompactionStats()
+        self._lock = threading.Lock()
+
+    def __call__(self, state: Dict[str, Any]) -> Dict[str, List[BaseMessage]]:
+        messages = state["messages"]
+        compacted, summarized = self.compact(messages)
+        with self._lock:
+            self.stats.calls += 1
+            self.stats.tokens_before += sum(message_tokens(m) for m in messages)
+            self.stats.tokens_after += sum(message_tokens(m) for m in compacted)
+            if summarized:
+                self.stats.compacted += 1
+                self.stats.steps_summarized += summarized
+        return {"llm_input_messages": compacted}
+
+    def compact(self, messages: Sequence[BaseMessage]) -> Tuple[List[BaseMessage], int]:
+        """(압축된 메시지 목록, 요약된 단계 수)"""
+        steps = self._steps(messages)
+        old = steps[:-self.keep_steps]
+        if not old:
+            return list(messages), 0
+
+        # 요약할 단계에 속한 메시지 위치
+        removed = {i for ai_index, tool_indexes in old for i in (ai_index, *tool_indexes)}
+        digest = self._digest(messages, old)
+
+        result: List[BaseMessage] = []
+        for i, message in enumerate(messages):
+            if i == old[0][0]:
+                result.append(digest)
+            if i not in removed:
+                result.append(message)
+        return result, len(old)
+
+    # ---------- 내부 ----------
+
+    @staticmethod
+    def _steps(messages: Sequence[BaseMessage]) -> List[Tuple[int, List[int]]]:
+        """(도구 호출 AI 메시지 위치, 해당 ToolMessage 위치들) 목록"""
+        steps: List[Tuple[int, List[int]]] = []
+        owner: Dict[str, int] = {}
+        for i, message in enumerate(messages):
+            if isinstance(message, AIMessage) and message.tool_calls:
+                steps.append((i, []))
+                for call in message.tool_calls:
+                    owner[call["id"]] = len(steps) - 1
+            elif isinstance(message, ToolMessage) and message.tool_call_id in owner:
+                steps[owner[message.tool_call_id]][1].append(i)
+        return steps
+
+    def _digest(self, messages: Sequence[BaseMessage], old: List[Tuple[int, List[int]]]) -> AIMessage:
+        lines: List[str] = []
+        for ai_index, tool_indexes in old:
+            results = {messages[i].tool_call_id: messages[i] for i in tool_indexes}
+            for call in messages[ai_index].tool_calls:
+                observation = results.get(call["id"])
+                summary = (
+                    summarize_observation(observation.content, self.summary_chars)
+                    if observation is not None else "(결과 없음)"
+                )
+                lines.append(f"- {call['name']}({_format_args(call.get('args', {}))}): {summary}")
+
+        if len(lines) > self.max_digest_lines:
+            omitted = len(lines) - self.max_digest_lines
+            lines = [f"- (이전 {omitted}건 생략)"] + lines[-self.max_digest_lines:]
+        return AIMessage(content="\n".join([DIGEST_HEADER, *lines]))
@@ -0,0 +1,298 @@
+"""
+토큰 예산 기반 컨텍스트 조립
+
+web_search가 누적한 검색 결과(원문 포함)를 그대로 프롬프트에 넣으면
+반복할수록 프롬프트가 커집니다. ContextAssembler는
+- URL 정규화로 같은 문서를 제거하고
+- 문서를 청크로 나눠 거의 같은 내용(near-duplicate)을 제거하고
+- 질문과의 관련도(BM25) 순으로
+- 토큰 예산 안에 들어가는 청크만 담습니다.
+
+이미 보낸 청크의 ID를 넘기면 새 자료만 조립하므로, 이후 반복에서는
+기존 답변 + 새 자료만 LLM에 보낼 수 있습니다.
+"""
+
+import hashlib
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from python.models.metrics import estimate_tokens
+
+
+DEFAULT_CONTEXT_TOKENS = 1500     # 한 번의 generate에 넣을 검색 자료 토큰 예산
+DEFAULT_CHUNK_CHARS = 600         # 청크 최대 길이 (문자)
+DEFAULT_NEAR_DUP_THRESHOLD = 0.8  # 이 이상 겹치면(자카드 유사도) 같은 내용으로 판단
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+# ============================================
+# 정규화
+# ============================================
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def normalize_url(url: Optional[str]) -> str:
+    """
+    중복 판정용 URL 정규화
+
+    스킴·호스트 소문자화, www. 제거, 프래그먼트·추적 파라미터·끝 슬래시 제거.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ))
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/"), query, ""))
+
+
+_WORD = re.compile(r"\w+")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def terms(text: str) -> List[str]:
+    """
+    관련도 계산용 토큰
+
+    단어 토큰에 더해, 한글 단어는 조사가 붙어도 매칭되도록 글자 2-gram을 추가합니다.
+    ("삼성전자의" ↔ "삼성전자")
+    """
+    words = _WORD.findall(unicodedata.normalize("NFKC", text).lower())
+    result = list(words)
+    for w in words:
+        if len(w) > 2 and _HANGUL.search(w):
+            result.extend(w[i:i + 2] for i in range(len(w) - 1))
+    return result
+
+
+def _shingles(text: str, size: int = 5) -> Set[int]:
+    """공백을 정규화한 글자 n-gram의 해시 집합 (near-duplicate 판정용)"""
+    compact = " ".join(_WORD.findall(text.lower()))
+    if len(compact) <= size:
+        return {hash(compact)}
+    return {hash(compact[i:i + size]) for i in range(len(compact) - size + 1)}
+
+
+def _jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# ============================================
+# 청크
+# ============================================
+
+@dataclass
+class Chunk:
+    """검색 결과 문서의 한 조각"""
+    chunk_id: str         # 내용 해시 (반복 간 동일)
+    source: int           # context 내 문서 번호 (0부터, 출처 번호 = source + 1)
+    position: int         # 문서 내 순서
+    title: str
+    url: str
+    text: str
+    tokens: int
+    score: float = 0.0
+    shingles: Set[int] = field(default_factory=set, repr=False)
+
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def split_chunks(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """문장 경계를 유지하며 max_chars 이하 청크로 나눕니다."""
+    chunks: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        while len(sentence) > max_chars:
+            # 문장 하나가 너무 길면 강제로 자름
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_id(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+# ============================================
+# 조립
+# ============================================
+
+@dataclass
+class AssembledContext:
+    """조립 결과"""
+    text: str                                         # 프롬프트에 넣을 문자열
+    chunks: List[Chunk]                               # 담긴 청크 (출력 순서)
+    tokens: int                                       # text의 추정 토큰 수
+    dropped_duplicates: int = 0                       # URL·내용 중복으로 제외된 청크 수
+    dropped_over_budget: int = 0                      # 예산 초과로 제외된 청크 수
+
+    @property
+    def chunk_ids(self) -> List[str]:
+        return [c.chunk_id for c in self.chunks]
+
+    def __bool__(self) -> bool:
+        return bool(self.chunks)
+
+
+class ContextAssembler:
+    """
+    검색 결과 → 토큰 예산 안의 프롬프트 컨텍스트
+
+    - budget_tokens: 담을 청크 본문 + 출처 헤더의 토큰 한도
+    - exclude(이미 보낸 청크 ID)와 같거나 거의 같은 청크는 제외
+    - 관련도 순으로 고른 뒤, 출처별로 묶어 문서 내 순서대로 출력
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int = DEFAULT_CONTEXT_TOKENS,
+        chunk_chars: int = DEFAULT_CHUNK_CHARS,
+        near_dup_threshold: float = DEFAULT_NEAR_DUP_THRESHOLD
+    ):
+        if budget_tokens <= 0:
+            raise ValueError("budget_tokens는 1 이상이어야 합니다.")
+        self.budget_tokens = budget_tokens
+        self.chunk_chars = chunk_chars
+        self.near_dup_threshold = near_dup_threshold
+
+    def chunks(self, context: Sequence[Dict[str, Any]]) -> List[Chunk]:
+        """검색 결과를 청크로 나눕니다. (같은 URL의 문서는 처음 것만 사용)"""
+        seen_urls: Set[str] = set()
+        result: List[Chunk] = []
+        for source, item in enumerate(context):
+            url = item.get("url") or ""
+            key = normalize_url(url)
+            if key and key in seen_urls:
+                continue
+            seen_urls.add(key)
+
+            # 요약(content)을 먼저, 원문(raw_content)을 뒤에: 요약과 겹치는 원문 청크는 중복 제거됨
+            texts = [item.get("content") or "", item.get("raw_content") or ""]
+            position = 0
+            for text in texts:
+                for piece in split_chunks(text, self.chunk_chars):
+                    result.append(Chunk(
+                        chunk_id=chunk_id(piece),
+                        source=source,
+                        position=position,
+                        title=item.get("title") or "N/A",
+                        url=url or "N/A",
+                        text=piece,
+                        tokens=estimate_tokens(piece),
+                        shingles=_shingles(piece)
+                    ))
+                    position += 1
+        return result
+
+    def assemble(
+        self,
+        query: str,
+        context: Sequence[Dict[str, Any]],
+        exclude: Iterable[str] = ()
+    ) -> AssembledContext:
+        """질문과 관련도가 높은 새 청크를 예산 안에서 골라 프롬프트 문자열로 만듭니다."""
+        excluded = set(exclude)
+        all_chunks = self.chunks(context)
+        sent = [c for c in all_chunks if c.chunk_id in excluded]
+        candidates = [c for c in all_chunks if c.chunk_id not in excluded]
+        self._score(query, all_chunks)
+        candidates.sort(key=lambda c: (-c.score, c.source, c.position))
+
+        chosen: List[Chunk] = []
+        duplicates = over_budget = 0
+        used = 0
+        headers: Set[int] = set()
+        for chunk in candidates:
+            if any(_jaccard(chunk.shingles, other.shingles) >= self.near_dup_threshold
+                   for other in (*sent, *chosen)):
+                duplicates += 1
+                continue
+            cost = chunk.tokens + (0 if chunk.source in headers else self._header_tokens(chunk))
+            if used + cost > self.budget_tokens:
+                over_budget += 1
+                continue
+            chosen.append(chunk)
+            headers.add(chunk.source)
+            used += cost
+
+        text = self._render(chosen)
+        return AssembledContext(
+            text=text,
+            chunks=chosen,
+            tokens=estimate_tokens(text),
+            dropped_duplicates=duplicates,
+            dropped_over_budget=over_budget
+        )
+
+    # ---------- 내부 ----------
+
+    @staticmethod
+    def _score(query: str, chunks: List[Chunk]) -> None:
+        """BM25 관련도 점수 (청크 집합을 문서 집합으로 사용)"""
+        if not chunks:
+            return
+        docs = [Counter(terms(c.text + " " + c.title)) for c in chunks]
+        lengths = [sum(d.values()) for d in docs]
+        avg_len = sum(lengths) / len(lengths) or 1.0
+        df: Counter = Counter()
+        for d in docs:
+            df.update(d.keys())
+
+        n = len(chunks)
+        query_terms = set(terms(query))
+        for chunk, d, length in zip(chunks, docs, lengths):
+            score = 0.0
+            for t in query_terms:
+                tf = d.get(t, 0)
+                if not tf:
+                    continue
+                idf = math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5))
+                score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_len))
+            chunk.score = score
+
+    @staticmethod
+    def _header(chunk: Chunk) -> str:
+        return f"[출처 {chunk.source + 1}]\n제목: {chunk.title}\nURL: {chunk.url}"
+
+    def _header_tokens(self, chunk: Chunk) -> int:
+        return estimate_tokens(self._header(chunk))
+
+    def _render(self, chosen: List[Chunk]) -> str:
+        """출처별로 묶고(가장 관련도 높은 출처 먼저), 출처 안에서는 문서 순서대로 출력"""
+        by_source: Dict[int, List[Chunk]] = {}
+        for chunk in chosen:   # chosen은 관련도 순
+            by_source.setdefault(chunk.source, []).append(chunk)
+
+        blocks = []
+        for chunks in by_source.values():
+            chunks.sort(key=lambda c: c.position)
+            body = "\n".join(c.text for c in chunks)
+            blocks.append(f"{self._header(chunks[0])}\n내용: {body}")
+        return "\n\n".join(blocks)
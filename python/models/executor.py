@@ -0,0 +1,65 @@
+"""
+블로킹 호출 오프로드용 스레드 풀
+
+yfinance 등 동기 라이브러리 호출을 이벤트 루프 밖의 제한된 스레드 풀에서
+실행합니다. 풀 크기는 INVEST_TOOL_WORKERS 환경 변수나 configure_executor로
+조정합니다.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = int(os.environ.get("INVEST_TOOL_WORKERS", "8"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_max_workers = DEFAULT_MAX_WORKERS
+_lock = threading.Lock()
+
+
+def configure_executor(max_workers: int) -> None:
+    """
+    스레드 풀 크기를 변경합니다.
+
+    기존 풀에서 실행 중인 작업은 끝까지 실행되고, 이후 호출부터 새 풀을 사용합니다.
+    """
+    global _executor, _max_workers
+    if max_workers <= 0:
+        raise ValueError("max_workers는 1 이상이어야 합니다.")
+
+    with _lock:
+        old, _executor = _executor, None
+        _max_workers = max_workers
+    if old is not None:
+        old.shutdown(wait=False)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """공용 스레드 풀을 반환합니다. (최초 호출 시 생성)"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_workers,
+                thread_name_prefix="invest-tool"
+            )
+        return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    블로킹 함수를 공용 스레드 풀에서 실행하고 결과를 기다립니다.
+
+    호출 시점의 contextvars를 그대로 전달합니다.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
@@ -0,0 +1,197 @@
+"""
+기업 기본 정보(stock.info) 캐시
+
+Yahoo Finance의 info 엔드포인트는 가장 느린 호출이므로, 티커별로 한 번 조회한
+결과를 필드 단위 TTL로 재사용합니다.
+- 회사명/업종처럼 거의 바뀌지 않는 필드는 길게
+- PER/PBR/시가총액처럼 매일 바뀌는 필드는 짧게
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from python.models.cache import CacheStats, TTLCache
+from python.models.market_data import get_market_data
+
+
+# ============================================
+# 필드별 TTL (초)
+# ============================================
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+FIELD_TTLS: Dict[str, float] = {
+    # 거의 변하지 않는 정보
+    "longName": 7 * DAY,
+    "shortName": 7 * DAY,
+    "sector": 7 * DAY,
+    "industry": 7 * DAY,
+    "website": 7 * DAY,
+    # 매일 변하는 지표
+    "marketCap": 1 * HOUR,
+    "trailingPE": 1 * HOUR,
+    "priceToBook": 1 * HOUR,
+    "dividendYield": 1 * DAY,
+    "fiftyTwoWeekHigh": 1 * HOUR,
+    "fiftyTwoWeekLow": 1 * HOUR,
+}
+
+DEFAULT_FIELD_TTL = 1 * HOUR
+
+
+# ============================================
+# 캐시
+# ============================================
+
+@dataclass
+class _InfoRecord:
+    """티커 하나의 info 조회 결과"""
+    info: Dict[str, Any]
+    fetched_at: float = field(default_factory=time.monotonic)
+
+
+class FundamentalsCache:
+    """
+    티커별 info 캐시 (필드별 TTL + LRU)
+
+    - 요청한 필드 중 하나라도 만료되었으면 info를 한 번 다시 조회
+    - 티커 수가 maxsize를 넘으면 가장 오래 사용하지 않은 티커부터 제거
+    - 필드 단위 적중/미스를 stats에 집계
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 512,
+        field_ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_FIELD_TTL,
+        fetcher: Optional[Callable[[str], Dict[str, Any]]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.field_ttls = dict(FIELD_TTLS if field_ttls is None else field_ttls)
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._fetcher = fetcher or _fetch_info
+        self._clock = clock
+        # 레코드는 가장 긴 필드 TTL 동안 보관하고, 필드 신선도는 별도로 판단
+        longest = max([default_ttl, *self.field_ttls.values()])
+        self._records: TTLCache[_InfoRecord] = TTLCache(maxsize=maxsize, ttl=longest, clock=clock)
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, name: str) -> float:
+        return self.field_ttls.get(name, self.default_ttl)
+
+    def get_fields(self, ticker: str, fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        요청 필드를 반환합니다. (read-through)
+
+        만료된 필드가 있으면 info를 다시 조회합니다.
+        조회가 실패하면(응답 지연·회로 차단 등) 보관 중인 만료된 값으로 응답합니다.
+        info에 없는 필드는 결과에서 빠집니다.
+        """
+        fields = list(fields)
+        record = self._records.get(ticker)
+
+        if record is not None and all(self._is_fresh(record, f) for f in fields):
+            self._count(hits=len(fields))
+            return {f: record.info[f] for f in fields if f in record.info}
+
+        self._count(misses=len(fields))
+        try:
+            record = self._refresh(ticker)
+        except Exception:
+            if record is None:
+                raise
+        return {f: record.info[f] for f in fields if f in record.info}
+
+    def get_field(self, ticker: str, name: str, default: Any = None) -> Any:
+        """필드 하나를 반환합니다."""
+        return self.get_fields(ticker, [name]).get(name, default)
+
+    def get_name(self, ticker: str, default: str = "N/A") -> str:
+        """
+        회사명을 반환합니다.
+
+        캐시된 회사명이 있으면 만료되었더라도 즉시 반환하고,
+        갱신은 백그라운드에서 수행하여 호출자가 info를 기다리지 않게 합니다.
+        캐시에 없고 조회도 실패하면(응답 지연·회로 차단 등) default를 반환합니다.
+        (회사명 때문에 이미 구한 주가 결과까지 실패하지 않도록)
+        """
+        record = self._records.get(ticker)
+        if record is not None and "longName" in record.info:
+            if self._is_fresh(record, "longName"):
+                self._count(hits=1)
+            else:
+                self._count(misses=1)
+                self._refresh_in_background(ticker)
+            return record.info["longName"]
+
+        try:
+            return self.get_field(ticker, "longName", default)
+        except Exception:
+            return default
+
+    def invalidate(self, ticker: str) -> None:
+        self._records.pop(ticker)
+
+    # ---------- 내부 ----------
+
+    def _is_fresh(self, record: _InfoRecord, name: str) -> bool:
+        return self._clock() - record.fetched_at < self.ttl_for(name)
+
+    def _refresh(self, ticker: str) -> _InfoRecord:
+        record = _InfoRecord(info=dict(self._fetcher(ticker) or {}), fetched_at=self._clock())
+        self._records.set(ticker, record)
+        return record
+
+    def _refresh_in_background(self, ticker: str) -> None:
+        with self._lock:
+            if ticker in self._refreshing:
+                return
+            self._refreshing.add(ticker)
+
+        def run() -> None:
+            try:
+                self._refresh(ticker)
+            except Exception:
+                # 갱신 실패 시 기존 값을 계속 사용
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(ticker)
+
+        threading.Thread(target=run, name=f"info-refresh-{ticker}", daemon=True).start()
+
+    def _count(self, hits: int = 0, misses: int = 0) -> None:
+        with self._lock:
+            self.stats.hits += hits
+            self.stats.misses += misses
+
+
+def _fetch_info(ticker: str) -> Dict[str, Any]:
+    """Yahoo Finance에서 info를 조회합니다. (동시에 같은 티커를 조회하면 한 번만 호출)"""
+    return get_market_data().info(ticker)
+
+
+_default_cache: Optional[FundamentalsCache] = None
+_default_lock = threading.Lock()
+
+
+def get_fundamentals_cache() -> FundamentalsCache:
+    """프로세스 공용 기본 정보 캐시를 반환합니다."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = FundamentalsCache()
+        return _default_cache
+
+
+def set_fundamentals_cache(cache: FundamentalsCache) -> FundamentalsCache:
+    """공용 기본 정보 캐시를 교체합니다. (벤치마크용 합성 fetcher 등)"""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
+        return _default_cache
@@ -0,0 +1,162 @@
+"""
+기술적 지표 엔진
+
+가격 배열(NumPy) 하나에서 여러 지표를 한 번에 계산합니다.
+- SMA: 누적합으로 모든 window를 벡터 연산
+- EMA / RSI / MACD / ATR: 재귀식이므로 시계열을 한 번만 순회하며
+  모든 span을 벡터로 동시에 갱신
+- 볼린저 밴드: 마지막 window 구간의 벡터 연산
+
+DataFrame 복사 없이 ndarray만 사용합니다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# ============================================
+# 기본 설정
+# ============================================
+
+DEFAULT_SMA_WINDOWS: Tuple[int, ...] = (5, 20, 60)
+DEFAULT_EMA_SPANS: Tuple[int, ...] = (12, 26)
+RSI_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BB_WINDOW, BB_K = 20, 2.0
+ATR_PERIOD = RSI_PERIOD  # RSI와 같은 Wilder 평활 구간을 공유
+
+# 재귀 지표가 수렴하도록 가장 긴 span의 배수만큼 과거 데이터를 사용
+EMA_WARMUP_FACTOR = 3
+
+
+# ============================================
+# 필요 데이터 길이
+# ============================================
+
+def required_bars(sma_windows: Sequence[int] = DEFAULT_SMA_WINDOWS,
+                  ema_spans: Sequence[int] = DEFAULT_EMA_SPANS) -> int:
+    """모든 지표를 계산하는 데 필요한 봉 개수"""
+    longest_recursive = max([*ema_spans, MACD_SLOW + MACD_SIGNAL, RSI_PERIOD, ATR_PERIOD])
+    return max([*sma_windows, BB_WINDOW, EMA_WARMUP_FACTOR * longest_recursive])
+
+
+# ============================================
+# 지표 스냅샷
+# ============================================
+
+@dataclass
+class IndicatorSnapshot:
+    """마지막 봉 기준 지표 값 (계산 불가 시 NaN)"""
+    close: float
+    sma: Dict[int, float] = field(default_factory=dict)
+    ema: Dict[int, float] = field(default_factory=dict)
+    rsi: float = np.nan
+    macd: float = np.nan
+    macd_signal: float = np.nan
+    macd_hist: float = np.nan
+    bb_upper: float = np.nan
+    bb_middle: float = np.nan
+    bb_lower: float = np.nan
+    bb_percent_b: float = np.nan
+    atr: float = np.nan
+
+    def rsi_label(self) -> str:
+        if np.isnan(self.rsi):
+            return "N/A"
+        if self.rsi >= 70:
+            return "과매수"
+        if self.rsi <= 30:
+            return "과매도"
+        return "중립"
+
+
+def compute_indicators(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    sma_windows: Sequence[int] = DEFAULT_SMA_WINDOWS,
+    ema_spans: Sequence[int] = DEFAULT_EMA_SPANS
+) -> Optional[IndicatorSnapshot]:
+    """
+    가격 배열에서 지표 스냅샷을 계산합니다.
+
+    high/low/close는 같은 길이의 1차원 배열이어야 합니다.
+    데이터가 없으면 None을 반환합니다.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    if n == 0:
+        return None
+
+    snap = IndicatorSnapshot(close=float(close[-1]))
+
+    # ---------- SMA (window별 마지막 값만 필요) ----------
+    csum = np.cumsum(np.insert(close, 0, 0.0))
+    for w in sma_windows:
+        snap.sma[w] = float((csum[n] - csum[n - w]) / w) if 0 < w <= n else np.nan
+
+    # ---------- 볼린저 밴드 ----------
+    if n >= BB_WINDOW:
+        recent = close[-BB_WINDOW:]
+        mid, std = recent.mean(), recent.std()
+        snap.bb_middle = float(mid)
+        snap.bb_upper = float(mid + BB_K * std)
+        snap.bb_lower = float(mid - BB_K * std)
+        width = snap.bb_upper - snap.bb_lower
+        snap.bb_percent_b = float((close[-1] - snap.bb_lower) / width) if width > 0 else np.nan
+
+    # ---------- 재귀 지표: 한 번의 순회 ----------
+    # EMA 벡터: [사용자 span..., MACD fast, MACD slow]
+    spans = np.array([*ema_spans, MACD_FAST, MACD_SLOW], dtype=np.float64)
+    alpha = 2.0 / (spans + 1.0)
+    ema = np.full(len(spans), close[0])
+    signal = np.nan
+
+    # Wilder 평활: [평균 상승폭, 평균 하락폭, ATR]
+    wilder = np.zeros(3)
+    seed = np.zeros(3)
+    signal_seed = []
+
+    for i in range(1, n):
+        ema += alpha * (close[i] - ema)
+
+        delta = close[i] - close[i - 1]
+        true_range = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        obs = np.array([max(delta, 0.0), max(-delta, 0.0), true_range])
+        if i <= RSI_PERIOD:
+            # 초기값은 단순 평균
+            seed += obs
+            if i == RSI_PERIOD:
+                wilder = seed / RSI_PERIOD
+        else:
+            wilder += (obs - wilder) / RSI_PERIOD
+
+        # MACD 시그널선 (MACD의 EMA, 처음 span개는 단순 평균으로 시작)
+        if i >= MACD_SLOW - 1:
+            macd_value = ema[-2] - ema[-1]
+            if len(signal_seed) < MACD_SIGNAL:
+                signal_seed.append(macd_value)
+                if len(signal_seed) == MACD_SIGNAL:
+                    signal = float(np.mean(signal_seed))
+            else:
+                signal += (2.0 / (MACD_SIGNAL + 1.0)) * (macd_value - signal)
+
+    for span, value in zip(ema_spans, ema[:len(ema_spans)]):
+        snap.ema[span] = float(value) if n >= span else np.nan
+
+    if n > RSI_PERIOD:
+        avg_gain, avg_loss, atr = wilder
+        snap.rsi = 100.0 if avg_loss == 0 else float(100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+        snap.atr = float(atr)
+
+    if n >= MACD_SLOW:
+        snap.macd = float(ema[-2] - ema[-1])
+        if not np.isnan(signal):
+            snap.macd_signal = signal
+            snap.macd_hist = snap.macd - signal
+
+    return snap
@@ -0,0 +1,314 @@
+"""
+LLM 응답 영구 캐시 (SQLite)
+
+인기 질문("삼성전자 주가 동향" 등)이 반복되면 notebook 2 워크플로우의
+generate·qa_eval LLM 호출을 처음부터 다시 실행하게 됩니다.
+(모델, 프롬프트 템플릿, 정규화된 입력, 검색 자료 지문)을 키로 응답을
+로컬 SQLite에 저장하여 같은 질문은 네트워크 없이 응답합니다.
+
+신선도 규칙:
+- 실시간 데이터가 필요한 질문(현재가·최근 뉴스 등): 관련 시장 장중 1분, 장 마감 후 1시간
+  (주가 도구의 메모이제이션 규칙과 같은 기준)
+- 그 외 일반 질문: 1일
+
+크기 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from python.models.cache import CacheStats
+from python.models.memo import HOUR, MINUTE, is_session_open, market_of
+
+
+# ============================================
+# 설정
+# ============================================
+
+DEFAULT_LLM_CACHE_PATH = Path(
+    os.environ.get("INVEST_CACHE_DIR", Path.home() / ".cache" / "invest-with-langgraph")
+) / "llm_cache.sqlite3"
+
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+# ============================================
+# 신선도 규칙
+# ============================================
+
+# 실시간 데이터가 필요한 질문의 키워드
+REALTIME_KEYWORDS = (
+    "현재", "오늘", "지금", "실시간", "최근", "최신", "주가", "시세", "뉴스", "동향", "장중",
+    "today", "now", "latest", "current", "price", "news",
+)
+
+_TICKER = re.compile(r"\b\d{6}\.K[SQ]\b|\b[A-Z]{1,5}\b")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def needs_realtime(query: str) -> bool:
+    """질문이 실시간 시장 데이터(현재가·최신 뉴스 등)에 의존하는지 판별합니다."""
+    text = unicodedata.normalize("NFKC", query).lower()
+    return any(k in text for k in REALTIME_KEYWORDS)
+
+
+def markets_in(query: str) -> List[str]:
+    """
+    질문이 가리키는 시장 목록
+
+    티커가 있으면 티커의 시장, 없으면 한글 질문은 KRX, 그 외는 US로 봅니다.
+    """
+    markets = {market_of(t) for t in _TICKER.findall(query)}
+    if not markets:
+        markets.add("KRX" if _HANGUL.search(query) else "US")
+    return sorted(markets)
+
+
+@dataclass(frozen=True)
+class ResponseFreshness:
+    """질문별 응답 유효 시간 (초)"""
+    general_ttl: float = 24 * HOUR          # 실시간 데이터와 무관한 질문
+    realtime_ttl: float = 1 * HOUR          # 실시간 질문, 장 마감 후
+    market_hours_ttl: float = 1 * MINUTE    # 실시간 질문, 관련 시장 장중
+
+    def ttl_for(self, query: str, now: Optional[datetime] = None) -> float:
+        if not needs_realtime(query):
+            return self.general_ttl
+        if any(is_session_open(m, now) for m in markets_in(query)):
+            return self.market_hours_ttl
+        return self.realtime_ttl
+
+
+# ============================================
+# 캐시 키
+# ============================================
+
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(text: str) -> str:
+    """긴 입력(검색 자료 등)의 지문"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def model_id(llm: Any) -> str:
+    """캐시 키용 모델 식별자 (클래스 + 모델 이름 + temperature)"""
+    bound = getattr(llm, "first", llm)     # RunnableSequence (구조화 출력 등)
+    bound = getattr(bound, "bound", bound)  # RunnableBinding
+    name = getattr(bound, "model_name", None) or getattr(bound, "model", None) or ""
+    temperature = getattr(bound, "temperature", None)
+    return f"{type(bound).__name__}:{name}:{temperature}"
+
+
+def cache_key(
+    model: str,
+    template: str,
+    inputs: Dict[str, Any],
+    query_fields: Sequence[str] = ("query", "question"),
+    fingerprint_fields: Sequence[str] = ("context",)
+) -> str:
+    """
+    (모델, 템플릿, 정규화된 입력) → 캐시 키
+
+    - query_fields: 대소문자 통일(casefold) ("Apple 주가" == "apple 주가")
+      단어 순서는 유지 ("A가 B보다 나은 이유" != "B가 A보다 나은 이유")
+    - fingerprint_fields: 내용 지문으로 대체 (검색 자료)
+    - 그 외 문자열: NFKC 정규화 + 공백 정리
+    """
+    normalized: Dict[str, Any] = {}
+    for name, value in sorted(inputs.items()):
+        if isinstance(value, str):
+            value = _SPACES.sub(" ", unicodedata.normalize("NFKC", value)).strip()
+            if name in query_fields:
+                value = value.casefold()
+            elif name in fingerprint_fields:
+                value = fingerprint(value)
+        normalized[name] = value
+    payload = json.dumps(
+        {"model": model, "template": fingerprint(template), "inputs": normalized},
+        ensure_ascii=False, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ============================================
+# 저장소
+# ============================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key        TEXT PRIMARY KEY,
+    model      TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+class LLMResponseCache:
+    """
+    SQLite 기반 LLM 응답 캐시 (스레드·프로세스 안전)
+
+    - 값은 JSON으로 저장 (문자열 답변, 구조화 출력의 model_dump 등)
+    - 만료된 항목은 조회 시 미스로 처리하고 삭제
+    - max_entries / max_bytes 초과 시 LRU(last_used) 순으로 제거
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        freshness: Optional[ResponseFreshness] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries는 1 이상이어야 합니다.")
+        self.path = Path(path) if path else DEFAULT_LLM_CACHE_PATH
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.freshness = freshness or ResponseFreshness()
+        self.stats = CacheStats()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ---------- 조회·저장 ----------
+
+    def get(self, key: str) -> Optional[Any]:
+        """만료되지 않은 값을 반환합니다. 없으면 None."""
+        now = self._clock()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.stats.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float, model: str = "") -> None:
+        """값을 ttl초 동안 저장하고 크기 한도를 맞춥니다."""
+        if ttl <= 0:
+            return
+        data = json.dumps(value, ensure_ascii=False)
+        now = self._clock()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, value, size, created_at, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, data, len(data.encode("utf-8")), now, now + ttl, now)
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def ttl_for(self, query: str, now: Optional[datetime] = None) -> float:
+        return self.freshness.ttl_for(query, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def summary(self) -> Dict[str, Any]:
+        """적중률 통계 + 저장 항목 수·크기"""
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {**self.stats.as_dict(), "entries": entries, "bytes": size, "path": str(self.path)}
+
+    # ---------- 내부 ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """만료 항목을 지우고, 한도를 넘으면 LRU 순으로 제거합니다."""
+        self.stats.expirations += conn.execute(
+            "DELETE FROM responses WHERE expires_at <= ?", (now,)
+        ).rowcount
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+
+        removed = 0
+        for key, item_size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_used ASC"
+        ).fetchall():
+            if entries - removed <= self.max_entries and size <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            removed += 1
+            size -= item_size
+        self.stats.evictions += removed
+
+
+# ============================================
+# 공용 인스턴스
+# ============================================
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """프로세스 공용 LLM 응답 캐시를 반환합니다."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache()
+        return _default_cache
+
+
+def set_llm_cache(cache: LLMResponseCache) -> LLMResponseCache:
+    """공용 LLM 응답 캐시를 교체합니다. (벤치마크용 임시 경로 등)"""
+    global _default_cache
+    with _default_lock:
+        _default_cache = cache
+        return _default_cache
@@ -0,0 +1,400 @@
+"""
+Yahoo Finance 접근 계층
+
+가격 저장소(price_store.py)와 기업 정보 캐시(fundamentals.py)는 yfinance를 직접 부르지 않고
+이 계층을 거칩니다. 실적 발표일처럼 여러 세션이 같은 인기 종목(005930.KS 등)을 동시에 물으면
+- 같은 요청이 실행 중이면 새로 호출하지 않고 그 결과를 기다림 (single-flight)
+- 실제 호출마다 공용 "yahoo" 토큰 버킷에서 토큰을 받음 (rate_limit.py)
+- 429 등 호출 제한 오류는 지수 백오프(+지터)로 재시도
+하여 업스트림 호출과 차단을 줄입니다. stats.saved는 병합으로 절약한 호출 수입니다.
+
+응답이 느리면 같은 요청을 한 번 더 보내고(헤지), 마감 시간이 지나면 UpstreamTimeout으로 포기하며,
+실패가 반복되면 "yahoo" 회로 차단기가 열려 바로 CircuitOpenError를 냅니다 (resilience.py).
+여러 종목 일괄 조회와 전체 이력(period="max") 조회는 헤지하지 않고 호출한 도구의 마감 시간까지 기다리며,
+이 조회의 시간 초과는 회로 차단기의 실패로 세지 않습니다. (업스트림 장애가 아니라 요청이 큰 것이므로)
+잘못된 티커·데이터 없음(4xx) 같은 요청 오류도 실패로 세지 않아, 몇몇 잘못된 티커가 다른 조회를 막지 않습니다.
+
+같은 요청에 합류한 호출자들은 같은 결과 객체를 받으므로 수정하지 말고 복사해서 사용하세요.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Protocol, Sequence, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+from python.models.metrics import current_tool, upstream_call
+from python.models.rate_limit import TokenBucket, get_rate_limiter
+from python.models.resilience import (
+    DEFAULT_BULK_DEADLINE,
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgeOutcome,
+    HedgePolicy,
+    UpstreamTimeout,
+    get_circuit_breaker,
+    hedged,
+    tool_deadline,
+)
+
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:   # yfinance < 0.2.55
+    YFRateLimitError = None
+
+
+# ============================================
+# 업스트림
+# ============================================
+
+class YahooUpstream(Protocol):
+    """Yahoo Finance 호출 인터페이스 (원본 응답 그대로 반환)"""
+
+    def history(
+        self,
+        ticker: str,
+        interval: str,
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp]
+    ) -> pd.DataFrame: ...
+
+    def download(
+        self,
+        tickers: Sequence[str],
+        interval: str,
+        start: Optional[pd.Timestamp]
+    ) -> Optional[pd.DataFrame]: ...
+
+    def info(self, ticker: str) -> Dict[str, Any]: ...
+
+
+class YFinanceUpstream:
+    """yfinance를 호출하는 기본 업스트림"""
+
+    def history(
+        self,
+        ticker: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        stock = yf.Ticker(ticker)
+        if start is None:
+            return stock.history(period="max", interval=interval)
+        return stock.history(
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d") if end is not None else None,
+            interval=interval
+        )
+
+    def download(
+        self,
+        tickers: Sequence[str],
+        interval: str,
+        start: Optional[pd.Timestamp] = None
+    ) -> Optional[pd.DataFrame]:
+        kwargs = {"period": "max"} if start is None else {"start": start.strftime("%Y-%m-%d")}
+        return yf.download(
+            list(tickers),
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            ignore_tz=True,
+            progress=False,
+            threads=True,
+            **kwargs
+        )
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        return yf.Ticker(ticker).info
+
+
+# ============================================
+# 재시도
+# ============================================
+
+_THROTTLE_MARKERS = ("429", "too many requests", "rate limit", "rate-limit")
+
+
+def is_throttled(exc: BaseException) -> bool:
+    """호출 제한(429) 오류인지 판별합니다."""
+    if YFRateLimitError is not None and isinstance(exc, YFRateLimitError):
+        return True
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    text = str(exc).lower()
+    return any(marker in text for marker in _THROTTLE_MARKERS)
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """
+    회로 차단기에 실패로 기록할 업스트림 오류인지 판별합니다.
+
+    시간 초과·연결 오류·5xx·호출 제한만 해당하며, 잘못된 티커나
+    404·"데이터 없음" 같은 요청 오류는 업스트림이 정상 응답한 것으로 봅니다.
+    """
+    if is_throttled(exc):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status >= 500
+    # TimeoutError·ConnectionError, requests/curl_cffi의 네트워크 예외는 모두 OSError
+    return isinstance(exc, OSError)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """호출 제한 오류 재시도 규칙 (지수 백오프 + 지터)"""
+    max_retries: int = 3
+    base_delay: float = 1.0     # 첫 재시도 대기 (초)
+    max_delay: float = 16.0
+    jitter: float = 0.5         # 대기 시간의 ±비율
+
+    def delay(self, attempt: int) -> float:
+        """attempt번째(0부터) 재시도 전 대기 시간"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+# ============================================
+# 클라이언트
+# ============================================
+
+@dataclass
+class MarketDataStats:
+    """요청·업스트림 호출 카운터"""
+    requests: int = 0          # 계층에 들어온 요청
+    upstream_calls: int = 0    # 실제 업스트림 호출 (재시도 포함)
+    coalesced: int = 0         # 실행 중인 같은 요청에 합류한 수
+    retries: int = 0
+    throttled: int = 0         # 호출 제한 오류 수
+    failures: int = 0          # 재시도 후에도 실패한 요청
+    hedged: int = 0            # 느린 호출에 보낸 헤지 요청
+    hedge_wins: int = 0        # 헤지 요청이 먼저 끝난 호출
+    timeouts: int = 0          # 마감 시간 초과
+    rejected: int = 0          # 회로가 열려 호출하지 않고 실패한 요청
+
+    @property
+    def saved(self) -> int:
+        """병합으로 절약한 업스트림 호출 수"""
+        return self.coalesced
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "saved": self.saved,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+        }
+
+
+class MarketDataClient:
+    """
+    single-flight + 속도 제한 + 재시도 + 헤지·마감 + 회로 차단을 제공하는 Yahoo Finance 클라이언트
+
+    요청 키는 (종류, 티커, 인터벌, 구간)이며, 같은 키가 실행 중이면 합류합니다.
+    토큰은 실제 업스트림 호출(재시도 포함)마다 받으므로 합류한 요청은 한도를 쓰지 않습니다.
+    헤지 요청은 토큰이 남아 있을 때만 보냅니다. (속도 제한을 넘지 않도록)
+    """
+
+    def __init__(
+        self,
+        upstream: Optional[YahooUpstream] = None,
+        limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        hedge: Optional[HedgePolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        bulk_deadline: float = DEFAULT_BULK_DEADLINE
+    ):
+        self.upstream: YahooUpstream = upstream or YFinanceUpstream()
+        self.retry = retry or RetryPolicy()
+        self.hedge = hedge or HedgePolicy()
+        self.bulk_deadline = bulk_deadline
+        self.stats = MarketDataStats()
+        self._limiter = limiter
+        self._breaker = breaker
+        self._sleep = sleep
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def limiter(self) -> TokenBucket:
+        # 지정하지 않으면 호출 시점의 공용 버킷 (configure_rate_limits 반영)
+        return self._limiter or get_rate_limiter("yahoo")
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker or get_circuit_breaker("yahoo")
+
+    # ---------- 공개 API ----------
+
+    def history(
+        self,
+        ticker: str,
+        interval: str = "1d",
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        """티커 하나의 OHLCV (start가 None이면 전체 이력)"""
+        key = ("history", ticker, interval, _day(start), _day(end))
+        return self._call(key, lambda: self.upstream.history(ticker, interval, start, end), bulk=start is None)
+
+    def download(
+        self,
+        tickers: Sequence[str],
+        interval: str = "1d",
+        start: Optional[pd.Timestamp] = None
+    ) -> Optional[pd.DataFrame]:
+        """여러 티커의 일괄 다운로드 (yf.download의 group_by="ticker" 형식)"""
+        key = ("download", tuple(sorted(set(tickers))), interval, _day(start))
+        return self._call(key, lambda: self.upstream.download(tickers, interval, start), bulk=True)
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        """기업 기본 정보 (yf.Ticker(...).info)"""
+        return self._call(("info", ticker), lambda: self.upstream.info(ticker))
+
+    # ---------- 내부 ----------
+
+    def _call(self, key: Hashable, fetch: Callable[[], Any], bulk: bool = False) -> Any:
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._fetch_with_retry(fetch, bulk)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self.stats.failures += 1
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """실행 중인 같은 요청이 있으면 합류하고, 없으면 새로 등록합니다."""
+        with self._lock:
+            self.stats.requests += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _fetch_with_retry(self, fetch: Callable[[], Any], bulk: bool = False) -> Any:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            with self._lock:
+                self.stats.upstream_calls += 1
+            try:
+                with upstream_call():
+                    return self._fetch_hedged(fetch, bulk)
+            except Exception as e:
+                if not is_throttled(e):
+                    raise
+                with self._lock:
+                    self.stats.throttled += 1
+                if attempt >= self.retry.max_retries:
+                    raise
+                with self._lock:
+                    self.stats.retries += 1
+                self._sleep(self.retry.delay(attempt))
+                attempt += 1
+
+
+    def policy_for(self, bulk: bool) -> HedgePolicy:
+        """
+        호출 종류별 헤지·마감 규칙
+
+        일괄 조회는 헤지하지 않고(같은 대량 요청을 두 번 보내지 않도록)
+        호출한 도구의 마감 시간을, 도구 밖이면 bulk_deadline을 씁니다.
+        """
+        if not bulk:
+            return self.hedge
+        tool_name = current_tool()
+        return HedgePolicy.unhedged(tool_deadline(tool_name) if tool_name else self.bulk_deadline)
+
+    def _fetch_hedged(self, fetch: Callable[[], Any], bulk: bool = False) -> Any:
+        """회로 상태를 확인하고, 마감 시간 안에서 느리면 헤지 요청을 보냅니다."""
+        breaker = self.breaker
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            with self._lock:
+                self.stats.rejected += 1
+            raise
+
+        outcome = HedgeOutcome()
+        try:
+            result = hedged(fetch, self.policy_for(bulk), may_hedge=self._take_hedge_token, outcome=outcome)
+        except BaseException as e:
+            if isinstance(e, UpstreamTimeout):
+                with self._lock:
+                    self.stats.timeouts += 1
+            if (bulk and isinstance(e, UpstreamTimeout)) or not isinstance(e, Exception):
+                breaker.release()
+            elif is_upstream_failure(e):
+                breaker.record_failure()
+            else:
+                # 요청 오류: 업스트림은 응답했으므로 연속 실패를 끊음
+                breaker.record_success()
+            raise
+        finally:
+            with self._lock:
+                self.stats.hedged += outcome.attempts - 1
+        breaker.record_success()
+        if outcome.winner > 0:
+            with self._lock:
+                self.stats.hedge_wins += 1
+        return result
+
+    def _take_hedge_token(self) -> bool:
+        if not self.limiter.acquire(blocking=False):
+            return False
+        with self._lock:
+            self.stats.upstream_calls += 1
+        return True
+
+
+def _day(ts: Optional[pd.Timestamp]) -> Optional[str]:
+    """요청 키용 날짜 (업스트림에는 일 단위로 전달되므로)"""
+    return None if ts is None else ts.strftime("%Y-%m-%d")
+
+
+_default_client: Optional[MarketDataClient] = None
+_default_lock = threading.Lock()
+
+
+def get_market_data() -> MarketDataClient:
+    """프로세스 공용 Yahoo Finance 클라이언트를 반환합니다."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = MarketDataClient()
+        return _default_client
+
+
+def set_market_data(client: MarketDataClient) -> MarketDataClient:
+    """공용 Yahoo Finance 클라이언트를 교체합니다. (벤치마크용 합성 업스트림 등)"""
+    global _default_client
+    with _default_lock:
+        _default_client = client
+        return _default_client
@@ -0,0 +1,236 @@
+"""
+도구 호출 메모이제이션
+
+ReAct Agent는 같은 도구를 같은 인자로 반복 호출하는 경우가 많습니다.
+ToolHistory의 (도구 이름, 정규화된 인자) 색인에서 신선한 이전 결과를 찾아
+네트워크 호출 없이 응답합니다.
+
+도구별 신선도 규칙:
+- 웹 검색: 10분
+- 주가/기술적 지표: 장중 1분, 장 마감 후 1시간
+- 기업 정보: 1시간
+"""
+
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, time as dtime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from langchain_core.tools import BaseTool
+
+from python.models.cache import CacheStats
+from python.models.metrics import CallMetrics, collect_calls, get_tool_metrics
+from python.models.tools import ToolExecution, ToolHistory, is_error_result
+
+
+# ============================================
+# 장 운영 시간
+# ============================================
+
+# 시장: (시간대, 개장, 마감)
+MARKET_SESSIONS: Dict[str, Tuple[str, dtime, dtime]] = {
+    "KRX": ("Asia/Seoul", dtime(9, 0), dtime(15, 30)),
+    "US": ("America/New_York", dtime(9, 30), dtime(16, 0)),
+}
+
+
+def market_of(ticker: str) -> str:
+    """티커 접미사로 시장을 판별합니다. (.KS/.KQ → KRX, 그 외 → US)"""
+    return "KRX" if ticker.upper().endswith((".KS", ".KQ")) else "US"
+
+
+def is_session_open(market: str, now: Optional[datetime] = None) -> bool:
+    """시장(KRX/US)이 정규장 시간인지 확인합니다. (공휴일은 고려하지 않음)"""
+    tz, open_at, close_at = MARKET_SESSIONS[market]
+    local = (now or datetime.now(tz=ZoneInfo("UTC"))).astimezone(ZoneInfo(tz))
+    return local.weekday() < 5 and open_at <= local.time() < close_at
+
+
+def is_market_open(ticker: str, now: Optional[datetime] = None) -> bool:
+    """해당 티커의 시장이 정규장 시간인지 확인합니다. (공휴일은 고려하지 않음)"""
+    return is_session_open(market_of(ticker), now)
+
+
+def _tickers_in(arguments: Dict[str, Any]) -> List[str]:
+    tickers = list(arguments.get("tickers") or [])
+    if arguments.get("ticker"):
+        tickers.append(arguments["ticker"])
+    if not tickers and arguments.get("universe"):
+        # screen_universe: 티커 목록 없이 종목군 이름만 준 경우
+        from python.models.screener import get_universe
+
+        try:
+            tickers = list(get_universe(arguments["universe"]))
+        except ValueError:
+            pass
+    return tickers
+
+
+# ============================================
+# 신선도 규칙
+# ============================================
+
+@dataclass(frozen=True)
+class FreshnessRule:
+    """도구 결과의 유효 시간 (초)"""
+    ttl: float
+    market_hours_ttl: Optional[float] = None   # 인자의 티커(종목군이면 구성 종목) 중 하나라도 장중이면 적용
+
+    def ttl_for(self, arguments: Dict[str, Any], now: Optional[datetime] = None) -> float:
+        if self.market_hours_ttl is not None and any(
+            is_session_open(m, now) for m in {market_of(t) for t in _tickers_in(arguments)}
+        ):
+            return self.market_hours_ttl
+        return self.ttl
+
+
+MINUTE = 60.0
+HOUR = 60 * MINUTE
+
+DEFAULT_FRESHNESS: Dict[str, FreshnessRule] = {
+    "search_web": FreshnessRule(ttl=10 * MINUTE),
+    "get_stock_price": FreshnessRule(ttl=1 * HOUR, market_hours_ttl=1 * MINUTE),
+    "get_stock_prices": FreshnessRule(ttl=1 * HOUR, market_hours_ttl=1 * MINUTE),
+    "calculate_moving_average": FreshnessRule(ttl=1 * HOUR, market_hours_ttl=1 * MINUTE),
+    "analyze_technicals": FreshnessRule(ttl=1 * HOUR, market_hours_ttl=1 * MINUTE),
+    "get_company_info": FreshnessRule(ttl=1 * HOUR),
+    "screen_universe": FreshnessRule(ttl=1 * HOUR, market_hours_ttl=1 * MINUTE),
+    "backtest_ma_signal": FreshnessRule(ttl=1 * HOUR),
+}
+
+
+# ============================================
+# 메모이제이션 계층
+# ============================================
+
+class ToolMemoizer:
+    """
+    ToolHistory 색인 기반 도구 호출 메모이제이션
+
+    - 인자는 도구 스키마로 검증하여 기본값까지 채운 뒤 색인 키로 사용
+    - 규칙이 없는 도구와 오류 결과는 재사용하지 않음
+    - 재사용한 실행은 cache_hit=True로 기록 (created_at은 원본 유지)
+    """
+
+    def __init__(
+        self,
+        history: ToolHistory,
+        rules: Optional[Dict[str, FreshnessRule]] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.history = history
+        self.rules = dict(DEFAULT_FRESHNESS if rules is None else rules)
+        self.stats = CacheStats()
+        self._clock = clock
+
+    # ---------- 조회 ----------
+
+    @staticmethod
+    def canonical_arguments(tool: BaseTool, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """스키마 기본값을 채우고 문자열 앞뒤 공백을 제거한 인자"""
+        schema = tool.args_schema
+        if schema is not None and hasattr(schema, "model_validate"):
+            arguments = schema.model_validate(arguments).model_dump()
+        return {k: v.strip() if isinstance(v, str) else v for k, v in arguments.items()}
+
+    def lookup(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[ToolExecution]:
+        """신선한 이전 실행을 찾습니다. (arguments는 정규화된 인자)"""
+        rule = self.rules.get(tool_name)
+        if rule is None:
+            return None
+
+        previous = self.history.lookup(tool_name, arguments)
+        if previous is None or is_error_result(previous.result):
+            return None
+        if self._clock() - previous.created_at >= rule.ttl_for(arguments):
+            return None
+        return previous
+
+    # ---------- 실행 ----------
+
+    def invoke(self, tool: BaseTool, arguments: Dict[str, Any], call_id: str) -> ToolExecution:
+        """메모이제이션을 거쳐 도구를 실행하고 (아직 기록되지 않은) 실행 기록을 반환합니다."""
+        arguments = self.canonical_arguments(tool, arguments)
+        hit = self._hit(tool.name, arguments, call_id)
+        if hit is not None:
+            return hit
+        with collect_calls() as calls:
+            result = tool.invoke(arguments)
+        return self._miss(tool.name, arguments, result, call_id, calls)
+
+    async def ainvoke(self, tool: BaseTool, arguments: Dict[str, Any], call_id: str) -> ToolExecution:
+        """invoke의 비동기 버전"""
+        arguments = self.canonical_arguments(tool, arguments)
+        hit = self._hit(tool.name, arguments, call_id)
+        if hit is not None:
+            return hit
+        with collect_calls() as calls:
+            result = await tool.ainvoke(arguments)
+        return self._miss(tool.name, arguments, result, call_id, calls)
+
+    def _hit(self, tool_name: str, arguments: Dict[str, Any], call_id: str) -> Optional[ToolExecution]:
+        previous = self.lookup(tool_name, arguments)
+        if previous is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        get_tool_metrics().record_cache_hit(tool_name)
+        # 스필된 결과는 같은 참조를 공유하여 다시 쓰지 않음
+        return ToolExecution(
+            tool_name=tool_name,
+            arguments=arguments,
+            result=previous.result,
+            call_id=call_id,
+            spill=previous.spill,
+            cache_hit=True,
+            created_at=previous.created_at
+        )
+
+    @staticmethod
+    def _miss(
+        tool_name: str,
+        arguments: Dict[str, Any],
+        result: str,
+        call_id: str,
+        calls: List[CallMetrics]
+    ) -> ToolExecution:
+        return ToolExecution(
+            tool_name=tool_name,
+            arguments=arguments,
+            result=result,
+            call_id=call_id,
+            metrics=calls[-1] if calls else None
+        )
+
+    # ---------- ReAct Agent 연동 ----------
+
+    def wrap_tools(self, tools: Iterable[BaseTool]) -> List[BaseTool]:
+        """
+        메모이제이션을 적용한 도구 복사본을 반환합니다.
+
+        create_react_agent(llm, memoizer.wrap_tools(AVAILABLE_TOOLS)) 처럼 사용하며,
+        모든 실행은 history에 기록됩니다.
+        """
+        return [self._wrap(t) for t in tools]
+
+    def _wrap(self, tool: BaseTool) -> BaseTool:
+        original = tool
+
+        def record(execution: ToolExecution) -> str:
+            self.history.add_execution(execution)
+            return self.history.result_of(execution)
+
+        def func(**kwargs: Any) -> str:
+            return record(self.invoke(original, kwargs, _new_call_id()))
+
+        async def coroutine(**kwargs: Any) -> str:
+            return record(await self.ainvoke(original, kwargs, _new_call_id()))
+
+        return tool.model_copy(update={"func": func, "coroutine": coroutine})
+
+
+def _new_call_id() -> str:
+    return f"memo_{uuid.uuid4().hex[:12]}"
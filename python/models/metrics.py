@@ -0,0 +1,384 @@
+"""
+도구 호출 메트릭
+
+도구 호출마다 다음을 측정하여 도구별 히스토그램으로 집계합니다.
+- 벽시계 시간 (스레드 풀 대기 포함)
+- 업스트림 시간 (Yahoo Finance, Tavily 등 외부 호출에 쓴 시간)
+- 결과 크기 (바이트, 추정 토큰 수, 간결 출력 형식으로 절약한 토큰 수)
+- 오류 클래스 (도구가 예외를 잡아 안내 문자열로 바꾼 경우 포함)
+
+집계 결과는 Prometheus 텍스트 형식과 JSONL로 내보낼 수 있습니다.
+"""
+
+import contextvars
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# 히스토그램 버킷 상한
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (128, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536)
+
+METRIC_PREFIX = "invest_tool"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    LLM 토큰 수 추정
+
+    ASCII는 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 1토큰으로 계산합니다.
+    """
+    ascii_chars = sum(1 for ch in text if ch < "\x80")
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+# ============================================
+# 호출 단위 측정
+# ============================================
+
+@dataclass
+class CallMetrics:
+    """도구 호출 한 건의 측정값"""
+    tool_name: str
+    wall_seconds: float = 0.0
+    upstream_seconds: float = 0.0
+    result_bytes: int = 0
+    result_tokens: int = 0
+    saved_tokens: int = 0             # 간결 출력 형식으로 절약한 토큰 수 (tool_output.py)
+    error: Optional[str] = None       # 예외 클래스 이름
+    started_at: float = field(default_factory=time.time)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# 현재 실행 중인 도구 호출 (중첩 호출은 바깥 호출에 합산)
+_current_call: contextvars.ContextVar[Optional[CallMetrics]] = contextvars.ContextVar(
+    "invest_current_tool_call", default=None
+)
+# collect_calls()로 등록한 수집 목록
+_collector: contextvars.ContextVar[Optional[List[CallMetrics]]] = contextvars.ContextVar(
+    "invest_tool_call_collector", default=None
+)
+
+
+@contextmanager
+def upstream_call() -> Iterator[None]:
+    """
+    외부 호출 구간을 감싸 현재 도구 호출의 업스트림 시간에 더합니다.
+
+    run_blocking은 contextvars를 복사하므로 스레드 풀 안의 호출도 집계됩니다.
+    """
+    call = _current_call.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if call is not None:
+            call.upstream_seconds += time.perf_counter() - started
+
+
+def current_tool() -> Optional[str]:
+    """현재 실행 중인 도구 이름 (도구 호출 밖이면 None)"""
+    call = _current_call.get()
+    return call.tool_name if call is not None else None
+
+
+def note_error(exc: BaseException) -> None:
+    """도구가 예외를 잡아 안내 문자열로 반환할 때 오류 클래스를 기록합니다."""
+    call = _current_call.get()
+    if call is not None:
+        call.error = type(exc).__name__
+
+
+def note_saved_tokens(tokens: int) -> None:
+    """간결 출력 형식이 verbose 형식 대비 절약한 토큰 수를 기록합니다."""
+    call = _current_call.get()
+    if call is not None:
+        call.saved_tokens += max(0, tokens)
+
+
+@contextmanager
+def collect_calls() -> Iterator[List[CallMetrics]]:
+    """이 블록 안에서 끝난 도구 호출의 측정값을 목록으로 모읍니다."""
+    calls: List[CallMetrics] = []
+    token = _collector.set(calls)
+    try:
+        yield calls
+    finally:
+        _collector.reset(token)
+
+
+CallHandle = Tuple[CallMetrics, contextvars.Token, float]
+
+
+def begin_call(tool_name: str) -> Optional[CallHandle]:
+    """
+    도구 호출 측정을 시작합니다.
+
+    이미 다른 도구 호출 안이면(비동기 래퍼 → 동기 구현 등) None을 반환합니다.
+    """
+    if _current_call.get() is not None:
+        return None
+    call = CallMetrics(tool_name=tool_name)
+    return call, _current_call.set(call), time.perf_counter()
+
+
+def finish_call(
+    handle: Optional[CallHandle],
+    result: Any = None,
+    error: Optional[BaseException] = None
+) -> Optional[CallMetrics]:
+    """측정을 마치고 공용 집계와 수집 목록에 기록합니다."""
+    if handle is None:
+        return None
+    call, token, started = handle
+    _current_call.reset(token)
+
+    call.wall_seconds = time.perf_counter() - started
+    if error is not None:
+        call.error = type(error).__name__
+    if isinstance(result, str):
+        call.result_bytes = len(result.encode("utf-8"))
+        call.result_tokens = estimate_tokens(result)
+
+    get_tool_metrics().record(call)
+    calls = _collector.get()
+    if calls is not None:
+        calls.append(call)
+    return call
+
+
+# ============================================
+# 집계
+# ============================================
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus 방식)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, 누적 개수) 목록"""
+        total = 0
+        rows = []
+        for bound, n in zip(self.buckets + (math.inf,), self.counts):
+            total += n
+            rows.append(("+Inf" if bound == math.inf else _num(bound), total))
+        return rows
+
+    def quantile(self, q: float) -> float:
+        """
+        버킷 상한 기준 근사 분위수
+
+        +Inf 버킷에 속하면 가장 큰 유한 상한을 반환합니다. (Prometheus histogram_quantile과 같은 규칙,
+        JSON으로 내보낼 때 표준이 아닌 Infinity가 나오지 않도록)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in zip(self.buckets, itertools.accumulate(self.counts)):
+            if total >= rank:
+                return float(bound)
+        return float(self.buckets[-1]) if self.buckets else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": dict(self.cumulative()),
+        }
+
+
+@dataclass
+class ToolStats:
+    """도구 하나의 누적 메트릭"""
+    calls: int = 0
+    cache_hits: int = 0
+    result_tokens: int = 0
+    saved_tokens: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    upstream: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    result_bytes: Histogram = field(default_factory=lambda: Histogram(BYTES_BUCKETS))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "errors": dict(self.errors),
+            "result_tokens": self.result_tokens,
+            "saved_tokens": self.saved_tokens,
+            "latency_p50": self.latency.quantile(0.5),
+            "latency_p95": self.latency.quantile(0.95),
+            "latency_seconds": self.latency.as_dict(),
+            "upstream_seconds": self.upstream.as_dict(),
+            "result_bytes": self.result_bytes.as_dict(),
+        }
+
+
+class ToolMetrics:
+    """
+    도구별 메트릭 집계 (스레드 안전)
+
+    event_log를 지정하면 호출마다 측정값을 JSONL 한 줄로 추가합니다.
+    """
+
+    def __init__(self, event_log: Optional[Path] = None):
+        self.event_log = Path(event_log) if event_log else None
+        self._tools: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: CallMetrics) -> None:
+        with self._lock:
+            stats = self._tools.setdefault(call.tool_name, ToolStats())
+            stats.calls += 1
+            stats.result_tokens += call.result_tokens
+            stats.saved_tokens += call.saved_tokens
+            stats.latency.observe(call.wall_seconds)
+            stats.upstream.observe(call.upstream_seconds)
+            stats.result_bytes.observe(call.result_bytes)
+            if call.error:
+                stats.errors[call.error] = stats.errors.get(call.error, 0) + 1
+
+            if self.event_log is not None:
+                with open(self.event_log, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(call.as_dict(), ensure_ascii=False) + "\n")
+
+    def record_cache_hit(self, tool_name: str) -> None:
+        """메모이제이션으로 도구를 실행하지 않고 응답한 호출"""
+        with self._lock:
+            self._tools.setdefault(tool_name, ToolStats()).cache_hits += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+
+    # ---------- 내보내기 ----------
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """도구별 누적 메트릭"""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._tools.items()}
+
+    def hot_tools(self, by: str = "latency") -> List[Tuple[str, float]]:
+        """
+        총 비용이 큰 순서의 (도구 이름, 합계) 목록
+
+        by: "latency"(총 벽시계 시간), "upstream", "bytes", "tokens"
+        """
+        with self._lock:
+            totals = {
+                name: {
+                    "latency": s.latency.sum,
+                    "upstream": s.upstream.sum,
+                    "bytes": s.result_bytes.sum,
+                    "tokens": float(s.result_tokens),
+                }[by]
+                for name, s in self._tools.items()
+            }
+        return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+
+    def to_jsonl(self) -> str:
+        """도구별 한 줄씩 JSONL 문자열"""
+        now = time.time()
+        return "".join(
+            json.dumps({"timestamp": now, "tool": name, **stats}, ensure_ascii=False) + "\n"
+            for name, stats in self.snapshot().items()
+        )
+
+    def write_jsonl(self, path: Path) -> None:
+        """집계 스냅샷을 JSONL 파일에 추가합니다."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.to_jsonl())
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        p = METRIC_PREFIX
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+
+        with self._lock:
+            items = sorted(self._tools.items())
+
+            header("calls_total", "counter", "Tool invocations")
+            for name, s in items:
+                lines.append(f'{p}_calls_total{{tool="{name}"}} {s.calls}')
+
+            header("cache_hits_total", "counter", "Tool calls answered from memoized results")
+            for name, s in items:
+                lines.append(f'{p}_cache_hits_total{{tool="{name}"}} {s.cache_hits}')
+
+            header("errors_total", "counter", "Tool invocations that failed, by error class")
+            for name, s in items:
+                for error, n in sorted(s.errors.items()):
+                    lines.append(f'{p}_errors_total{{tool="{name}",error="{error}"}} {n}')
+
+            header("result_tokens_total", "counter", "Estimated LLM tokens returned by tools")
+            for name, s in items:
+                lines.append(f'{p}_result_tokens_total{{tool="{name}"}} {s.result_tokens}')
+
+            header("saved_tokens_total", "counter", "Estimated LLM tokens saved by compact tool output")
+            for name, s in items:
+                lines.append(f'{p}_saved_tokens_total{{tool="{name}"}} {s.saved_tokens}')
+
+            for metric, attr, help_text in (
+                ("latency_seconds", "latency", "Tool wall time"),
+                ("upstream_seconds", "upstream", "Time spent in upstream calls"),
+                ("result_bytes", "result_bytes", "Tool result size in UTF-8 bytes"),
+            ):
+                header(metric, "histogram", help_text)
+                for name, s in items:
+                    hist: Histogram = getattr(s, attr)
+                    for le, total in hist.cumulative():
+                        lines.append(f'{p}_{metric}_bucket{{tool="{name}",le="{le}"}} {total}')
+                    lines.append(f'{p}_{metric}_sum{{tool="{name}"}} {_num(hist.sum)}')
+                    lines.append(f'{p}_{metric}_count{{tool="{name}"}} {hist.count}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+_default_metrics: Optional[ToolMetrics] = None
+_default_lock = threading.Lock()
+
+
+def get_tool_metrics() -> ToolMetrics:
+    """
+    프로세스 공용 메트릭 집계를 반환합니다.
+
+    INVEST_TOOL_METRICS_LOG 환경 변수가 있으면 호출별 JSONL 로그를 남깁니다.
+    """
+    global _default_metrics
+    with _default_lock:
+        if _default_metrics is None:
+            _default_metrics = ToolMetrics(event_log=os.environ.get("INVEST_TOOL_METRICS_LOG"))
+        return _default_metrics
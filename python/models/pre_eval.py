@@ -0,0 +1,182 @@
+"""
+로컬 사전 평가 (LLM 평가 전 단계)
+
+notebook 2의 qa_eval은 반복마다 LLM을 한 번 더 호출해 답변을 0-20점으로 평가합니다.
+PreEvaluator는 규칙 기반 신호로 먼저 점수를 매겨
+- 명백히 부족한 답변(거절 문구, 실시간 질문인데 출처·수치 없음) → 바로 검색
+- 명백히 충분한 답변(출처 인용 + 수치 + 필요 시 날짜, 충분한 길이) → 바로 종료
+으로 결정하고, 애매한 답변만 LLM 평가로 넘깁니다.
+
+stats의 적중률(로컬 결정 비율)을 보고 임계값을 조정하세요.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from python.models.llm_cache import needs_realtime
+
+
+# ============================================
+# 신호
+# ============================================
+
+# "확인할 수 없다" 류의 거절·회피 문구
+REFUSAL_PHRASES = (
+    "확인할 수 없", "알 수 없", "제공할 수 없", "답변할 수 없", "접근할 수 없", "조회할 수 없",
+    "실시간 데이터가 필요", "실시간 정보가 필요", "인터넷 검색이 필요", "검색이 필요",
+    "최신 정보를 확인", "정보가 없습니다", "데이터가 없습니다",
+    "i cannot", "i can't", "unable to", "don't have access",
+)
+
+_CITATION = re.compile(r"\[출처\s*\d*\]|출처\s*:|https?://\S+")
+_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?\s*(?:%|원|달러|억|조|만|배|포인트|p\b|건|주|\$)?")
+_DATE = re.compile(
+    r"\d{4}\s*[년./-]\s*\d{1,2}"            # 2025년 10월, 2025-10
+    r"|\d{1,2}\s*월\s*\d{1,2}\s*일"         # 10월 15일
+    r"|\d\s*분기"                           # 3분기
+    r"|(?:어제|오늘|전일|금일|이번 주|지난주)"
+)
+
+
+@dataclass
+class AnswerSignals:
+    """답변 품질 신호"""
+    refusal: bool        # 거절·회피 문구
+    citations: int       # 출처 표기 수
+    numbers: int         # 수치 수 (출처 번호 제외)
+    has_date: bool       # 날짜·기간 표기
+    realtime: bool       # 질문이 실시간 데이터를 요구
+    length: int          # 답변 길이 (공백 제외 문자 수)
+
+
+def answer_signals(query: str, answer: str) -> AnswerSignals:
+    lowered = answer.lower()
+    without_citations = _CITATION.sub(" ", answer)
+    return AnswerSignals(
+        refusal=any(p in lowered for p in REFUSAL_PHRASES),
+        citations=len(_CITATION.findall(answer)),
+        numbers=len(_NUMBER.findall(without_citations)),
+        has_date=bool(_DATE.search(without_citations)),
+        realtime=needs_realtime(query),
+        length=len("".join(answer.split()))
+    )
+
+
+# ============================================
+# 사전 평가
+# ============================================
+
+@dataclass(frozen=True)
+class PreEvalThresholds:
+    """로컬 결정 기준 (점수는 LLM 평가와 같은 0-20 척도)"""
+    accept_score: int = 17     # 이상이면 로컬에서 enough
+    reject_score: int = 7      # 이하면 로컬에서 search
+    min_length: int = 80       # 충분한 답변의 최소 길이 (공백 제외)
+
+
+@dataclass
+class PreEvalStats:
+    """로컬 결정/LLM 위임 카운터"""
+    accepted: int = 0          # 로컬 판정: 충분
+    rejected: int = 0          # 로컬 판정: 부족 (검색 필요)
+    escalated: int = 0         # LLM 평가로 위임
+
+    @property
+    def total(self) -> int:
+        return self.accepted + self.rejected + self.escalated
+
+    @property
+    def hit_rate(self) -> float:
+        """LLM 호출 없이 결정한 비율 (0.0 ~ 1.0)"""
+        return (self.accepted + self.rejected) / self.total if self.total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "escalated": self.escalated,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+@dataclass
+class PreEvaluation:
+    """로컬 평가 결과 (decided가 False면 LLM 평가 필요)"""
+    score: int
+    comment: str
+    needs_more_info: bool
+    decided: bool
+    signals: AnswerSignals
+
+
+class PreEvaluator:
+    """
+    규칙 기반 답변 사전 평가
+
+    점수(0-20)는 기본 10점에서
+    - 출처 인용 +3, 수치 +3, 날짜 +2, 충분한 길이 +2
+    - 거절 문구: 최대 5점
+    - 실시간 질문인데 출처·수치가 없음: 최대 7점
+    로 계산하고, 임계값 사이의 점수는 LLM 평가로 넘깁니다.
+    실시간 질문은 출처와 날짜가 모두 있어야 로컬에서 충분 판정합니다.
+    """
+
+    def __init__(self, thresholds: Optional[PreEvalThresholds] = None):
+        self.thresholds = thresholds or PreEvalThresholds()
+        self.stats = PreEvalStats()
+        self._lock = threading.Lock()
+
+    def score(self, signals: AnswerSignals) -> Tuple[int, str]:
+        """신호 → (점수, 근거)"""
+        t = self.thresholds
+        score = 10
+        reasons = []
+        if signals.citations:
+            score += 3
+            reasons.append(f"출처 {signals.citations}건")
+        if signals.numbers:
+            score += 3
+            reasons.append(f"수치 {signals.numbers}개")
+        if signals.has_date:
+            score += 2
+            reasons.append("날짜 포함")
+        if signals.length >= t.min_length:
+            score += 2
+        else:
+            reasons.append("답변이 짧음")
+        if signals.refusal:
+            score = min(score, 5)
+            reasons.append("거절·회피 문구")
+        if signals.realtime and not signals.citations and not signals.numbers:
+            score = min(score, 7)
+            reasons.append("실시간 질문에 출처·수치 없음")
+        return score, ", ".join(reasons) or "특이 신호 없음"
+
+    def evaluate(self, query: str, answer: str) -> PreEvaluation:
+        """답변을 로컬에서 평가하고 결정 여부를 stats에 기록합니다."""
+        t = self.thresholds
+        signals = answer_signals(query, answer)
+        score, reasons = self.score(signals)
+
+        accept = (
+            score >= t.accept_score
+            and not signals.refusal
+            and (not signals.realtime or (signals.citations and signals.has_date))
+        )
+        reject = score <= t.reject_score
+
+        with self._lock:
+            if accept:
+                self.stats.accepted += 1
+            elif reject:
+                self.stats.rejected += 1
+            else:
+                self.stats.escalated += 1
+
+        if accept:
+            return PreEvaluation(score, f"[로컬 평가] 충분: {reasons}", False, True, signals)
+        if reject:
+            return PreEvaluation(score, f"[로컬 평가] 부족: {reasons}", True, True, signals)
+        return PreEvaluation(score, f"[로컬 평가] 판단 보류: {reasons}", False, False, signals)
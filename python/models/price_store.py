@@ -0,0 +1,476 @@
+"""
+OHLCV 가격 저장소
+
+티커·인터벌별 시세를 로컬 디스크에 컬럼 형식(.npz)으로 보관하고,
+마지막 저장일 이후 누락된 봉만 Yahoo Finance에서 증분 조회합니다. (market_data.py 경유)
+도구들은 이 저장소를 통해 임의의 period를 로컬 데이터로 제공받습니다.
+
+시각은 거래소 현지 시각 기준의 tz-naive 인덱스로 저장합니다.
+(단일 조회와 일괄 다운로드의 인덱스 형식을 맞추기 위함)
+파일에는 형식 버전을 함께 저장하며, 버전이 다른 파일(이전의 UTC 기준 파일 등)은
+읽지 않고 새로 조회해 덮어씁니다.
+
+최근 봉 갱신이 실패하면(응답 지연·회로 차단 등) 저장된 데이터로 응답하고 stale_reads에 셉니다.
+이때 조회일은 마지막 저장 봉의 날짜이므로 도구 결과에 그대로 드러납니다.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from python.models.market_data import get_market_data
+
+
+# ============================================
+# 설정
+# ============================================
+
+OHLCV_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("INVEST_CACHE_DIR", Path.home() / ".cache" / "invest-with-langgraph")
+) / "prices"
+
+# 최근 봉(장중 현재가)을 다시 조회하기 전까지 유지하는 시간 (초)
+DEFAULT_REFRESH_SECONDS = 60.0
+
+# 전체 이력을 보관했음을 나타내는 covered_from 값
+_COVERED_ALL = np.iinfo(np.int64).min
+
+# 저장 파일 형식 버전 (버전이 없는 파일 = 1: UTC 기준 인덱스, 2: 현지 시각 tz-naive 인덱스)
+FORMAT_VERSION = 2
+
+
+# ============================================
+# 기간 계산
+# ============================================
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+def bars_to_calendar_days(bars: int) -> int:
+    """거래일 수를 덮는 최소 달력 일수 (주말 + 공휴일 여유분 포함)"""
+    return int(math.ceil(bars * 7 / 5)) + 10
+
+
+def period_start(period: str, now: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """
+    period 문자열이 요구하는 시작 시점을 계산합니다.
+
+    - "max": None (전체 이력)
+    - "ytd": 올해 1월 1일
+    - "Nd": N 거래일을 덮는 달력 기간
+    - "Nwk", "Nmo", "Ny": 달력 기준 기간
+    """
+    if period == "max":
+        return None
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"지원하지 않는 기간입니다: {period}")
+
+    n, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        offset = pd.Timedelta(days=bars_to_calendar_days(n))
+    elif unit == "wk":
+        offset = pd.DateOffset(weeks=n)
+    elif unit == "mo":
+        offset = pd.DateOffset(months=n)
+    else:
+        offset = pd.DateOffset(years=n)
+    return (now - offset).normalize()
+
+
+def period_bars(period: str) -> Optional[int]:
+    """'Nd' 형식이면 거래일 수 N을, 아니면 None을 반환합니다."""
+    match = _PERIOD_PATTERN.match(period)
+    if match and match.group(2) == "d":
+        return int(match.group(1))
+    return None
+
+
+# ============================================
+# 저장 레코드
+# ============================================
+
+@dataclass
+class _Entry:
+    """티커·인터벌 하나에 대한 저장 데이터"""
+    frame: pd.DataFrame
+    covered_from: int     # 조회를 요청했던 가장 이른 시점 (ns)
+    fetched_at: float     # 마지막 증분 조회 시각 (epoch 초)
+
+
+# ============================================
+# 가격 저장소
+# ============================================
+
+class PriceStore:
+    """
+    티커·인터벌 단위의 영속 OHLCV 저장소
+
+    - 최초 조회 시 필요한 구간만 내려받아 디스크에 저장
+    - 이후에는 마지막 저장일부터의 봉만 증분 조회
+    - 요청 기간이 저장 구간보다 길면 앞쪽 누락 구간만 추가 조회
+    - 최근 봉 갱신에 실패하면 저장된(오래된) 데이터로 응답
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        refresh_seconds: float = DEFAULT_REFRESH_SECONDS
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.refresh_seconds = refresh_seconds
+        self.stale_reads = 0    # 갱신 실패로 저장 데이터를 그대로 반환한 횟수
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        # 티커별 잠금: 서로 다른 티커의 조회는 동시에 진행
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    # ---------- 공개 API ----------
+
+    def history(
+        self,
+        ticker: str,
+        period: str = "1mo",
+        interval: str = "1d",
+        bars: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        period 구간의 OHLCV를 반환합니다.
+
+        bars를 지정하면 period 안에서 마지막 bars개 봉만 필요하다고 보고,
+        둘 중 더 짧은 구간만 조회합니다 (이동평균 window 등).
+        """
+        with self._key_lock(ticker, interval):
+            entry = self._load(ticker, interval)
+            need = self._required_start(period, bars, pd.Timestamp.now())
+            entry = self._sync(ticker, interval, entry, need)
+            if entry is None:
+                return pd.DataFrame(columns=list(OHLCV_COLUMNS))
+
+            return self._slice(entry.frame, period, bars)
+
+    def history_many(
+        self,
+        tickers: Sequence[str],
+        period: str = "1mo",
+        interval: str = "1d",
+        bars: Optional[int] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        여러 티커의 period 구간을 반환합니다.
+
+        로컬 데이터로 부족한 티커만 모아 한 번의 일괄 다운로드로 채웁니다.
+        데이터가 없는 티커는 결과에서 빠집니다.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        with ExitStack() as stack:
+            # 교착 상태를 피하기 위해 정렬된 순서로 잠금
+            for ticker in sorted(tickers):
+                stack.enter_context(self._key_lock(ticker, interval))
+
+            need = self._required_start(period, bars, pd.Timestamp.now())
+            need_ns = _COVERED_ALL if need is None else _to_ns(need)
+
+            entries: Dict[str, Optional[_Entry]] = {}
+            starts: Dict[str, Optional[pd.Timestamp]] = {}
+            for ticker in tickers:
+                entry = self._load(ticker, interval)
+                entries[ticker] = entry
+                if entry is None or need_ns < entry.covered_from:
+                    starts[ticker] = need
+                elif time.time() - entry.fetched_at >= self.refresh_seconds:
+                    starts[ticker] = pd.Timestamp(entry.frame.index[-1])
+
+            if starts:
+                # 가장 이른 시작일로 한 번에 조회
+                known = [s for s in starts.values() if s is not None]
+                start = None if len(known) < len(starts) else min(known)
+                try:
+                    downloaded = self._download_many(list(starts), interval, start=start)
+                except Exception:
+                    # 저장 데이터가 하나도 없으면 실패를 그대로 알림
+                    if all(entries[t] is None for t in starts):
+                        raise
+                    downloaded = {}
+                    self._count_stale_read()
+                fetched_at = time.time()
+
+                for ticker in starts:
+                    frame = downloaded.get(ticker)
+                    entry = entries[ticker]
+                    if frame is None or frame.empty:
+                        continue
+                    if entry is None:
+                        entry = _Entry(frame=frame, covered_from=need_ns, fetched_at=fetched_at)
+                    else:
+                        entry.frame = _merge(entry.frame, frame)
+                        entry.covered_from = min(entry.covered_from, need_ns)
+                        entry.fetched_at = fetched_at
+                    entries[ticker] = entry
+                    self._save(ticker, interval, entry)
+
+            return {
+                ticker: self._slice(entry.frame, period, bars)
+                for ticker, entry in entries.items()
+                if entry is not None
+            }
+
+    def invalidate(self, ticker: str, interval: str = "1d") -> None:
+        """저장된 데이터를 삭제합니다."""
+        with self._key_lock(ticker, interval):
+            self._entries.pop((ticker, interval), None)
+            path = self._path(ticker, interval)
+            if path.exists():
+                path.unlink()
+
+    def _key_lock(self, ticker: str, interval: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault((ticker, interval), threading.Lock())
+
+    def _count_stale_read(self) -> None:
+        # 티커별 잠금만 잡은 서로 다른 조회가 동시에 갱신할 수 있으므로 저장소 잠금으로
+        with self._lock:
+            self.stale_reads += 1
+
+    # ---------- 구간 계산 ----------
+
+    @staticmethod
+    def _required_start(
+        period: str,
+        bars: Optional[int],
+        now: pd.Timestamp
+    ) -> Optional[pd.Timestamp]:
+        """조회가 필요한 가장 이른 시점 (period와 bars 중 짧은 쪽)"""
+        start = period_start(period, now)
+        if bars is None:
+            return start
+
+        bars_start = (now - pd.Timedelta(days=bars_to_calendar_days(bars))).normalize()
+        if start is None:
+            return bars_start
+        return max(start, bars_start)
+
+    @staticmethod
+    def _slice(frame: pd.DataFrame, period: str, bars: Optional[int]) -> pd.DataFrame:
+        """저장 데이터에서 요청 구간을 잘라냅니다."""
+        n = period_bars(period)
+        if n is not None:
+            result = frame.iloc[-n:]
+        else:
+            start = period_start(period, pd.Timestamp.now())
+            result = frame if start is None else frame[frame.index >= start]
+
+        if bars is not None:
+            result = result.iloc[-bars:]
+        return result
+
+    # ---------- 동기화 ----------
+
+    def _sync(
+        self,
+        ticker: str,
+        interval: str,
+        entry: Optional[_Entry],
+        need: Optional[pd.Timestamp]
+    ) -> Optional[_Entry]:
+        """저장 데이터에 누락된 구간만 조회하여 병합합니다."""
+        need_ns = _COVERED_ALL if need is None else _to_ns(need)
+
+        if entry is None:
+            frame = self._download(ticker, interval, start=need)
+            if frame.empty:
+                return None
+            entry = _Entry(frame=frame, covered_from=need_ns, fetched_at=time.time())
+            self._save(ticker, interval, entry)
+            return entry
+
+        changed = False
+
+        # 앞쪽 누락 구간
+        if need_ns < entry.covered_from:
+            end = pd.Timestamp(entry.frame.index[0])
+            head = self._download(ticker, interval, start=need, end=end)
+            entry.frame = _merge(head, entry.frame)
+            entry.covered_from = need_ns
+            changed = True
+
+        # 마지막 저장일 이후 구간 (마지막 봉은 장중 갱신을 위해 다시 조회)
+        if time.time() - entry.fetched_at >= self.refresh_seconds:
+            last = pd.Timestamp(entry.frame.index[-1])
+            try:
+                tail = self._download(ticker, interval, start=last)
+            except Exception:
+                self._count_stale_read()
+            else:
+                entry.frame = _merge(entry.frame, tail)
+                entry.fetched_at = time.time()
+                changed = True
+
+        if changed:
+            self._save(ticker, interval, entry)
+        return entry
+
+    @staticmethod
+    def _download(
+        ticker: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> pd.DataFrame:
+        """Yahoo Finance에서 지정 구간의 OHLCV를 조회합니다."""
+        return _normalize(get_market_data().history(ticker, interval, start=start, end=end))
+
+    @staticmethod
+    def _download_many(
+        tickers: List[str],
+        interval: str,
+        start: Optional[pd.Timestamp] = None
+    ) -> Dict[str, pd.DataFrame]:
+        return download_many(tickers, interval, start=start)
+
+    # ---------- 디스크 입출력 ----------
+
+    def _path(self, ticker: str, interval: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        return self.cache_dir / f"{safe}__{interval}.npz"
+
+    def _load(self, ticker: str, interval: str) -> Optional[_Entry]:
+        """메모리 → 디스크 순으로 저장 데이터를 찾습니다."""
+        key = (ticker, interval)
+        if key in self._entries:
+            return self._entries[key]
+
+        path = self._path(ticker, interval)
+        if not path.exists():
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                version = int(data["version"]) if "version" in data.files else 1
+                if version != FORMAT_VERSION:
+                    # 형식이 다른 파일은 시각 해석이 달라 그대로 쓸 수 없으므로 새로 조회
+                    return None
+                index = pd.DatetimeIndex(data["dates"])
+                frame = pd.DataFrame(
+                    {col: data[col] for col in OHLCV_COLUMNS},
+                    index=index
+                )
+                entry = _Entry(
+                    frame=frame,
+                    covered_from=int(data["covered_from"]),
+                    fetched_at=float(data["fetched_at"])
+                )
+        except (OSError, KeyError, ValueError):
+            # 손상된 파일은 무시하고 새로 조회
+            return None
+
+        self._entries[key] = entry
+        return entry
+
+    def _save(self, ticker: str, interval: str, entry: _Entry) -> None:
+        """원자적으로(임시 파일 → rename) 디스크에 저장합니다."""
+        self._entries[(ticker, interval)] = entry
+
+        path = self._path(ticker, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp.npz")
+
+        np.savez(
+            tmp,
+            version=np.array(FORMAT_VERSION, dtype=np.int64),
+            dates=entry.frame.index.as_unit("ns").asi8,
+            covered_from=np.array(entry.covered_from, dtype=np.int64),
+            fetched_at=np.array(entry.fetched_at, dtype=np.float64),
+            **{col: entry.frame[col].to_numpy(dtype=np.float64) for col in OHLCV_COLUMNS}
+        )
+        os.replace(tmp, path)
+
+
+# ============================================
+# 내부 헬퍼
+# ============================================
+
+def download_many(
+    tickers: Sequence[str],
+    interval: str = "1d",
+    start: Optional[pd.Timestamp] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    여러 티커를 한 번의 요청으로 조회하여 티커별로 나눕니다. (저장소를 거치지 않음)
+
+    데이터가 없는 티커는 결과에서 빠집니다.
+    """
+    tickers = list(tickers)
+    data = get_market_data().download(tickers, interval, start=start)
+    if data is None or data.empty:
+        return {}
+
+    frames = {}
+    for ticker in tickers:
+        if ticker not in data.columns.get_level_values(0):
+            continue
+        frame = _normalize(data[ticker].dropna(how="all"))
+        if not frame.empty:
+            frames[ticker] = frame
+    return frames
+
+
+def _to_ns(ts: pd.Timestamp) -> int:
+    """Timestamp를 ns 정수로 변환합니다."""
+    return int(ts.as_unit("ns").value)
+
+
+def _normalize(hist: pd.DataFrame) -> pd.DataFrame:
+    """OHLCV 컬럼만 남기고 인덱스를 현지 시각 tz-naive로 맞춥니다."""
+    if hist.empty:
+        return hist
+    frame = hist[list(OHLCV_COLUMNS)].astype("float64")
+    if frame.index.tz is not None:
+        frame.index = frame.index.tz_localize(None)
+    return frame
+
+
+def _merge(older: pd.DataFrame, newer: pd.DataFrame) -> pd.DataFrame:
+    """두 구간을 합치고, 겹치는 봉은 newer 쪽 값을 사용합니다."""
+    if newer.empty:
+        return older
+    if older.empty:
+        return newer
+    merged = pd.concat([older, newer])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
+_default_store: Optional[PriceStore] = None
+_default_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """프로세스 공용 가격 저장소를 반환합니다."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = PriceStore()
+        return _default_store
+
+
+def set_price_store(store: PriceStore) -> PriceStore:
+    """공용 가격 저장소를 교체합니다. (벤치마크용 합성 데이터 저장소 등)"""
+    global _default_store
+    with _default_lock:
+        _default_store = store
+        return _default_store
@@ -0,0 +1,522 @@
+"""
+관심 종목 시세 스트리밍 + 증분 지표
+
+장중 대시보드가 몇 초마다 get_stock_price(period="1d")·calculate_moving_average를 호출하면
+매번 이력을 다시 읽고 이동평균 전체 구간을 다시 계산합니다.
+
+QuoteStream은 관심 종목 전체를 폴링 한 번(일괄 조회 한 번)으로 갱신하고
+- 새 봉만 반영하며 (같은 시각의 봉은 장중 갱신으로 보고 마지막 봉만 수정)
+- 이동평균과 괴리율을 봉마다 O(1)로 증분 갱신하고
+- 종목별 최신 스냅샷(QuoteSnapshot)을 공유 메모리 상태에 교체해 둡니다.
+소비자는 snapshot()으로 잠금 없이 읽거나 subscribe()로 갱신을 전달받습니다.
+
+시세 출처:
+- MarketDataQuoteSource: 처음에는 가격 저장소에서 이력을 채우고, 이후에는
+  market_data.py(single-flight + 속도 제한)로 마지막 봉부터 일괄 조회
+- ReplayQuoteSource: 저장된 이력을 폴링마다 한 봉씩 내보내는 로컬 재생 피드 (테스트·오프라인용)
+
+사용법:
+    stream = get_quote_stream()
+    stream.watch("005930.KS", "000660.KS")
+    stream.start()                               # 백그라운드 폴링
+    stream.snapshot("005930.KS").gap_pct[20]     # 20일 이동평균 괴리율
+
+    python -m python.models.quotes 005930.KS AAPL --every 5
+    python -m python.models.quotes 005930.KS AAPL --replay --offline --polls 20
+"""
+
+import argparse
+import math
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import pandas as pd
+
+from python.models.backtest import trend_signal
+from python.models.price_store import OHLCV_COLUMNS, PriceStore, download_many, get_price_store
+
+
+DEFAULT_WINDOWS = (5, 20, 60)
+DEFAULT_POLL_SECONDS = 5.0
+
+# 부동소수 누적 오차를 막기 위해 이 횟수마다 이동평균 합계를 다시 계산
+RESUM_EVERY = 10_000
+
+
+# ============================================
+# 증분 지표
+# ============================================
+
+class RollingMean:
+    """고정 길이 단순 이동평균 (봉 추가·마지막 봉 수정 모두 O(1))"""
+
+    __slots__ = ("window", "_values", "_sum", "_pushes")
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window는 1 이상이어야 합니다.")
+        self.window = window
+        self._values: Deque[float] = deque(maxlen=window)
+        self._sum = 0.0
+        self._pushes = 0
+
+    def push(self, value: float) -> None:
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(value)
+        self._sum += value
+        self._pushes += 1
+        if self._pushes % RESUM_EVERY == 0:
+            self._sum = math.fsum(self._values)
+
+    def revise(self, value: float) -> None:
+        """마지막 값을 바꿉니다. (장중 갱신되는 현재 봉)"""
+        if not self._values:
+            self.push(value)
+            return
+        self._sum += value - self._values[-1]
+        self._values[-1] = value
+
+    @property
+    def value(self) -> float:
+        """이동평균 (값이 window개 미만이면 NaN)"""
+        return self._sum / self.window if len(self._values) == self.window else math.nan
+
+
+@dataclass(frozen=True)
+class QuoteSnapshot:
+    """종목 하나의 최신 시세와 지표 (교체만 되고 수정되지 않음)"""
+    ticker: str
+    time: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    change_pct: float                 # 직전 봉 종가 대비 (%)
+    ma: Dict[int, float]              # 기간별 이동평균
+    gap_pct: Dict[int, float]         # 기간별 괴리율 (%)
+    above: Dict[int, bool]            # 현재가가 이동평균 위인지 (calculate_moving_average의 상승 추세 신호)
+    bars: int                         # 반영한 봉 수
+    updated_at: float = field(default_factory=time.time)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "ticker": self.ticker,
+            "time": self.time.isoformat(),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "change_pct": self.change_pct,
+            "ma": dict(self.ma),
+            "gap_pct": dict(self.gap_pct),
+            "above": dict(self.above),
+            "bars": self.bars,
+            "updated_at": self.updated_at,
+        }
+
+
+class TickerState:
+    """종목 하나의 증분 지표 상태"""
+
+    def __init__(self, ticker: str, windows: Sequence[int]):
+        self.ticker = ticker
+        self.means = {w: RollingMean(w) for w in windows}
+        self.last_time: Optional[pd.Timestamp] = None
+        self.bar: Tuple[float, float, float, float, float] = (math.nan,) * 5
+        self.prev_close = math.nan
+        self.bars = 0
+
+    def apply(self, when: pd.Timestamp, bar: Tuple[float, float, float, float, float]) -> str:
+        """
+        봉 하나를 반영합니다.
+
+        Returns: "new"(새 봉), "revised"(마지막 봉 갱신), "same"(변화 없음), "stale"(이전 봉),
+                 "invalid"(종가가 NaN·inf라 무시)
+        """
+        close = bar[3]
+        if not math.isfinite(close):
+            # 한 번이라도 더하면 이동평균 합계가 계속 NaN이 되므로 반영하지 않음
+            return "invalid"
+        if self.last_time is None or when > self.last_time:
+            self.prev_close = self.bar[3]
+            for mean in self.means.values():
+                mean.push(close)
+            self.last_time, self.bar = when, bar
+            self.bars += 1
+            return "new"
+        if when < self.last_time:
+            return "stale"
+        if bar == self.bar:
+            return "same"
+        for mean in self.means.values():
+            mean.revise(close)
+        self.bar = bar
+        return "revised"
+
+    def snapshot(self) -> QuoteSnapshot:
+        o, h, l, c, v = self.bar
+        ma = {w: m.value for w, m in self.means.items()}
+        return QuoteSnapshot(
+            ticker=self.ticker,
+            time=self.last_time,
+            open=o, high=h, low=l, close=c, volume=v,
+            change_pct=(c / self.prev_close - 1) * 100 if self.prev_close else math.nan,
+            ma=ma,
+            gap_pct={w: (c - m) / m * 100 if m else math.nan for w, m in ma.items()},
+            above={w: bool(trend_signal(c, m)) for w, m in ma.items()},
+            bars=self.bars
+        )
+
+
+# ============================================
+# 시세 출처
+# ============================================
+
+class QuoteSource(Protocol):
+    """
+    시세 출처
+
+    since[ticker]가 None이면 최근 bars개 이상의 봉을, 아니면 그 시각(포함) 이후의 봉을 반환합니다.
+    """
+
+    def fetch(
+        self,
+        tickers: Sequence[str],
+        since: Dict[str, Optional[pd.Timestamp]],
+        bars: int
+    ) -> Dict[str, pd.DataFrame]: ...
+
+
+class MarketDataQuoteSource:
+    """가격 저장소로 초기 이력을 채우고, 이후에는 마지막 봉부터 일괄 조회하는 출처"""
+
+    def __init__(self, interval: str = "1d", store: Optional[PriceStore] = None):
+        self.interval = interval
+        self.store = store
+
+    def fetch(
+        self,
+        tickers: Sequence[str],
+        since: Dict[str, Optional[pd.Timestamp]],
+        bars: int
+    ) -> Dict[str, pd.DataFrame]:
+        seed = [t for t in tickers if since.get(t) is None]
+        live = [t for t in tickers if since.get(t) is not None]
+        frames: Dict[str, pd.DataFrame] = {}
+        if seed:
+            store = self.store or get_price_store()
+            frames.update(store.history_many(seed, period="max", interval=self.interval, bars=bars))
+        if live:
+            # 가장 이른 마지막 봉부터 한 번의 요청으로 (마지막 봉은 장중 갱신 반영)
+            frames.update(download_many(live, self.interval, start=min(since[t] for t in live)))
+        return frames
+
+
+class ReplayQuoteSource:
+    """
+    저장된 이력을 폴링마다 step봉씩 내보내는 재생 피드
+
+    처음에는 warmup봉까지 보여 주고, fetch마다 step봉씩 앞으로 갑니다.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], warmup: int = 60, step: int = 1):
+        self.frames = {t: f[list(OHLCV_COLUMNS)] for t, f in frames.items() if not f.empty}
+        self.cursor = warmup
+        self.step = step
+        self.revealed = 0           # 직전 fetch까지 내보낸 봉 수
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(
+        cls,
+        tickers: Sequence[str],
+        period: str = "1y",
+        warmup: int = 60,
+        step: int = 1,
+        store: Optional[PriceStore] = None
+    ) -> "ReplayQuoteSource":
+        """가격 저장소의 period 구간을 재생합니다."""
+        store = store or get_price_store()
+        return cls(store.history_many(tickers, period=period), warmup=warmup, step=step)
+
+    @property
+    def exhausted(self) -> bool:
+        return all(self.revealed >= len(f) for f in self.frames.values())
+
+    def fetch(
+        self,
+        tickers: Sequence[str],
+        since: Dict[str, Optional[pd.Timestamp]],
+        bars: int
+    ) -> Dict[str, pd.DataFrame]:
+        with self._lock:
+            cursor = self.revealed = self.cursor
+            self.cursor += self.step
+        frames = {}
+        for t in tickers:
+            frame = self.frames.get(t)
+            if frame is None:
+                continue
+            visible = frame.iloc[:cursor]
+            start = since.get(t)
+            frames[t] = visible.iloc[-bars:] if start is None else visible[visible.index >= start]
+        return frames
+
+
+# ============================================
+# 스트림
+# ============================================
+
+@dataclass
+class QuoteStreamStats:
+    polls: int = 0
+    bars_new: int = 0           # 반영한 새 봉
+    bars_revised: int = 0       # 장중 갱신된 마지막 봉
+    updates: int = 0            # 구독자에게 전달한 스냅샷 수
+    errors: int = 0             # 폴링 실패 수
+    last_poll_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "polls": self.polls,
+            "bars_new": self.bars_new,
+            "bars_revised": self.bars_revised,
+            "updates": self.updates,
+            "errors": self.errors,
+            "last_poll_ms": self.last_poll_ms,
+        }
+
+
+class QuoteStream:
+    """
+    관심 종목 시세 스트림
+
+    poll_once()마다 출처를 한 번 호출해 모든 관심 종목의 새 봉을 반영하고,
+    바뀐 종목의 스냅샷만 교체·전달합니다. start()는 interval초 간격의 백그라운드 폴링입니다.
+    """
+
+    def __init__(
+        self,
+        tickers: Sequence[str] = (),
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+        source: Optional[QuoteSource] = None,
+        interval: float = DEFAULT_POLL_SECONDS
+    ):
+        self.windows = tuple(sorted(set(windows)))
+        self.source: QuoteSource = source or MarketDataQuoteSource()
+        self.interval = interval
+        self.stats = QuoteStreamStats()
+        self._states: Dict[str, TickerState] = {}
+        self._snapshots: Dict[str, QuoteSnapshot] = {}
+        self._subscribers: List[Callable[[QuoteSnapshot], None]] = []
+        self._lock = threading.Lock()          # 관심 종목·구독자 목록
+        self._poll_lock = threading.Lock()     # 폴링은 한 번에 하나
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.watch(*tickers)
+
+    # ---------- 관심 종목·구독 ----------
+
+    def watch(self, *tickers: str) -> None:
+        with self._lock:
+            for t in tickers:
+                self._states.setdefault(t, TickerState(t, self.windows))
+
+    def unwatch(self, *tickers: str) -> None:
+        with self._lock:
+            for t in tickers:
+                self._states.pop(t, None)
+                self._snapshots.pop(t, None)
+
+    @property
+    def tickers(self) -> List[str]:
+        with self._lock:
+            return list(self._states)
+
+    def subscribe(self, callback: Callable[[QuoteSnapshot], None]) -> Callable[[], None]:
+        """갱신된 스냅샷을 전달받을 함수를 등록하고, 등록 해제 함수를 반환합니다."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    # ---------- 읽기 ----------
+
+    def snapshot(self, ticker: str) -> Optional[QuoteSnapshot]:
+        """최신 스냅샷 (아직 시세가 없으면 None)"""
+        return self._snapshots.get(ticker)
+
+    def snapshots(self) -> Dict[str, QuoteSnapshot]:
+        return dict(self._snapshots)
+
+    # ---------- 폴링 ----------
+
+    def poll_once(self) -> List[QuoteSnapshot]:
+        """출처를 한 번 조회해 새 봉을 반영하고, 바뀐 종목의 스냅샷을 반환합니다."""
+        with self._poll_lock:
+            started = time.perf_counter()
+            with self._lock:
+                states = dict(self._states)
+                subscribers = list(self._subscribers)
+            if not states:
+                return []
+
+            since = {t: s.last_time for t, s in states.items()}
+            frames = self.source.fetch(list(states), since, self.windows[-1] + 1)
+
+            updated = []
+            for ticker, frame in frames.items():
+                state = states.get(ticker)
+                if state is None or frame.empty:
+                    continue
+                if self._apply(state, frame):
+                    snap = state.snapshot()
+                    self._snapshots[ticker] = snap
+                    updated.append(snap)
+
+            self.stats.polls += 1
+            self.stats.last_poll_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        for snap in updated:
+            for callback in subscribers:
+                try:
+                    callback(snap)
+                    self.stats.updates += 1
+                except Exception:
+                    self.stats.errors += 1
+        return updated
+
+    def _apply(self, state: TickerState, frame: pd.DataFrame) -> bool:
+        """frame 중 마지막 반영 시각 이후의 봉만 반영합니다."""
+        if state.last_time is not None:
+            frame = frame[frame.index >= state.last_time]
+        values = frame[list(OHLCV_COLUMNS)].to_numpy(dtype=float)
+        changed = False
+        for when, row in zip(frame.index, values):
+            result = state.apply(pd.Timestamp(when), tuple(float(x) for x in row))
+            if result == "new":
+                self.stats.bars_new += 1
+                changed = True
+            elif result == "revised":
+                self.stats.bars_revised += 1
+                changed = True
+        return changed
+
+    # ---------- 백그라운드 ----------
+
+    def start(self) -> "QuoteStream":
+        """interval초 간격으로 폴링하는 백그라운드 스레드를 시작합니다."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="invest-quote-stream", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def __enter__(self) -> "QuoteStream":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                self.stats.errors += 1
+            self._stop.wait(self.interval)
+
+
+_default_stream: Optional[QuoteStream] = None
+_default_lock = threading.Lock()
+
+
+def get_quote_stream() -> QuoteStream:
+    """프로세스 공용 시세 스트림을 반환합니다. (대시보드 등 여러 소비자가 공유)"""
+    global _default_stream
+    with _default_lock:
+        if _default_stream is None:
+            _default_stream = QuoteStream()
+        return _default_stream
+
+
+def set_quote_stream(stream: QuoteStream) -> QuoteStream:
+    """공용 시세 스트림을 교체합니다. (재생 피드 사용 등)"""
+    global _default_stream
+    with _default_lock:
+        if _default_stream is not None and _default_stream is not stream:
+            _default_stream.stop()
+        _default_stream = stream
+        return _default_stream
+
+
+# ============================================
+# CLI
+# ============================================
+
+def format_snapshot(snap: QuoteSnapshot) -> str:
+    mas = " ".join(
+        f"MA{w} {snap.ma[w]:.2f}({snap.gap_pct[w]:+.2f}%)" if not math.isnan(snap.ma[w]) else f"MA{w} N/A"
+        for w in snap.ma
+    )
+    return f"{snap.time:%Y-%m-%d %H:%M} {snap.ticker} {snap.close:.2f} ({snap.change_pct:+.2f}%) {mas}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="관심 종목 시세를 스트리밍하며 이동평균·괴리율을 증분 갱신합니다.")
+    parser.add_argument("tickers", nargs="+", help="관심 종목 티커")
+    parser.add_argument("--windows", type=int, nargs="+", default=list(DEFAULT_WINDOWS), help="이동평균 기간")
+    parser.add_argument("--every", type=float, default=DEFAULT_POLL_SECONDS, help="폴링 간격 (초)")
+    parser.add_argument("--interval", default="1d", help="봉 인터벌 (1d, 1h, 5m 등)")
+    parser.add_argument("--polls", type=int, help="이 횟수만큼 폴링하고 종료")
+    parser.add_argument("--replay", action="store_true", help="저장된 1년 이력을 폴링마다 한 봉씩 재생")
+    parser.add_argument("--offline", action="store_true", help="합성 시세 사용 (API 호출 없음)")
+    args = parser.parse_args(argv)
+
+    if args.offline:
+        from python.bench.fakes import install_fakes
+        install_fakes()
+
+    if args.replay:
+        source: QuoteSource = ReplayQuoteSource.from_store(args.tickers, warmup=max(args.windows) + 1)
+    else:
+        source = MarketDataQuoteSource(interval=args.interval)
+    stream = QuoteStream(args.tickers, windows=args.windows, source=source, interval=args.every)
+    stream.subscribe(lambda snap: print(format_snapshot(snap), flush=True))
+
+    polls = 0
+    try:
+        while args.polls is None or polls < args.polls:
+            stream.poll_once()
+            polls += 1
+            if isinstance(source, ReplayQuoteSource) and source.exhausted:
+                break
+            if args.polls is None or polls < args.polls:
+                time.sleep(args.every)
+    except KeyboardInterrupt:
+        pass
+    print(f"폴링 {stream.stats.polls}회, 새 봉 {stream.stats.bars_new}, 갱신 {stream.stats.bars_revised}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+제공자별 토큰 버킷 속도 제한
+
+배치 실행처럼 많은 질의를 동시에 처리하면 LLM·Tavily·Yahoo Finance 호출이
+한꺼번에 몰려 429 오류나 차단을 받기 쉽습니다. 제공자마다 초당 요청 수와
+버스트 크기를 가진 토큰 버킷을 두고, 외부 호출 직전에 토큰을 받습니다.
+
+- llm: 채팅 모델의 rate_limiter로 지정 (ChatOpenAI(rate_limiter=get_rate_limiter("llm")))
+- tavily: TavilyBackend.search/asearch
+- yahoo: market_data.py의 Yahoo Finance 호출 (가격 저장소 다운로드, 기업 정보 조회)
+
+기본값은 제한 없음이며, 환경 변수(INVEST_RATE_LLM 등, 초당 요청 수)나
+configure_rate_limits()로 설정합니다.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+
+PROVIDERS = ("llm", "tavily", "yahoo")
+
+
+@dataclass
+class RateLimitStats:
+    """토큰 획득·대기 카운터"""
+    acquired: int = 0
+    rejected: int = 0           # blocking=False로 즉시 실패한 시도
+    waits: int = 0              # 대기가 필요했던 획득 수
+    waited_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "waits": self.waits,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
+
+
+class TokenBucket(BaseRateLimiter):
+    """
+    토큰 버킷 (스레드 안전, 동기·비동기 겸용)
+
+    - rate: 초당 보충 토큰 수 (= 지속 가능한 초당 요청 수), None/inf면 제한 없음
+    - capacity: 버킷 크기 (버스트 허용량), 기본 max(1, rate)
+    - 대기 요청은 토큰을 미리 차감(예약)하고 부족분만큼 한 번 잠들므로
+      도착 순서대로 공정하게 처리되고, 깨어난 뒤 다시 경쟁하지 않습니다.
+
+    LangChain BaseRateLimiter를 구현하므로 채팅 모델의 rate_limiter로 쓸 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다. (제한 없음은 None)")
+        self.rate = math.inf if rate is None else float(rate)
+        if capacity is not None:
+            self.capacity = float(capacity)
+        else:
+            self.capacity = 1.0 if math.isinf(self.rate) else max(1.0, self.rate)
+        self.stats = RateLimitStats()
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def unlimited(self) -> bool:
+        return math.isinf(self.rate)
+
+    def _reserve(self, blocking: bool) -> Optional[float]:
+        """
+        토큰 하나를 예약하고 기다려야 할 시간을 반환합니다.
+
+        blocking=False인데 토큰이 없으면 예약하지 않고 None.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1 and not blocking:
+                self.stats.rejected += 1
+                return None
+            self._tokens -= 1
+            self.stats.acquired += 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            if wait > 0:
+                self.stats.waits += 1
+                self.stats.waited_seconds += wait
+            return wait
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        if self.unlimited:
+            return True
+        wait = self._reserve(blocking)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if self.unlimited:
+            return True
+        wait = self._reserve(blocking)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+# ============================================
+# 제공자별 공용 버킷
+# ============================================
+
+def _env_rate(provider: str) -> Optional[float]:
+    value = os.environ.get(f"INVEST_RATE_{provider.upper()}")
+    return float(value) if value else None
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """제공자(llm/tavily/yahoo)의 공용 토큰 버킷을 반환합니다."""
+    if provider not in PROVIDERS:
+        raise ValueError(f"알 수 없는 제공자: {provider} (가능: {', '.join(PROVIDERS)})")
+    with _buckets_lock:
+        bucket = _buckets.get(provider)
+        if bucket is None:
+            bucket = _buckets[provider] = TokenBucket(_env_rate(provider))
+        return bucket
+
+
+def configure_rate_limits(
+    burst: Optional[Dict[str, float]] = None,
+    **rates: Optional[float]
+) -> Dict[str, TokenBucket]:
+    """
+    제공자별 초당 요청 수를 설정합니다. (None이면 제한 없음)
+
+    예: configure_rate_limits(llm=5, tavily=2, yahoo=4, burst={"llm": 10})
+
+    이미 rate_limiter로 버킷을 받은 채팅 모델은 이전 버킷을 계속 쓰므로
+    모델을 만들기 전에 호출하세요.
+    """
+    unknown = set(rates) - set(PROVIDERS)
+    if unknown:
+        raise ValueError(f"알 수 없는 제공자: {', '.join(sorted(unknown))}")
+    burst = burst or {}
+    with _buckets_lock:
+        for provider, rate in rates.items():
+            _buckets[provider] = TokenBucket(rate, burst.get(provider))
+        return dict(_buckets)
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, float]]:
+    """제공자별 토큰 획득·대기 통계"""
+    with _buckets_lock:
+        return {provider: bucket.stats.as_dict() for provider, bucket in _buckets.items()}
@@ -0,0 +1,166 @@
+"""
+도구 레지스트리
+
+도구 이름 → 도구 디스크립터 맵입니다.
+도구 객체(이름·설명·입력 스키마)는 가볍게 유지하고, yfinance·pandas 등
+무거운 구현 모듈은 해당 도구가 처음 호출될 때 import합니다.
+도구별 import 시간을 기록하여 워커 기동 시간을 추적할 수 있습니다.
+모든 호출은 metrics.py로 측정됩니다. (지연 시간, 업스트림 시간, 결과 크기, 오류)
+"""
+
+import functools
+import importlib
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.tools import BaseTool
+
+from python.models.executor import run_blocking
+from python.models.metrics import begin_call, finish_call
+
+
+@dataclass
+class ToolDescriptor:
+    """도구 하나의 등록 정보"""
+    name: str
+    tool: BaseTool
+    impl_modules: Tuple[str, ...] = ()
+    loaded: bool = False
+    import_seconds: float = 0.0                                   # 최초 호출 시 import에 걸린 시간
+    module_seconds: Dict[str, float] = field(default_factory=dict)  # 모듈별 import 시간
+
+
+class ToolRegistry:
+    """
+    이름으로 색인된 도구 레지스트리
+
+    register()는 도구의 func/coroutine을 감싸서, 첫 호출 직전에
+    impl_modules를 import하도록 합니다. (이미 import된 모듈은 0초로 기록)
+    같은 래퍼에서 호출별 메트릭 측정을 시작하고 끝냅니다.
+    """
+
+    def __init__(self):
+        self._descriptors: Dict[str, ToolDescriptor] = {}
+        self._lock = threading.Lock()
+
+    # ---------- 등록 ----------
+
+    def register(self, tool: BaseTool, impl_modules: Sequence[str] = ()) -> BaseTool:
+        """도구를 등록하고 지연 로딩 래퍼를 연결합니다."""
+        if tool.name in self._descriptors:
+            raise ValueError(f"이미 등록된 도구입니다: {tool.name}")
+
+        desc = ToolDescriptor(name=tool.name, tool=tool, impl_modules=tuple(impl_modules))
+        self._descriptors[tool.name] = desc
+
+        func = getattr(tool, "func", None)
+        if func is not None:
+            tool.func = self._wrap_sync(desc, func)
+
+        coroutine = getattr(tool, "coroutine", None)
+        if coroutine is not None:
+            tool.coroutine = self._wrap_async(desc, coroutine)
+
+        return tool
+
+    def _wrap_sync(self, desc: ToolDescriptor, func):
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            handle = begin_call(desc.name)
+            try:
+                if not desc.loaded:
+                    self.ensure_loaded(desc.name)
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                finish_call(handle, error=e)
+                raise
+            finish_call(handle, result)
+            return result
+        return wrapper
+
+    def _wrap_async(self, desc: ToolDescriptor, coroutine):
+        @functools.wraps(coroutine)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            handle = begin_call(desc.name)
+            try:
+                if not desc.loaded:
+                    # import는 블로킹이므로 이벤트 루프 밖에서 수행
+                    await run_blocking(self.ensure_loaded, desc.name)
+                result = await coroutine(*args, **kwargs)
+            except BaseException as e:
+                finish_call(handle, error=e)
+                raise
+            finish_call(handle, result)
+            return result
+        return wrapper
+
+    # ---------- 조회 ----------
+
+    def get(self, name: str) -> Optional[BaseTool]:
+        desc = self._descriptors.get(name)
+        return desc.tool if desc else None
+
+    def descriptor(self, name: str) -> Optional[ToolDescriptor]:
+        return self._descriptors.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._descriptors)
+
+    def tools(self) -> List[BaseTool]:
+        """등록 순서대로 도구 목록을 반환합니다. (LLM bind용)"""
+        return [desc.tool for desc in self._descriptors.values()]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._descriptors
+
+    def __len__(self) -> int:
+        return len(self._descriptors)
+
+    def __iter__(self) -> Iterator[BaseTool]:
+        return iter(self.tools())
+
+    # ---------- 지연 로딩 ----------
+
+    def ensure_loaded(self, name: str) -> float:
+        """
+        도구의 구현 모듈을 import하고 걸린 시간(초)을 반환합니다.
+
+        이미 로드되었으면 기록된 시간을 그대로 반환합니다.
+        """
+        desc = self._descriptors[name]
+        with self._lock:
+            if desc.loaded:
+                return desc.import_seconds
+
+            total = 0.0
+            for module in desc.impl_modules:
+                if module in sys.modules:
+                    desc.module_seconds[module] = 0.0
+                    continue
+                started = time.perf_counter()
+                importlib.import_module(module)
+                elapsed = time.perf_counter() - started
+                desc.module_seconds[module] = elapsed
+                total += elapsed
+
+            desc.import_seconds = total
+            desc.loaded = True
+            return total
+
+    def preload(self, names: Optional[Sequence[str]] = None) -> Dict[str, float]:
+        """지정한(기본: 전체) 도구를 미리 로드합니다. 워커 워밍업용."""
+        return {name: self.ensure_loaded(name) for name in (names or self.names())}
+
+    def import_report(self) -> Dict[str, Dict[str, Any]]:
+        """도구별 로드 여부와 import 시간"""
+        return {
+            name: {
+                "loaded": desc.loaded,
+                "import_seconds": round(desc.import_seconds, 4),
+                "modules": {m: round(s, 4) for m, s in desc.module_seconds.items()},
+            }
+            for name, desc in self._descriptors.items()
+        }
@@ -0,0 +1,326 @@
+"""
+꼬리 지연 제어: 도구 마감 시간, 헤지 요청, 회로 차단기
+
+Yahoo Finance나 Tavily가 응답하지 않으면 HTTP 라이브러리가 포기할 때까지 ReAct 단계 전체가 멈추고,
+도구의 except 블록은 그 지연이 끝난 뒤에야 실패를 잡습니다. 이 모듈은 지연의 상한을 둡니다.
+
+- 헤지 요청 (hedged): 멱등 조회가 hedge_after초 안에 끝나지 않으면 같은 요청을 한 번 더 보내
+  먼저 끝난 결과를 쓰고, deadline초가 지나면 UpstreamTimeout으로 포기 (market_data.py)
+  여러 종목 일괄 조회·전체 이력 조회는 원래 느리므로 헤지하지 않고, 호출한 도구의 마감 시간까지 기다림
+- 회로 차단기 (CircuitBreaker): 제공자(yahoo/tavily)별로 연속 실패가 쌓이면 일정 시간 호출하지 않고
+  즉시 CircuitOpenError를 냅니다. 그동안 가격 저장소·기업 정보·검색 캐시는 저장된(오래된) 데이터로 응답
+- 도구 마감 시간 (tool_deadline): 비동기 도구 호출 전체의 상한 (tools.py)
+
+설정은 환경 변수(INVEST_TOOL_DEADLINE, INVEST_BREAKER_FAILURES, INVEST_BREAKER_RESET)나
+configure_tool_deadlines() / configure_circuit_breakers()로 합니다.
+"""
+
+import contextvars
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+PROVIDERS = ("tavily", "yahoo")
+
+
+class CircuitOpenError(RuntimeError):
+    """회로가 열려 있어 업스트림을 호출하지 않고 바로 실패"""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} 응답 지연·오류가 반복되어 호출을 잠시 중단했습니다. ({retry_in:.0f}초 후 재시도)")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class UpstreamTimeout(TimeoutError):
+    """업스트림 호출이 마감 시간 안에 끝나지 않음"""
+
+
+# ============================================
+# 회로 차단기
+# ============================================
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = int(os.environ.get("INVEST_BREAKER_FAILURES", "5"))
+DEFAULT_RESET_SECONDS = float(os.environ.get("INVEST_BREAKER_RESET", "30"))
+
+
+@dataclass
+class BreakerStats:
+    """회로 차단기 카운터"""
+    calls: int = 0
+    failures: int = 0
+    rejected: int = 0       # 회로가 열려 있어 바로 실패시킨 호출
+    opened: int = 0         # 회로가 열린 횟수
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+
+class CircuitBreaker:
+    """
+    연속 실패 기반 회로 차단기 (스레드 안전)
+
+    - closed: 정상 호출, 연속 실패가 failure_threshold회가 되면 open
+    - open: reset_seconds 동안 호출하지 않고 CircuitOpenError
+    - half_open: 시험 호출 하나만 허용, 성공하면 closed·실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_seconds: float = DEFAULT_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold는 1 이상이어야 합니다.")
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.stats = BreakerStats()
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """호출 전에 확인합니다. 회로가 열려 있으면 CircuitOpenError."""
+        with self._lock:
+            if self._state == OPEN:
+                elapsed = self._clock() - self._opened_at
+                if elapsed < self.reset_seconds:
+                    self.stats.rejected += 1
+                    raise CircuitOpenError(self.provider, self.reset_seconds - elapsed)
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN:
+                if self._probing:
+                    self.stats.rejected += 1
+                    raise CircuitOpenError(self.provider, 0.0)
+                self._probing = True
+            self.stats.calls += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.stats.failures += 1
+            self._failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.stats.opened += 1
+                self._state = OPEN
+                self._opened_at = self._clock()
+
+    def call(self, fetch: Callable[[], T]) -> T:
+        """회로 상태를 확인하고 fetch를 호출해 결과를 기록합니다."""
+        self.before_call()
+        try:
+            result = fetch()
+        except BaseException:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def release(self) -> None:
+        """성공·실패로 기록하지 않고 호출을 마칩니다. (half_open 시험 호출 반환)"""
+        with self._lock:
+            self._probing = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """제공자(tavily/yahoo)의 공용 회로 차단기를 반환합니다."""
+    if provider not in PROVIDERS:
+        raise ValueError(f"알 수 없는 제공자: {provider} (가능: {', '.join(PROVIDERS)})")
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = _breakers[provider] = CircuitBreaker(provider)
+        return breaker
+
+
+def configure_circuit_breakers(
+    failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+    reset_seconds: float = DEFAULT_RESET_SECONDS,
+    providers: tuple = PROVIDERS
+) -> Dict[str, CircuitBreaker]:
+    """제공자별 회로 차단기를 새 설정으로 교체합니다."""
+    unknown = set(providers) - set(PROVIDERS)
+    if unknown:
+        raise ValueError(f"알 수 없는 제공자: {', '.join(sorted(unknown))}")
+    with _breakers_lock:
+        for provider in providers:
+            _breakers[provider] = CircuitBreaker(provider, failure_threshold, reset_seconds)
+        return dict(_breakers)
+
+
+def circuit_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """제공자별 회로 상태와 카운터"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {p: {"state": b.state, **b.stats.as_dict()} for p, b in breakers.items()}
+
+
+# ============================================
+# 헤지 요청
+# ============================================
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """멱등 조회의 헤지·마감 규칙"""
+    deadline: float = 10.0      # 이 시간(초)이 지나면 UpstreamTimeout
+    hedge_after: float = 2.0    # 첫 요청이 이 시간(초) 안에 끝나지 않으면 같은 요청을 추가로 보냄
+    max_attempts: int = 2       # 헤지 포함 최대 동시 요청 수
+
+    @classmethod
+    def unhedged(cls, deadline: float) -> "HedgePolicy":
+        """헤지 없이 마감 시간만 두는 규칙 (일괄 조회용)"""
+        return cls(deadline=deadline, hedge_after=math.inf, max_attempts=1)
+
+
+@dataclass
+class HedgeOutcome:
+    """hedged() 호출 한 건의 결과 정보"""
+    attempts: int = 1           # 실제로 보낸 요청 수
+    winner: int = 0             # 결과를 낸 요청 번호 (0 = 첫 요청)
+
+
+# 업스트림 대기 전용 풀: 도구 스레드 풀(executor.py)과 분리해 서로를 기다리며 막히지 않도록
+_HEDGE_WORKERS = int(os.environ.get("INVEST_HEDGE_WORKERS", "32"))
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+_hedge_lock = threading.Lock()
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    with _hedge_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=_HEDGE_WORKERS, thread_name_prefix="invest-upstream")
+        return _hedge_pool
+
+
+def hedged(
+    fetch: Callable[[], T],
+    policy: HedgePolicy,
+    may_hedge: Callable[[], bool] = lambda: True,
+    outcome: Optional[HedgeOutcome] = None
+) -> T:
+    """
+    fetch를 마감 시간 안에 실행하고, 느리면 헤지 요청을 보냅니다.
+
+    먼저 성공한 요청의 결과를 반환하며, 모두 실패하면 마지막 예외를,
+    deadline이 지나면 UpstreamTimeout을 냅니다. 끝나지 않은 요청은 버려집니다.
+    may_hedge()가 False면(속도 제한 토큰 없음 등) 헤지 요청을 보내지 않습니다.
+    fetch는 호출 시점의 contextvars로 실행됩니다.
+    """
+    outcome = outcome if outcome is not None else HedgeOutcome()
+    pool = _get_hedge_pool()
+    ctx = contextvars.copy_context()
+    started = time.monotonic()
+    pending: Dict[Future, int] = {pool.submit(ctx.copy().run, fetch): 0}
+    error: Optional[BaseException] = None
+
+    while pending:
+        elapsed = time.monotonic() - started
+        if elapsed >= policy.deadline:
+            break
+        timeout = policy.deadline - elapsed
+        if outcome.attempts < policy.max_attempts and elapsed < policy.hedge_after:
+            timeout = policy.hedge_after - elapsed
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            index = pending.pop(future)
+            if future.exception() is None:
+                outcome.winner = index
+                return future.result()
+            error = future.exception()
+
+        if (
+            pending
+            and outcome.attempts < policy.max_attempts
+            and time.monotonic() - started >= policy.hedge_after
+            and may_hedge()
+        ):
+            pending[pool.submit(ctx.copy().run, fetch)] = outcome.attempts
+            outcome.attempts += 1
+
+    if pending or error is None:
+        raise UpstreamTimeout(f"업스트림 응답이 {policy.deadline:g}초 안에 오지 않았습니다.")
+    raise error
+
+
+# ============================================
+# 도구 마감 시간
+# ============================================
+
+DEFAULT_TOOL_DEADLINE = float(os.environ.get("INVEST_TOOL_DEADLINE", "20"))
+
+# 여러 종목을 일괄 조회하는 도구는 콜드 캐시에서 오래 걸릴 수 있어 기본값보다 길게
+TOOL_DEADLINES: Dict[str, float] = {
+    "screen_universe": 45.0,
+    "backtest_ma_signal": 45.0,
+}
+
+# 도구 밖(시세 스트림, CLI 등)에서 일괄 조회할 때의 마감 시간
+DEFAULT_BULK_DEADLINE = float(os.environ.get("INVEST_BULK_DEADLINE", "60"))
+
+_deadlines_lock = threading.Lock()
+
+
+def tool_deadline(tool_name: str) -> float:
+    """도구의 마감 시간 (초)"""
+    with _deadlines_lock:
+        return TOOL_DEADLINES.get(tool_name, DEFAULT_TOOL_DEADLINE)
+
+
+def configure_tool_deadlines(default: Optional[float] = None, **per_tool: float) -> Dict[str, float]:
+    """
+    도구 마감 시간을 설정합니다.
+
+    예: configure_tool_deadlines(default=10, screen_universe=30)
+    """
+    global DEFAULT_TOOL_DEADLINE
+    with _deadlines_lock:
+        if default is not None:
+            DEFAULT_TOOL_DEADLINE = float(default)
+        TOOL_DEADLINES.update({name: float(s) for name, s in per_tool.items()})
+        return dict(TOOL_DEADLINES)
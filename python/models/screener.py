@@ -0,0 +1,263 @@
+"""
+종목군 스크리너
+
+"코스피 대형주 중 20일 이동평균 위에 있고 거래량이 늘어난 종목은?" 같은 질문을
+calculate_moving_average 수백 번 대신 한 번의 벡터 연산으로 답합니다.
+
+- 가격 저장소(price_store.py)의 일괄 조회로 종목 × 날짜 종가·거래량 패널(ndarray)을 만들고
+- 이동평균, 괴리율, 이동평균 돌파(골든/데드 크로스), 거래량 증가율을 모든 종목에 대해 동시에 계산한 뒤
+- 조건에 맞는 종목만 순위대로 반환합니다.
+
+기본 종목군은 대표 종목 목록이며, KOSPI 200처럼 구성 종목이 정기 변경되는 지수는
+register_universe("KOSPI200", load_universe_file("kospi200.csv"))로 등록해 사용하세요.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from python.models.price_store import PriceStore, get_price_store
+
+
+# ============================================
+# 종목군
+# ============================================
+
+KOSPI_LARGE: Dict[str, str] = {
+    "005930.KS": "삼성전자", "000660.KS": "SK하이닉스", "373220.KS": "LG에너지솔루션",
+    "207940.KS": "삼성바이오로직스", "005380.KS": "현대차", "000270.KS": "기아",
+    "068270.KS": "셀트리온", "005490.KS": "POSCO홀딩스", "035420.KS": "NAVER",
+    "035720.KS": "카카오", "051910.KS": "LG화학", "006400.KS": "삼성SDI",
+    "105560.KS": "KB금융", "055550.KS": "신한지주", "086790.KS": "하나금융지주",
+    "316140.KS": "우리금융지주", "024110.KS": "기업은행", "138040.KS": "메리츠금융지주",
+    "012330.KS": "현대모비스", "028260.KS": "삼성물산", "066570.KS": "LG전자",
+    "003550.KS": "LG", "034730.KS": "SK", "032830.KS": "삼성생명",
+    "000810.KS": "삼성화재", "015760.KS": "한국전력", "017670.KS": "SK텔레콤",
+    "030200.KS": "KT", "032640.KS": "LG유플러스", "096770.KS": "SK이노베이션",
+    "010950.KS": "S-Oil", "010130.KS": "고려아연", "009150.KS": "삼성전기",
+    "011070.KS": "LG이노텍", "018260.KS": "삼성에스디에스", "033780.KS": "KT&G",
+    "012450.KS": "한화에어로스페이스", "047810.KS": "한국항공우주", "064350.KS": "현대로템",
+    "329180.KS": "HD현대중공업", "009540.KS": "HD한국조선해양", "042660.KS": "한화오션",
+    "010140.KS": "삼성중공업", "267260.KS": "HD현대일렉트릭", "034020.KS": "두산에너빌리티",
+    "003670.KS": "포스코퓨처엠", "047050.KS": "포스코인터내셔널", "004020.KS": "현대제철",
+    "011200.KS": "HMM", "086280.KS": "현대글로비스", "003490.KS": "대한항공",
+    "090430.KS": "아모레퍼시픽", "051900.KS": "LG생활건강", "097950.KS": "CJ제일제당",
+    "271560.KS": "오리온", "021240.KS": "코웨이", "139480.KS": "이마트",
+    "036570.KS": "엔씨소프트", "251270.KS": "넷마블", "259960.KS": "크래프톤",
+    "352820.KS": "하이브", "323410.KS": "카카오뱅크", "377300.KS": "카카오페이",
+    "000100.KS": "유한양행", "128940.KS": "한미약품", "302440.KS": "SK바이오사이언스",
+    "006800.KS": "미래에셋증권", "016360.KS": "삼성증권", "071050.KS": "한국금융지주",
+    "005830.KS": "DB손해보험", "029780.KS": "삼성카드", "000720.KS": "현대건설",
+    "028050.KS": "삼성E&A", "078930.KS": "GS", "036460.KS": "한국가스공사",
+    "161390.KS": "한국타이어앤테크놀로지", "402340.KS": "SK스퀘어", "009830.KS": "한화솔루션",
+}
+
+US_LARGE: Dict[str, str] = {
+    "AAPL": "Apple", "MSFT": "Microsoft", "NVDA": "NVIDIA", "AMZN": "Amazon",
+    "GOOGL": "Alphabet", "META": "Meta Platforms", "TSLA": "Tesla", "AVGO": "Broadcom",
+    "BRK-B": "Berkshire Hathaway", "JPM": "JPMorgan Chase", "V": "Visa", "MA": "Mastercard",
+    "UNH": "UnitedHealth", "XOM": "Exxon Mobil", "JNJ": "Johnson & Johnson", "WMT": "Walmart",
+    "PG": "Procter & Gamble", "HD": "Home Depot", "COST": "Costco", "ORCL": "Oracle",
+    "NFLX": "Netflix", "AMD": "AMD", "KO": "Coca-Cola", "PEP": "PepsiCo",
+    "LLY": "Eli Lilly", "BAC": "Bank of America", "CRM": "Salesforce", "ADBE": "Adobe",
+    "INTC": "Intel", "QCOM": "Qualcomm",
+}
+
+_universes: Dict[str, Dict[str, str]] = {"KOSPI_LARGE": KOSPI_LARGE, "US_LARGE": US_LARGE}
+_universes_lock = threading.Lock()
+
+
+def register_universe(name: str, tickers: Union[Sequence[str], Mapping[str, str]]) -> None:
+    """종목군을 등록합니다. (티커 목록 또는 {티커: 종목명})"""
+    mapping = dict(tickers) if isinstance(tickers, Mapping) else {t: "" for t in tickers}
+    with _universes_lock:
+        _universes[name.upper()] = mapping
+
+
+def load_universe_file(path: Path) -> Dict[str, str]:
+    """"티커[,종목명]" 한 줄에 하나인 파일을 읽습니다. (빈 줄·#으로 시작하는 줄 무시)"""
+    mapping: Dict[str, str] = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        ticker, _, name = line.partition(",")
+        mapping[ticker.strip()] = name.strip()
+    return mapping
+
+
+def get_universe(name: str) -> Dict[str, str]:
+    """등록된 종목군 {티커: 종목명}"""
+    with _universes_lock:
+        universe = _universes.get(name.upper())
+        if universe is None:
+            raise ValueError(f"알 수 없는 종목군입니다: {name} (가능: {', '.join(sorted(_universes))})")
+        return dict(universe)
+
+
+def universe_names() -> List[str]:
+    with _universes_lock:
+        return sorted(_universes)
+
+
+# ============================================
+# 가격 패널
+# ============================================
+
+@dataclass
+class PricePanel:
+    """
+    종목 × 봉 패널 (오른쪽 정렬: 마지막 열이 각 종목의 최근 봉)
+
+    이력이 bars보다 짧은 종목은 앞쪽이 NaN입니다.
+    """
+    tickers: List[str]
+    close: np.ndarray                 # (종목 수, bars)
+    volume: np.ndarray                # (종목 수, bars)
+    last_dates: List[str]             # 종목별 마지막 봉 날짜
+    missing: List[str] = field(default_factory=list)   # 데이터가 없는 티커
+
+
+def load_panel(
+    tickers: Sequence[str],
+    bars: Optional[int] = None,
+    period: str = "max",
+    store: Optional[PriceStore] = None
+) -> PricePanel:
+    """
+    가격 저장소의 일괄 조회로 종가·거래량 패널을 만듭니다.
+
+    bars를 지정하면 마지막 bars개 봉, 아니면 period 구간 전체(가장 긴 종목 기준)입니다.
+    """
+    store = store or get_price_store()
+    tickers = list(dict.fromkeys(tickers))
+    frames = store.history_many(tickers, period=period, bars=bars)
+
+    found = [t for t in tickers if t in frames and not frames[t].empty]
+    if bars is None:
+        bars = max((len(frames[t]) for t in found), default=0)
+    close = np.full((len(found), bars), np.nan)
+    volume = np.full((len(found), bars), np.nan)
+    last_dates = []
+    for i, t in enumerate(found):
+        values = frames[t][["Close", "Volume"]].to_numpy(dtype=np.float64)[-bars:]
+        close[i, bars - len(values):] = values[:, 0]
+        volume[i, bars - len(values):] = values[:, 1]
+        last_dates.append(frames[t].index[-1].strftime("%Y-%m-%d"))
+    return PricePanel(
+        tickers=found,
+        close=close,
+        volume=volume,
+        last_dates=last_dates,
+        missing=[t for t in tickers if t not in found]
+    )
+
+
+# ============================================
+# 스크리닝
+# ============================================
+
+CONDITIONS = ("above", "below", "golden_cross", "dead_cross", "all")
+SORT_KEYS = ("gap", "volume")
+DEFAULT_VOLUME_WINDOW = 5
+
+
+@dataclass
+class ScreenMatch:
+    """조건에 맞는 종목 한 건"""
+    ticker: str
+    close: float
+    ma: float
+    gap_pct: float          # 괴리율 (%)
+    volume_ratio: float     # 최근 volume_window일 평균 거래량 / window일 평균 거래량
+    cross: str              # "golden" / "dead" / ""
+    date: str
+
+
+def screen(
+    panel: PricePanel,
+    window: int = 20,
+    condition: str = "above",
+    min_volume_ratio: Optional[float] = None,
+    min_gap_pct: Optional[float] = None,
+    max_gap_pct: Optional[float] = None,
+    volume_window: int = DEFAULT_VOLUME_WINDOW,
+    sort_by: str = "gap",
+    limit: Optional[int] = 20
+) -> List[ScreenMatch]:
+    """
+    패널 전체에 대해 지표를 한 번에 계산하고 조건에 맞는 종목을 순위대로 반환합니다.
+
+    - above / below: 현재가가 이동평균 위 / 아래
+    - golden_cross / dead_cross: 마지막 봉에서 이동평균을 상향 / 하향 돌파
+    - all: 이동평균 조건 없음 (거래량·괴리율 조건만)
+    정렬은 괴리율(below·dead_cross는 낮은 순, 그 외 높은 순) 또는 거래량 증가율 높은 순입니다.
+    이력이 window + 1봉보다 짧은 종목은 제외됩니다.
+    """
+    if condition not in CONDITIONS:
+        raise ValueError(f"지원하지 않는 조건입니다: {condition} (가능: {', '.join(CONDITIONS)})")
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort_by} (가능: {', '.join(SORT_KEYS)})")
+    if window < 2 or panel.close.shape[1] < window + 1:
+        raise ValueError(f"이동평균 기간이 올바르지 않습니다: {window}")
+    if not panel.tickers:
+        return []
+
+    close, volume = panel.close, panel.volume
+    last, prev = close[:, -1], close[:, -2]
+    ma = close[:, -window:].mean(axis=1)
+    ma_prev = close[:, -window - 1:-1].mean(axis=1)
+    gap = (last - ma) / ma * 100
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_ratio = volume[:, -min(volume_window, window):].mean(axis=1) / volume[:, -window:].mean(axis=1)
+
+    golden = (prev <= ma_prev) & (last > ma)
+    dead = (prev >= ma_prev) & (last < ma)
+
+    mask = ~np.isnan(ma_prev)
+    if condition == "above":
+        mask &= last > ma
+    elif condition == "below":
+        mask &= last < ma
+    elif condition == "golden_cross":
+        mask &= golden
+    elif condition == "dead_cross":
+        mask &= dead
+    if min_volume_ratio is not None:
+        mask &= volume_ratio >= min_volume_ratio
+    if min_gap_pct is not None:
+        mask &= gap >= min_gap_pct
+    if max_gap_pct is not None:
+        mask &= gap <= max_gap_pct
+
+    matched = np.flatnonzero(mask)
+    if sort_by == "volume":
+        order = matched[np.argsort(-volume_ratio[matched], kind="stable")]
+    elif condition in ("below", "dead_cross"):
+        order = matched[np.argsort(gap[matched], kind="stable")]
+    else:
+        order = matched[np.argsort(-gap[matched], kind="stable")]
+    if limit is not None:
+        order = order[:limit]
+
+    return [
+        ScreenMatch(
+            ticker=panel.tickers[i],
+            close=float(last[i]),
+            ma=float(ma[i]),
+            gap_pct=float(gap[i]),
+            volume_ratio=float(volume_ratio[i]),
+            cross="golden" if golden[i] else "dead" if dead[i] else "",
+            date=panel.last_dates[i]
+        )
+        for i in order
+    ]
+
+
+def screened_count(panel: PricePanel, window: int) -> int:
+    """window + 1봉 이상의 이력이 있어 평가된 종목 수"""
+    return int(np.count_nonzero(~np.isnan(panel.close[:, -window - 1]))) if panel.tickers else 0
@@ -0,0 +1,413 @@
+"""
+웹 검색 클라이언트
+
+search_web 도구가 사용하는 프로세스 공용 검색 클라이언트입니다.
+- Tavily HTTP 연결을 풀링하여 재사용
+- 정규화된 쿼리 기준 결과 캐시 (TTL + 크기 제한)
+- 동시에 들어온 같은 검색은 한 번만 실행 (in-flight coalescing)
+- raw_content=True면 페이지 원문(raw_content)까지 요청 (웹 검색 워크플로우의 원문 청크 선별용)
+- "tavily" 회로 차단기: 실패가 반복되면 바로 실패하고, 만료된 결과가 남아 있으면 그 결과로 응답
+- 테스트/벤치마크용 로컬 대체 백엔드 지원
+"""
+
+import asyncio
+import os
+import re
+import threading
+import unicodedata
+import weakref
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+import httpx
+
+from python.models.cache import TTLCache
+from python.models.metrics import upstream_call
+from python.models.rate_limit import get_rate_limiter
+from python.models.resilience import CircuitBreaker, get_circuit_breaker
+
+
+SearchResults = List[Dict[str, Any]]
+
+TAVILY_API_URL = "https://api.tavily.com/search"
+DEFAULT_SEARCH_TTL = 10 * 60.0
+DEFAULT_SEARCH_CACHE_SIZE = 1024
+DEFAULT_STALE_TTL = 24 * 60 * 60.0     # 검색 실패 시 대신 쓸 만료된 결과의 보관 시간
+DEFAULT_SEARCH_TIMEOUT = 10.0          # Tavily HTTP 타임아웃 (초)
+
+
+# ============================================
+# 쿼리 정규화
+# ============================================
+
+_PUNCT = re.compile(r"[^\w\s]")
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용 쿼리 정규화
+
+    유니코드 정규화 → 소문자 → 구두점 제거 → 중복 제거한 토큰 정렬.
+    "삼성전자 주가?"와 "주가 삼성전자"는 같은 키가 됩니다.
+    """
+    text = unicodedata.normalize("NFKC", query).lower()
+    tokens = _PUNCT.sub(" ", text).split()
+    return " ".join(sorted(set(tokens)))
+
+
+# ============================================
+# 검색 백엔드
+# ============================================
+
+class SearchBackend(Protocol):
+    """검색 백엔드 인터페이스 (raw_content=True면 결과에 원문 raw_content 포함)"""
+
+    def search(self, query: str, raw_content: bool = False) -> SearchResults: ...
+
+    async def asearch(self, query: str, raw_content: bool = False) -> SearchResults: ...
+
+
+class TavilyBackend:
+    """
+    연결 풀을 공유하는 Tavily 검색 백엔드
+
+    동기 호출은 하나의 httpx.Client를, 비동기 호출은 이벤트 루프별
+    httpx.AsyncClient를 재사용합니다.
+
+    이벤트 루프별 클라이언트는 asyncio.run 등으로 루프가 종료될 때(shutdown_asyncgens) 닫히며,
+    aclose()로 현재 루프의 클라이언트를, close()로 동기 클라이언트를 직접 닫을 수도 있습니다.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_results: int = 3,
+        search_depth: str = "advanced",
+        include_answer: bool = True,
+        timeout: float = DEFAULT_SEARCH_TIMEOUT,
+        max_connections: int = 20
+    ):
+        self.api_key = api_key
+        self.params = {
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "include_answer": include_answer,
+        }
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        )
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # 루프 종료 시 클라이언트를 닫는 비동기 제너레이터 (루프는 약한 참조만 보관하므로 여기서 유지)
+        self._closers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def search(self, query: str, raw_content: bool = False) -> SearchResults:
+        get_rate_limiter("tavily").acquire()
+        with upstream_call():
+            response = self._sync_client().post(TAVILY_API_URL, json=self._payload(query, raw_content))
+        response.raise_for_status()
+        return response.json().get("results", [])
+
+    async def asearch(self, query: str, raw_content: bool = False) -> SearchResults:
+        await get_rate_limiter("tavily").aacquire()
+        with upstream_call():
+            response = await self._async_client().post(TAVILY_API_URL, json=self._payload(query, raw_content))
+        response.raise_for_status()
+        return response.json().get("results", [])
+
+    def _payload(self, query: str, raw_content: bool = False) -> Dict[str, Any]:
+        return {"query": query, **self.params, "include_raw_content": raw_content}
+
+    def _headers(self) -> Dict[str, str]:
+        api_key = self.api_key or os.environ.get("TAVILY_API_KEY")
+        if not api_key:
+            raise ValueError("TAVILY_API_KEY 환경 변수가 설정되지 않았습니다.")
+        return {"Authorization": f"Bearer {api_key}"}
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    headers=self._headers(), timeout=self.timeout, limits=self.limits
+                )
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is not None:
+                return client
+            client = httpx.AsyncClient(
+                headers=self._headers(), timeout=self.timeout, limits=self.limits
+            )
+            self._async_clients[loop] = client
+        self._close_on_shutdown(loop, client)
+        return client
+
+    def _close_on_shutdown(self, loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+        """
+        루프가 종료될 때 client를 닫습니다.
+
+        실행 중인 루프에서 시작한 비동기 제너레이터는 루프에 등록되고,
+        asyncio.run은 루프를 닫기 전에 shutdown_asyncgens()로 이를 종료하므로 finally가 실행됩니다.
+        """
+        async def closer():
+            try:
+                yield
+            finally:
+                with self._lock:
+                    if self._async_clients.get(loop) is client:
+                        del self._async_clients[loop]
+                await client.aclose()
+
+        agen = closer()
+        self._closers[loop] = agen
+        asyncio.ensure_future(agen.asend(None))
+
+    def close(self) -> None:
+        """동기 클라이언트를 닫습니다."""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 비동기 클라이언트를 닫습니다."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+            self._closers.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+
+class LocalSearchBackend:
+    """
+    네트워크 없이 동작하는 로컬 대체 백엔드
+
+    주어진 문서들 중 쿼리 토큰과 많이 겹치는 순서로 max_results개를 반환합니다.
+    raw_content=False면 Tavily처럼 문서의 raw_content를 빼고 반환합니다.
+    호출 횟수는 calls에 기록됩니다.
+    """
+
+    def __init__(self, documents: Sequence[Dict[str, Any]], max_results: int = 3):
+        self.documents = list(documents)
+        self.max_results = max_results
+        self.calls = 0
+
+    def search(self, query: str, raw_content: bool = False) -> SearchResults:
+        self.calls += 1
+        tokens = set(normalize_query(query).split())
+
+        def overlap(doc: Dict[str, Any]) -> int:
+            text = f"{doc.get('title', '')} {doc.get('content', '')}"
+            return len(tokens & set(normalize_query(text).split()))
+
+        ranked = sorted(self.documents, key=overlap, reverse=True)
+        return [
+            {k: v for k, v in doc.items() if raw_content or k != "raw_content"}
+            for doc in ranked[:self.max_results]
+        ]
+
+    async def asearch(self, query: str, raw_content: bool = False) -> SearchResults:
+        return self.search(query, raw_content)
+
+
+# ============================================
+# 캐시 + 요청 병합 클라이언트
+# ============================================
+
+def _cache_key(query: str, raw_content: bool) -> str:
+    # 원문 포함 결과는 별도 항목으로 (요약만 요청한 호출에 큰 원문을 돌려주지 않도록)
+    key = normalize_query(query)
+    return f"raw:{key}" if raw_content else key
+
+
+class _LeaderCancelled(Exception):
+    """병합을 이끌던 검색이 취소됨 (합류한 호출은 다시 시도)"""
+
+
+class SearchClient:
+    """
+    검색 결과 캐시와 요청 병합을 제공하는 클라이언트
+
+    같은 정규화 쿼리가 실행 중이면 새로 요청하지 않고 그 결과를 기다립니다.
+    coalesced는 그렇게 절약한 호출 수입니다.
+
+    백엔드 호출은 회로 차단기를 거치며, 실패하면 stale_ttl 동안 보관한 이전 결과로
+    응답합니다 (stale_served). 이전 결과가 없으면 실패를 그대로 알립니다.
+    먼저 시작한 비동기 검색이 취소되면(도구 마감 시간 등) 실패로 세지 않고,
+    합류해 기다리던 호출 중 하나가 새로 검색합니다.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[SearchBackend] = None,
+        ttl: float = DEFAULT_SEARCH_TTL,
+        maxsize: int = DEFAULT_SEARCH_CACHE_SIZE,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.backend: SearchBackend = backend or TavilyBackend()
+        self.cache: TTLCache[SearchResults] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.stale: TTLCache[SearchResults] = TTLCache(maxsize=maxsize, ttl=stale_ttl)
+        self.coalesced = 0
+        self.stale_served = 0
+        self._breaker = breaker
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def search(self, query: str, raw_content: bool = False) -> SearchResults:
+        key = _cache_key(query, raw_content)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                return future.result()
+            except _LeaderCancelled:
+                return self.search(query, raw_content)
+
+        breaker = self.breaker
+        try:
+            results = breaker.call(lambda: self.backend.search(query, raw_content=raw_content))
+        except Exception as e:
+            return self._fallback(key, future, e)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, results=results)
+        return results
+
+    async def asearch(self, query: str, raw_content: bool = False) -> SearchResults:
+        key = _cache_key(query, raw_content)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                # 기다리던 쪽이 취소되어도 공유 Future는 취소하지 않음
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderCancelled:
+                return await self.asearch(query, raw_content)
+
+        breaker = self.breaker
+        try:
+            breaker.before_call()
+            try:
+                results = await self.backend.asearch(query, raw_content=raw_content)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except BaseException:
+                breaker.record_failure()
+                raise
+            breaker.record_success()
+        except Exception as e:
+            return self._fallback(key, future, e)
+        except asyncio.CancelledError:
+            self._finish(key, future, error=_LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, results=results)
+        return results
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker or get_circuit_breaker("tavily")
+
+    def _fallback(self, key: str, future: Future, error: Exception) -> SearchResults:
+        """검색 실패 시 보관 중인 이전 결과로 응답하고, 없으면 예외를 다시 냅니다."""
+        stale = self.stale.get(key)
+        if stale is None:
+            self._finish(key, future, error=error)
+            raise error
+        with self._lock:
+            self._inflight.pop(key, None)
+            self.stale_served += 1
+        future.set_result(stale)
+        return stale
+
+    def _join(self, key: str):
+        """실행 중인 같은 검색이 있으면 합류하고, 없으면 새로 등록합니다."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _finish(
+        self,
+        key: str,
+        future: Future,
+        results: Optional[SearchResults] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+            return
+        self.cache.set(key, results)
+        self.stale.set(key, results)
+        future.set_result(results)
+
+    def close(self) -> None:
+        """백엔드의 동기 연결을 닫습니다. (캐시는 유지)"""
+        close = getattr(self.backend, "close", None)
+        if close is not None:
+            close()
+
+    async def aclose(self) -> None:
+        """백엔드의 현재 이벤트 루프 연결을 닫습니다. (캐시는 유지)"""
+        aclose = getattr(self.backend, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats.as_dict(), "coalesced": self.coalesced, "stale_served": self.stale_served}
+
+
+_default_client: Optional[SearchClient] = None
+_default_lock = threading.Lock()
+
+
+def get_search_client() -> SearchClient:
+    """프로세스 공용 검색 클라이언트를 반환합니다."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = SearchClient()
+        return _default_client
+
+
+def set_search_backend(backend: SearchBackend, **kwargs: Any) -> SearchClient:
+    """
+    공용 클라이언트의 백엔드를 교체합니다. (테스트용 로컬 백엔드 등)
+
+    캐시도 새로 시작합니다. 이전 클라이언트의 동기 연결 풀은 여기서 닫고,
+    이벤트 루프별 비동기 연결은 각 루프가 종료될 때 닫힙니다.
+    (실행 중인 루프에서 바로 닫으려면 교체 전에 await get_search_client().aclose())
+    """
+    global _default_client
+    with _default_lock:
+        previous, _default_client = _default_client, SearchClient(backend=backend, **kwargs)
+        client = _default_client
+    if previous is not None:
+        previous.close()
+    return client
@@ -0,0 +1,84 @@
+"""
+도구 결과 스필(spill) 파일
+
+큰 도구 결과(검색 본문 등)를 메모리 대신 추가 전용(append-only) 파일에 저장하고
+(offset, length) 참조로 필요할 때만 다시 읽습니다.
+"""
+
+import os
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+SpillRef = Tuple[int, int]   # (offset, length) - 바이트 단위
+
+
+class SpillFile:
+    """
+    추가 전용 결과 저장 파일
+
+    path를 지정하지 않으면 첫 기록 시 임시 파일을 만들고,
+    close() 또는 객체 소멸 시 삭제합니다.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = Path(path) if path else None
+        self._size = 0
+        self._lock = threading.Lock()
+        self._finalizer: Optional[weakref.finalize] = None
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def write(self, text: str) -> SpillRef:
+        """문자열을 파일 끝에 추가하고 참조를 반환합니다."""
+        data = text.encode("utf-8")
+        with self._lock:
+            path = self._ensure_path()
+            with open(path, "ab") as f:
+                offset = self._size
+                f.write(data)
+            self._size += len(data)
+        return offset, len(data)
+
+    def read(self, ref: SpillRef) -> str:
+        """참조 위치의 문자열을 읽습니다."""
+        offset, length = ref
+        with self._lock:
+            if self._path is None:
+                raise ValueError("스필 파일에 기록된 내용이 없습니다.")
+            with open(self._path, "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        return data.decode("utf-8")
+
+    def close(self) -> None:
+        """소유한 임시 파일을 삭제합니다. 이후 기록은 새 임시 파일에 합니다."""
+        with self._lock:
+            if self._finalizer is not None:
+                self._finalizer()
+                self._finalizer = None
+                self._path = None
+                self._size = 0
+
+    def _ensure_path(self) -> Path:
+        if self._path is None:
+            fd, name = tempfile.mkstemp(prefix="tool-results-", suffix=".spill")
+            os.close(fd)
+            self._path = Path(name)
+            self._finalizer = weakref.finalize(self, _remove, name)
+        elif self._size == 0 and self._path.exists():
+            # 기존 파일에 이어서 기록
+            self._size = self._path.stat().st_size
+        return self._path
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
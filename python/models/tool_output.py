@@ -0,0 +1,239 @@
+"""
+도구 결과 출력 형식
+
+도구 결과는 Agent의 메시지 히스토리에 남아 이후 LLM 호출마다 다시 전송됩니다.
+기본(verbose) 형식은 사람이 읽기 좋은 여러 줄 한국어 템플릿이고,
+간결 형식은 같은 내용을 적은 토큰으로 전달합니다.
+
+- verbose: 기존 템플릿 ("티커: ...\\n회사명: ...")
+- kv: 한 줄 key=value ("ticker=005930.KS name=... close=71200")
+- json: 공백 없는 JSON
+
+간결 형식에서는 수치를 반올림하고(큰 수는 M/B/T 단위), 검색 본문을 잘라내며,
+도구별 바이트 한도를 넘으면 목록 뒤쪽 항목부터 덜어냅니다.
+verbose 대비 절약한 토큰 수는 호출 메트릭(saved_tokens)에 기록됩니다.
+
+형식은 환경 변수 INVEST_TOOL_OUTPUT, configure_tool_output(), 또는
+with tool_output(mode="kv"): 블록으로 선택합니다.
+"""
+
+import contextvars
+import json
+import math
+import numbers
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from python.models.metrics import estimate_tokens, note_saved_tokens
+
+
+OUTPUT_MODES = ("verbose", "kv", "json")
+
+# 도구별 바이트 한도 (간결 형식에만 적용)
+DEFAULT_MAX_BYTES: Dict[str, int] = {
+    "search_web": 1200,
+    "get_stock_prices": 1000,
+    "analyze_technicals": 600,
+    "screen_universe": 1200,
+    "backtest_ma_signal": 1200,
+}
+DEFAULT_TOOL_MAX_BYTES = 400
+
+
+@dataclass(frozen=True)
+class ToolOutputConfig:
+    """도구 결과 출력 설정"""
+    mode: str = "verbose"
+    decimals: int = 2                 # 수치 반올림 자릿수
+    snippet_chars: int = 200          # 검색 결과 본문 최대 글자 수
+    max_bytes: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MAX_BYTES))
+    default_max_bytes: int = DEFAULT_TOOL_MAX_BYTES
+
+    def __post_init__(self):
+        if self.mode not in OUTPUT_MODES:
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {self.mode} (가능: {', '.join(OUTPUT_MODES)})")
+
+    @property
+    def compact(self) -> bool:
+        return self.mode != "verbose"
+
+    def limit_for(self, tool_name: str) -> int:
+        return self.max_bytes.get(tool_name, self.default_max_bytes)
+
+
+# ============================================
+# 설정
+# ============================================
+
+_default_config = ToolOutputConfig(mode=os.environ.get("INVEST_TOOL_OUTPUT", "verbose"))
+_default_lock = threading.Lock()
+
+# tool_output() 블록 안의 설정 (run_blocking·ToolNode는 contextvars를 복사하므로 도구까지 전달)
+_current_config: contextvars.ContextVar[Optional[ToolOutputConfig]] = contextvars.ContextVar(
+    "invest_tool_output", default=None
+)
+
+
+def get_tool_output() -> ToolOutputConfig:
+    """현재 적용되는 출력 설정 (tool_output 블록 → 프로세스 기본값)"""
+    return _current_config.get() or _default_config
+
+
+def configure_tool_output(**changes: Any) -> ToolOutputConfig:
+    """
+    프로세스 기본 출력 설정을 바꿉니다.
+
+    예: configure_tool_output(mode="kv", snippet_chars=150)
+    """
+    global _default_config
+    with _default_lock:
+        _default_config = replace(_default_config, **changes)
+        return _default_config
+
+
+@contextmanager
+def tool_output(**changes: Any) -> Iterator[ToolOutputConfig]:
+    """이 블록 안의 도구 호출에만 출력 설정을 적용합니다."""
+    config = replace(get_tool_output(), **changes)
+    token = _current_config.set(config)
+    try:
+        yield config
+    finally:
+        _current_config.reset(token)
+
+
+# ============================================
+# 간결 형식
+# ============================================
+
+_UNITS = ((1e12, "T"), (1e9, "B"), (1e6, "M"))
+
+
+def compact_number(value: Any, decimals: int = 2) -> Any:
+    """
+    수치를 간결하게 표현합니다. (수치가 아니면 그대로)
+
+    - NaN → None
+    - 100만 이상: M/B/T 단위 문자열 (93100000000 → "93.1B")
+    - 1만 이상: 정수 (원화 주가·거래량 등)
+    - 그 외: decimals 자리 반올림, 정수 값이면 int
+    """
+    if isinstance(value, bool) or not isinstance(value, numbers.Real):
+        return value
+    value = float(value)
+    if math.isnan(value):
+        return None
+    for threshold, unit in _UNITS:
+        if abs(value) >= threshold:
+            scaled = f"{value / threshold:.{decimals}f}".rstrip("0").rstrip(".")
+            return f"{scaled}{unit}"
+    if abs(value) >= 1e4:
+        return int(round(value))
+    rounded = round(value, decimals)
+    return int(rounded) if rounded.is_integer() else rounded
+
+
+def snippet(text: str, limit: int) -> str:
+    """공백을 정리하고 limit자까지 자릅니다."""
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+
+def _compact(value: Any, decimals: int) -> Any:
+    if isinstance(value, dict):
+        return {k: _compact(v, decimals) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_compact(v, decimals) for v in value]
+    return compact_number(value, decimals)
+
+
+def _kv_value(value: Any) -> str:
+    if value is None:
+        return "NA"
+    text = str(value)
+    if not text or any(ch.isspace() or ch in '="' for ch in text):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+def render_kv(record: Dict[str, Any]) -> str:
+    """
+    key=value 형식
+
+    스칼라 필드는 첫 줄에 이어 쓰고, 딕셔너리는 점 표기(sma.20=...),
+    딕셔너리 목록(표의 행, 검색 결과)은 한 줄에 하나씩 씁니다.
+    """
+    head: List[str] = []
+    rows: List[str] = []
+    for key, value in record.items():
+        if isinstance(value, list):
+            if value and isinstance(value[0], dict):
+                rows.extend(" ".join(f"{k}={_kv_value(v)}" for k, v in item.items()) for item in value)
+            elif value:
+                head.append(f"{key}={','.join(_kv_value(v) for v in value)}")
+        elif isinstance(value, dict):
+            head.extend(f"{key}.{k}={_kv_value(v)}" for k, v in value.items())
+        else:
+            head.append(f"{key}={_kv_value(value)}")
+    return "\n".join(([" ".join(head)] if head else []) + rows)
+
+
+def render_json(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def truncate_bytes(text: str, limit: int) -> str:
+    """UTF-8 limit 바이트 안으로 자르고 잘린 크기를 표시합니다."""
+    data = text.encode("utf-8")
+    if len(data) <= limit:
+        return text
+    marker = f"…(+{len(data) - limit}B)"
+    cut = data[:max(0, limit - len(marker.encode("utf-8")))].decode("utf-8", errors="ignore")
+    return cut + marker
+
+
+def _fit(record: Dict[str, Any], render: Callable[[Dict[str, Any]], str], limit: int) -> str:
+    """바이트 한도를 넘으면 가장 긴 목록의 마지막 항목부터 덜어내고, 그래도 넘으면 자릅니다."""
+    text = render(record)
+    record = dict(record)
+    while len(text.encode("utf-8")) > limit:
+        lists = [k for k, v in record.items() if isinstance(v, list) and len(v) > 1]
+        if not lists:
+            break
+        key = max(lists, key=lambda k: len(record[k]))
+        record[key] = record[key][:-1]
+        record["truncated"] = record.get("truncated", 0) + 1
+        text = render(record)
+    return truncate_bytes(text, limit)
+
+
+# ============================================
+# 렌더링
+# ============================================
+
+def render_tool_output(
+    tool_name: str,
+    record: Dict[str, Any],
+    verbose: Callable[[], str],
+    config: Optional[ToolOutputConfig] = None
+) -> str:
+    """
+    도구 결과를 현재 형식으로 렌더링합니다.
+
+    Args:
+        record: 결과 필드 (간결 형식의 원본)
+        verbose: 기존 템플릿 문자열을 만드는 함수 (verbose 형식, 절약량 계산에 사용)
+
+    간결 형식이면 verbose 대비 절약한 토큰 수를 현재 도구 호출 메트릭에 기록합니다.
+    """
+    config = config or get_tool_output()
+    if not config.compact:
+        return verbose()
+
+    render = render_kv if config.mode == "kv" else render_json
+    text = _fit(_compact(record, config.decimals), render, config.limit_for(tool_name))
+    note_saved_tokens(estimate_tokens(verbose()) - estimate_tokens(text))
+    return text
@@ -2,13 +2,35 @@
 투자 분석을 위한 도구(Tool) 모음
 
 LangChain Tool 프레임워크를 사용하여 투자 분석에 필요한 도구들을 정의합니다.
+
+yfinance·pandas·numpy 등 무거운 구현 모듈은 각 도구 안에서 import하며,
+도구 레지스트리(registry.py)가 첫 호출 시점에 로드하고 import 시간을 기록합니다.
+
+각 도구는 결과 필드(record)와 기존 템플릿을 함께 만들고, 출력 형식
+(tool_output.py: verbose / kv / json)에 따라 하나로 렌더링합니다.
+
+비동기 호출에는 도구별 마감 시간(resilience.py)이 있어, 넘기면 기다리지 않고
+"도구 응답 시간 초과" 안내를 반환합니다.
 """
 
-from typing import Annotated, List, Dict, Any, Optional
+import asyncio
+import functools
+import json
+import math
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Annotated, Deque, List, Dict, Any, Optional
 from langchain_core.tools import tool
-from langchain_community.tools.tavily_search import TavilySearchResults
-import yfinance as yf
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from python.models.executor import run_blocking
+from python.models.metrics import CallMetrics, collect_calls, note_error
+from python.models.registry import ToolRegistry
+from python.models.resilience import tool_deadline
+from python.models.spill import SpillFile, SpillRef
+from python.models.tool_output import get_tool_output, render_tool_output, snippet
 
 
 # ============================================
@@ -21,13 +43,29 @@ def search_web(query: Annotated[str, "검색할 쿼리문"]) -> str:
     웹에서 실시간 정보를 검색합니다.
     주식 뉴스, 시장 동향, 기업 정보 등을 찾을 때 사용하세요.
     """
-    tavily = TavilySearchResults(
-        max_results=3,
-        search_depth="advanced",
-        include_answer=True
-    )
-    results = tavily.invoke(query)
+    from python.models.search import get_search_client
+
+    # 공용 클라이언트: 연결 재사용 + 결과 캐시 + 동일 검색 병합
+    results = get_search_client().search(query)
+    return _format_search_results(results)
+
+
+def _format_search_results(results: List[Dict[str, Any]]) -> str:
+    config = get_tool_output()
+    record = {
+        "results": [
+            {
+                "title": r.get('title', 'N/A'),
+                "snippet": snippet(r.get('content', 'N/A'), config.snippet_chars),
+                "url": r.get('url', 'N/A'),
+            }
+            for r in results
+        ]
+    }
+    return render_tool_output("search_web", record, lambda: _verbose_search_results(results), config)
 
+
+def _verbose_search_results(results: List[Dict[str, Any]]) -> str:
     formatted = []
     for r in results:
         formatted.append(
@@ -50,31 +88,113 @@ def get_stock_price(
     한국 주식: 종목코드.KS (예: 005930.KS)
     미국 주식: 티커 심볼 (예: AAPL, TSLA)
     """
+    from python.models.fundamentals import get_fundamentals_cache
+    from python.models.price_store import get_price_store
+
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period)
+        hist = get_price_store().history(ticker, period=period)
 
         if hist.empty:
             return f"티커 '{ticker}'에 대한 데이터를 찾을 수 없습니다."
 
         latest = hist.iloc[-1]
-        info = stock.info
-
-        return f"""
+        # 캐시된 회사명이 있으면 info 조회를 기다리지 않음
+        name = get_fundamentals_cache().get_name(ticker)
+        date = hist.index[-1].strftime('%Y-%m-%d')
+
+        record = {
+            "ticker": ticker,
+            "name": name,
+            "close": latest['Close'],
+            "open": latest['Open'],
+            "high": latest['High'],
+            "low": latest['Low'],
+            "volume": latest['Volume'],
+            "period": period,
+            "date": date,
+        }
+        return render_tool_output("get_stock_price", record, lambda: f"""
 티커: {ticker}
-회사명: {info.get('longName', 'N/A')}
+회사명: {name}
 현재가: {latest['Close']:.2f}
 시가: {latest['Open']:.2f}
 고가: {latest['High']:.2f}
 저가: {latest['Low']:.2f}
 거래량: {latest['Volume']:,.0f}
 기간: {period}
-조회일: {hist.index[-1].strftime('%Y-%m-%d')}
-"""
+조회일: {date}
+""")
     except Exception as e:
+        note_error(e)
         return f"주가 조회 중 오류 발생: {str(e)}"
 
 
+@tool
+def get_stock_prices(
+    tickers: Annotated[List[str], "주식 티커 심볼 목록 (예: ['005930.KS', '000660.KS'])"],
+    period: Annotated[str, "조회 기간 (1d, 5d, 1mo, 3mo, 1y)"] = "1mo"
+) -> str:
+    """
+    여러 주식의 가격 정보를 한 번에 조회합니다.
+    여러 종목을 비교할 때는 get_stock_price를 반복 호출하지 말고 이 도구를 사용하세요.
+    종목별 현재가, 시가, 고가, 저가, 거래량, 기간 변동률을 표로 반환합니다.
+    """
+    import numpy as np
+    from python.models.price_store import get_price_store
+
+    try:
+        frames = get_price_store().history_many(tickers, period=period)
+        found = [t for t in tickers if t in frames and not frames[t].empty]
+        missing = [t for t in tickers if t not in found]
+
+        if not found:
+            return f"티커 {', '.join(tickers)}에 대한 데이터를 찾을 수 없습니다."
+
+        # 종목 × (Open, High, Low, Close, Volume) 배열로 한 번에 계산
+        latest = np.array([frames[t].iloc[-1].to_numpy() for t in found])
+        first_close = np.array([frames[t]['Close'].iloc[0] for t in found])
+        change = (latest[:, 3] / first_close - 1) * 100
+
+        dates = [frames[t].index[-1].strftime('%Y-%m-%d') for t in found]
+
+        def verbose() -> str:
+            lines = [
+                f"기간: {period}",
+                "티커 | 현재가 | 시가 | 고가 | 저가 | 거래량 | 기간 변동률 | 조회일",
+            ]
+            for i, t in enumerate(found):
+                o, h, l, c, v = latest[i]
+                lines.append(
+                    f"{t} | {c:.2f} | {o:.2f} | {h:.2f} | {l:.2f} | {v:,.0f} | "
+                    f"{change[i]:+.2f}% | {dates[i]}"
+                )
+            if missing:
+                lines.append(f"데이터 없음: {', '.join(missing)}")
+            return "\n".join(lines)
+
+        record = {
+            "period": period,
+            "missing": missing,
+            "rows": [
+                {
+                    "ticker": t,
+                    "close": latest[i][3],
+                    "open": latest[i][0],
+                    "high": latest[i][1],
+                    "low": latest[i][2],
+                    "volume": latest[i][4],
+                    "change_pct": change[i],
+                    "date": dates[i],
+                }
+                for i, t in enumerate(found)
+            ],
+        }
+        return render_tool_output("get_stock_prices", record, verbose)
+    except Exception as e:
+        note_error(e)
+        return f"주가 일괄 조회 중 오류 발생: {str(e)}"
+
+
 @tool
 def calculate_moving_average(
     ticker: Annotated[str, "주식 티커 심볼"],
@@ -85,9 +205,12 @@ def calculate_moving_average(
     주식의 이동평균선을 계산합니다.
     기술적 분석에 사용되며, 추세를 파악하는 데 도움이 됩니다.
     """
+    from python.models.backtest import trend_signal
+    from python.models.price_store import get_price_store
+
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period)
+        # 마지막 window개 봉만 있으면 되므로 period 중 그만큼만 조회
+        hist = get_price_store().history(ticker, period=period, bars=window)
 
         if len(hist) < window:
             return f"데이터가 부족합니다. 최소 {window}일의 데이터가 필요합니다."
@@ -96,33 +219,143 @@ def calculate_moving_average(
         latest_price = hist['Close'].iloc[-1]
         latest_ma = ma.iloc[-1]
 
-        signal = "상승 추세" if latest_price > latest_ma else "하락 추세"
-
-        return f"""
+        # backtest_ma_signal이 검증하는 것과 같은 신호
+        uptrend = bool(trend_signal(latest_price, latest_ma))
+        signal = "상승 추세" if uptrend else "하락 추세"
+        gap_pct = (latest_price - latest_ma) / latest_ma * 100
+
+        record = {
+            "ticker": ticker,
+            "window": window,
+            "ma": latest_ma,
+            "close": latest_price,
+            "trend": "up" if uptrend else "down",
+            "gap_pct": gap_pct,
+        }
+        return render_tool_output("calculate_moving_average", record, lambda: f"""
 티커: {ticker}
 {window}일 이동평균: {latest_ma:.2f}
 현재가: {latest_price:.2f}
 신호: {signal}
-괴리율: {((latest_price - latest_ma) / latest_ma * 100):.2f}%
-"""
+괴리율: {gap_pct:.2f}%
+""")
     except Exception as e:
+        note_error(e)
         return f"이동평균 계산 중 오류: {str(e)}"
 
 
+COMPANY_INFO_FIELDS = (
+    'longName', 'sector', 'industry', 'marketCap', 'trailingPE', 'priceToBook',
+    'dividendYield', 'fiftyTwoWeekHigh', 'fiftyTwoWeekLow', 'website'
+)
+
+
+def _fmt(value: float, suffix: str = "") -> str:
+    """지표 값 포맷 (계산 불가 시 N/A)"""
+    return "N/A" if math.isnan(value) else f"{value:.2f}{suffix}"
+
+
+@tool
+def analyze_technicals(
+    ticker: Annotated[str, "주식 티커 심볼"],
+    windows: Annotated[Optional[List[int]], "이동평균 기간 목록 (일, 생략하면 5, 20, 60)"] = None
+) -> str:
+    """
+    주식의 기술적 지표를 한 번에 분석합니다.
+    여러 기간의 SMA/EMA, RSI, MACD, 볼린저 밴드, ATR을 함께 계산합니다.
+    "과매수인지", "5/20/60일 이동평균 위에 있는지" 같은 질문은 이 도구 한 번으로 답하세요.
+    """
+    import numpy as np
+    from python.models.indicators import DEFAULT_SMA_WINDOWS, compute_indicators, required_bars
+    from python.models.price_store import get_price_store
+
+    if windows is None:
+        windows = list(DEFAULT_SMA_WINDOWS)
+    try:
+        hist = get_price_store().history(ticker, period="max", bars=required_bars(windows))
+        snap = compute_indicators(
+            hist['High'].to_numpy(),
+            hist['Low'].to_numpy(),
+            hist['Close'].to_numpy(),
+            sma_windows=windows
+        )
+        if snap is None:
+            return f"티커 '{ticker}'에 대한 데이터를 찾을 수 없습니다."
+
+        ma_lines = []
+        for w, ma in snap.sma.items():
+            if np.isnan(ma):
+                ma_lines.append(f"  {w}일: N/A (데이터 부족)")
+            else:
+                position = "위" if snap.close > ma else "아래"
+                ma_lines.append(f"  {w}일: {ma:.2f} (현재가 {position}, 괴리율 {(snap.close - ma) / ma * 100:+.2f}%)")
+        ema_line = " / ".join(f"EMA{s} {_fmt(v)}" for s, v in snap.ema.items())
+        atr_pct = snap.atr / snap.close * 100 if snap.close else np.nan
+        date = hist.index[-1].strftime('%Y-%m-%d')
+
+        record = {
+            "ticker": ticker,
+            "date": date,
+            "close": snap.close,
+            "sma": {str(w): ma for w, ma in snap.sma.items()},
+            "ema": {str(s): v for s, v in snap.ema.items()},
+            "rsi": snap.rsi,
+            "rsi_label": snap.rsi_label(),
+            "macd": snap.macd,
+            "macd_signal": snap.macd_signal,
+            "macd_hist": snap.macd_hist,
+            "bb_upper": snap.bb_upper,
+            "bb_middle": snap.bb_middle,
+            "bb_lower": snap.bb_lower,
+            "bb_pct_b": snap.bb_percent_b,
+            "atr": snap.atr,
+            "atr_pct": atr_pct,
+        }
+        return render_tool_output("analyze_technicals", record, lambda: f"""
+티커: {ticker}
+조회일: {date}
+현재가: {snap.close:.2f}
+단순 이동평균:
+{chr(10).join(ma_lines)}
+지수 이동평균: {ema_line}
+RSI(14): {_fmt(snap.rsi)} ({snap.rsi_label()})
+MACD(12,26,9): {_fmt(snap.macd)} / 시그널 {_fmt(snap.macd_signal)} / 히스토그램 {_fmt(snap.macd_hist)}
+볼린저 밴드(20,2): 상단 {_fmt(snap.bb_upper)} / 중단 {_fmt(snap.bb_middle)} / 하단 {_fmt(snap.bb_lower)} (%B {_fmt(snap.bb_percent_b)})
+ATR(14): {_fmt(snap.atr)} ({_fmt(atr_pct, '%')})
+""")
+    except Exception as e:
+        note_error(e)
+        return f"기술적 지표 계산 중 오류: {str(e)}"
+
+
 @tool
 def get_company_info(ticker: Annotated[str, "주식 티커 심볼"]) -> str:
     """
     기업의 기본 정보를 조회합니다.
     시가총액, 업종, PER, PBR 등의 재무 지표를 확인할 수 있습니다.
     """
+    from python.models.fundamentals import get_fundamentals_cache
+
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = get_fundamentals_cache().get_fields(ticker, COMPANY_INFO_FIELDS)
 
         market_cap = info.get('marketCap', 0)
         market_cap_str = f"{market_cap:,}" if market_cap else "N/A"
 
-        return f"""
+        record = {
+            "ticker": ticker,
+            "name": info.get('longName'),
+            "sector": info.get('sector'),
+            "industry": info.get('industry'),
+            "market_cap": market_cap or None,
+            "per": info.get('trailingPE'),
+            "pbr": info.get('priceToBook'),
+            "dividend_yield_pct": info.get('dividendYield', 0) * 100,
+            "high_52w": info.get('fiftyTwoWeekHigh'),
+            "low_52w": info.get('fiftyTwoWeekLow'),
+            "website": info.get('website'),
+        }
+        return render_tool_output("get_company_info", record, lambda: f"""
 회사명: {info.get('longName', 'N/A')}
 업종: {info.get('sector', 'N/A')}
 산업: {info.get('industry', 'N/A')}
@@ -133,21 +366,289 @@ PBR: {info.get('priceToBook', 'N/A')}
 52주 최고가: {info.get('fiftyTwoWeekHigh', 'N/A')}
 52주 최저가: {info.get('fiftyTwoWeekLow', 'N/A')}
 웹사이트: {info.get('website', 'N/A')}
-"""
+""")
     except Exception as e:
+        note_error(e)
         return f"기업 정보 조회 중 오류: {str(e)}"
 
 
+@tool
+def screen_universe(
+    universe: Annotated[str, "종목군 이름 (KOSPI_LARGE: 코스피 대형주, US_LARGE: 미국 대형주)"] = "KOSPI_LARGE",
+    tickers: Annotated[Optional[List[str]], "직접 지정할 티커 목록 (지정하면 universe 대신 사용)"] = None,
+    window: Annotated[int, "이동평균 기간 (일)"] = 20,
+    condition: Annotated[str, "above(이동평균 위), below(아래), golden_cross(상향 돌파), dead_cross(하향 돌파), all(조건 없음)"] = "above",
+    min_volume_ratio: Annotated[Optional[float], "최근 5일 평균 거래량 / 이동평균 기간 평균 거래량의 최소값 (예: 1.2 = 20% 증가)"] = None,
+    min_gap_pct: Annotated[Optional[float], "최소 괴리율 (%)"] = None,
+    max_gap_pct: Annotated[Optional[float], "최대 괴리율 (%)"] = None,
+    sort_by: Annotated[str, "정렬 기준 (gap: 괴리율, volume: 거래량 증가율)"] = "gap",
+    limit: Annotated[int, "최대 결과 수"] = 20
+) -> str:
+    """
+    종목군 전체를 이동평균·괴리율·거래량 조건으로 한 번에 스크리닝합니다.
+    "코스피 대형주 중 20일 이동평균 위에 있고 거래량이 늘어난 종목" 같은 질문은
+    종목마다 calculate_moving_average를 호출하지 말고 이 도구를 한 번 사용하세요.
+    조건에 맞는 종목만 순위대로 반환합니다.
+    """
+    from python.models.screener import get_universe, load_panel, screen, screened_count
+
+    try:
+        names = get_universe(universe) if not tickers else {t: "" for t in tickers}
+        panel = load_panel(list(names), bars=window + 1)
+        matches = screen(
+            panel,
+            window=window,
+            condition=condition,
+            min_volume_ratio=min_volume_ratio,
+            min_gap_pct=min_gap_pct,
+            max_gap_pct=max_gap_pct,
+            sort_by=sort_by,
+            limit=limit
+        )
+        source = "직접 지정" if tickers else universe
+        screened = screened_count(panel, window)
+
+        def verbose() -> str:
+            lines = [
+                f"종목군: {source} ({screened}/{len(names)}종목 평가)",
+                f"조건: {window}일 이동평균 {condition}"
+                + (f", 거래량 증가율 ≥ {min_volume_ratio:.2f}" if min_volume_ratio is not None else "")
+                + (f", 괴리율 ≥ {min_gap_pct:.2f}%" if min_gap_pct is not None else "")
+                + (f", 괴리율 ≤ {max_gap_pct:.2f}%" if max_gap_pct is not None else ""),
+                f"결과: {len(matches)}종목",
+            ]
+            if matches:
+                lines.append(f"순위 | 티커 | 종목명 | 현재가 | {window}일 이동평균 | 괴리율 | 거래량 증가율 | 돌파 | 조회일")
+            for rank, m in enumerate(matches, 1):
+                cross = {"golden": "상향", "dead": "하향"}.get(m.cross, "-")
+                lines.append(
+                    f"{rank} | {m.ticker} | {names.get(m.ticker) or '-'} | {m.close:.2f} | {m.ma:.2f} | "
+                    f"{m.gap_pct:+.2f}% | {m.volume_ratio:.2f} | {cross} | {m.date}"
+                )
+            if panel.missing:
+                lines.append(f"데이터 없음: {', '.join(panel.missing)}")
+            return "\n".join(lines)
+
+        record = {
+            "universe": source,
+            "window": window,
+            "condition": condition,
+            "screened": screened,
+            "matched": len(matches),
+            "missing": panel.missing,
+            "rows": [
+                {
+                    "ticker": m.ticker,
+                    "name": names.get(m.ticker) or None,
+                    "close": m.close,
+                    "ma": m.ma,
+                    "gap_pct": m.gap_pct,
+                    "volume_ratio": m.volume_ratio,
+                    "cross": m.cross or None,
+                    "date": m.date,
+                }
+                for m in matches
+            ],
+        }
+        return render_tool_output("screen_universe", record, verbose)
+    except Exception as e:
+        note_error(e)
+        return f"종목 스크리닝 중 오류: {str(e)}"
+
+
+@tool
+def backtest_ma_signal(
+    tickers: Annotated[List[str], "주식 티커 심볼 목록 (예: ['005930.KS', '000660.KS'])"],
+    windows: Annotated[Optional[List[int]], "이동평균 기간 목록 (일, 생략하면 5, 20, 60)"] = None,
+    holds: Annotated[Optional[List[int]], "보유 기간 목록 (일, 이 주기마다 신호를 다시 판단, 생략하면 1, 5, 20)"] = None,
+    period: Annotated[str, "백테스트 기간 (1y, 2y, 5y, max)"] = "2y",
+    cost_bps: Annotated[float, "편도 거래 비용 (bp, 10 = 0.1%)"] = 10.0
+) -> str:
+    """
+    이동평균 신호(현재가 > 이동평균이면 보유, 아니면 현금)를 과거 데이터로 백테스트합니다.
+    calculate_moving_average의 "상승 추세/하락 추세" 신호가 실제로 효과가 있었는지 검증할 때 사용하세요.
+    종목 × 이동평균 기간 × 보유 기간 조합별 수익률, 적중률, 최대 낙폭을 매수 후 보유와 비교해 반환합니다.
+    """
+    from python.models.backtest import DEFAULT_HOLDS, DEFAULT_WINDOWS, backtest
+
+    if windows is None:
+        windows = list(DEFAULT_WINDOWS)
+    if holds is None:
+        holds = list(DEFAULT_HOLDS)
+    try:
+        result = backtest(tickers, windows=windows, holds=holds, period=period, cost_bps=cost_bps)
+        summary = result.summary()
+        best = result.best()
+        buy_hold = float(result.buy_hold.mean() * 100)
+
+        def verbose() -> str:
+            lines = [
+                "백테스트: 현재가 > 이동평균이면 보유, 아니면 현금 (보유 기간마다 재판단)",
+                f"종목: {', '.join(result.tickers)} | 기간: {period} (평가 {result.bars}봉, ~{result.end_date}) "
+                f"| 거래 비용: 편도 {cost_bps:g}bp",
+                "이동평균 | 보유 기간 | 평균 수익률 | 연환산 | 초과수익(vs 보유) | 적중률 | 최대 낙폭 | 진입 횟수 | 보유 비중",
+            ]
+            for row in summary:
+                lines.append(
+                    f"{row.window}일 | {row.hold}일 | {row.total_return:+.2f}% | {row.ann_return:+.2f}% | "
+                    f"{row.excess_return:+.2f}%p | {_fmt(row.hit_rate, '%')} | {row.max_drawdown:.2f}% | "
+                    f"{row.trades:.1f} | {row.exposure:.1f}%"
+                )
+            lines.append(f"매수 후 보유 평균 수익률: {buy_hold:+.2f}%")
+            if len(best) > 1:
+                lines.append("종목별 최고 조합:")
+                lines.extend(
+                    f"  {b['ticker']}: {b['window']}일 이동평균 / {b['hold']}일 보유 {b['total_return_pct']:+.2f}% "
+                    f"(매수 후 보유 {b['buy_hold_pct']:+.2f}%)"
+                    for b in best
+                )
+            if result.missing:
+                lines.append(f"데이터 없음: {', '.join(result.missing)}")
+            return "\n".join(lines)
+
+        record = {
+            "period": period,
+            "bars": result.bars,
+            "end": result.end_date,
+            "cost_bps": cost_bps,
+            "buy_hold_pct": buy_hold,
+            "missing": result.missing,
+            "rows": [
+                {
+                    "window": row.window,
+                    "hold": row.hold,
+                    "return_pct": row.total_return,
+                    "ann_pct": row.ann_return,
+                    "excess_pct": row.excess_return,
+                    "hit_pct": row.hit_rate,
+                    "mdd_pct": row.max_drawdown,
+                    "trades": row.trades,
+                    "exposure_pct": row.exposure,
+                }
+                for row in summary
+            ],
+            "best": best if len(best) > 1 else [],
+        }
+        return render_tool_output("backtest_ma_signal", record, verbose)
+    except Exception as e:
+        note_error(e)
+        return f"백테스트 중 오류: {str(e)}"
+
+
+# ============================================
+# 비동기 구현
+# ============================================
+# 각 도구의 coroutine으로 연결되어 ainvoke / 비동기 ToolNode에서 사용됩니다.
+# 웹 검색은 네이티브 비동기 HTTP를, yfinance 기반 도구는 블로킹 호출을
+# 공용 스레드 풀(executor.py)로 오프로드합니다.
+# 마감 시간을 넘긴 호출은 기다리지 않고 안내 문자열을 반환합니다. (스레드의 작업은 업스트림 마감까지 계속)
+
+def _with_deadline(tool_name: str):
+    def decorate(coroutine):
+        @functools.wraps(coroutine)
+        async def wrapper(*args: Any, **kwargs: Any) -> str:
+            seconds = tool_deadline(tool_name)
+            try:
+                return await asyncio.wait_for(coroutine(*args, **kwargs), seconds)
+            except TimeoutError as e:
+                note_error(e)
+                return (
+                    f"도구 응답 시간 초과: {tool_name}이(가) {seconds:g}초 안에 응답하지 않았습니다. "
+                    "잠시 후 다시 시도하거나 다른 도구를 사용하세요."
+                )
+        return wrapper
+    return decorate
+
+
+@_with_deadline("search_web")
+async def _asearch_web(query: str) -> str:
+    from python.models.search import get_search_client
+
+    results = await get_search_client().asearch(query)
+    return _format_search_results(results)
+
+
+@_with_deadline("get_stock_price")
+async def _aget_stock_price(ticker: str, period: str = "1mo") -> str:
+    return await run_blocking(get_stock_price.func, ticker, period)
+
+
+@_with_deadline("get_stock_prices")
+async def _aget_stock_prices(tickers: List[str], period: str = "1mo") -> str:
+    return await run_blocking(get_stock_prices.func, tickers, period)
+
+
+@_with_deadline("calculate_moving_average")
+async def _acalculate_moving_average(ticker: str, window: int = 20, period: str = "3mo") -> str:
+    return await run_blocking(calculate_moving_average.func, ticker, window, period)
+
+
+@_with_deadline("analyze_technicals")
+async def _aanalyze_technicals(ticker: str, windows: Optional[List[int]] = None) -> str:
+    return await run_blocking(analyze_technicals.func, ticker, windows)
+
+
+@_with_deadline("get_company_info")
+async def _aget_company_info(ticker: str) -> str:
+    return await run_blocking(get_company_info.func, ticker)
+
+
+@_with_deadline("screen_universe")
+async def _ascreen_universe(
+    universe: str = "KOSPI_LARGE",
+    tickers: Optional[List[str]] = None,
+    window: int = 20,
+    condition: str = "above",
+    min_volume_ratio: Optional[float] = None,
+    min_gap_pct: Optional[float] = None,
+    max_gap_pct: Optional[float] = None,
+    sort_by: str = "gap",
+    limit: int = 20
+) -> str:
+    return await run_blocking(
+        screen_universe.func, universe, tickers, window, condition,
+        min_volume_ratio, min_gap_pct, max_gap_pct, sort_by, limit
+    )
+
+
+@_with_deadline("backtest_ma_signal")
+async def _abacktest_ma_signal(
+    tickers: List[str],
+    windows: Optional[List[int]] = None,
+    holds: Optional[List[int]] = None,
+    period: str = "2y",
+    cost_bps: float = 10.0
+) -> str:
+    return await run_blocking(backtest_ma_signal.func, tickers, windows, holds, period, cost_bps)
+
+
+search_web.coroutine = _asearch_web
+get_stock_price.coroutine = _aget_stock_price
+get_stock_prices.coroutine = _aget_stock_prices
+calculate_moving_average.coroutine = _acalculate_moving_average
+analyze_technicals.coroutine = _aanalyze_technicals
+get_company_info.coroutine = _aget_company_info
+screen_universe.coroutine = _ascreen_universe
+backtest_ma_signal.coroutine = _abacktest_ma_signal
+
+
 # ============================================
 # 도구 모음
 # ============================================
+# 구현 모듈은 각 도구의 첫 호출 시 로드됩니다.
+
+TOOL_REGISTRY = ToolRegistry()
+TOOL_REGISTRY.register(search_web, impl_modules=("python.models.search",))
+TOOL_REGISTRY.register(get_stock_price, impl_modules=("python.models.price_store", "python.models.fundamentals"))
+TOOL_REGISTRY.register(get_stock_prices, impl_modules=("numpy", "python.models.price_store"))
+TOOL_REGISTRY.register(calculate_moving_average, impl_modules=("python.models.backtest", "python.models.price_store"))
+TOOL_REGISTRY.register(analyze_technicals, impl_modules=("numpy", "python.models.indicators", "python.models.price_store"))
+TOOL_REGISTRY.register(get_company_info, impl_modules=("python.models.fundamentals",))
+TOOL_REGISTRY.register(screen_universe, impl_modules=("numpy", "python.models.screener", "python.models.price_store"))
+TOOL_REGISTRY.register(backtest_ma_signal, impl_modules=("numpy", "python.models.backtest", "python.models.price_store"))
 
-AVAILABLE_TOOLS = [
-    search_web,
-    get_stock_price,
-    calculate_moving_average,
-    get_company_info
-]
+# LLM에 바인딩할 도구 목록 (등록 순서)
+AVAILABLE_TOOLS = TOOL_REGISTRY.tools()
 
 
 # ============================================
@@ -156,47 +657,150 @@ AVAILABLE_TOOLS = [
 
 def is_valid_tool_name(tool_name: str) -> bool:
     """도구 이름이 유효한지 확인합니다."""
-    return any(t.name == tool_name for t in AVAILABLE_TOOLS)
+    return tool_name in TOOL_REGISTRY
 
 
 def find_tool(tool_name: str) -> Optional[Any]:
     """도구 이름으로 도구를 찾습니다."""
-    for tool in AVAILABLE_TOOLS:
-        if tool.name == tool_name:
-            return tool
-    return None
+    return TOOL_REGISTRY.get(tool_name)
 
 
 # ============================================
 # 도구 실행 추적
 # ============================================
 
-@dataclass
+# 기본 보존 정책
+DEFAULT_MAX_EXECUTIONS = 256        # 메모리에 유지할 최근 실행 기록 수
+DEFAULT_SPILL_THRESHOLD = 4096      # 이 크기(바이트)를 넘는 결과는 스필 파일에 저장
+
+
+# 도구가 예외를 잡아 반환하는 오류 안내 문자열의 접두어
+ERROR_RESULT_PREFIXES = (
+    "주가 조회 중 오류",
+    "주가 일괄 조회 중 오류",
+    "이동평균 계산 중 오류",
+    "기술적 지표 계산 중 오류",
+    "기업 정보 조회 중 오류",
+    "종목 스크리닝 중 오류",
+    "백테스트 중 오류",
+    "도구 응답 시간 초과",
+)
+
+
+def is_error_result(result: Optional[str]) -> bool:
+    """도구 결과가 오류 안내 문자열인지 확인합니다."""
+    return result is not None and result.lstrip().startswith(ERROR_RESULT_PREFIXES)
+
+
+def call_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """(도구 이름, 정규화된 인자) 색인 키"""
+    canonical = json.dumps(arguments, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return f"{tool_name}:{canonical}"
+
+
+@dataclass(slots=True)
 class ToolExecution:
-    """도구 실행 기록"""
+    """
+    도구 실행 기록 (__slots__ 기반)
+
+    결과가 스필 파일로 옮겨지면 result는 None이 되고 spill에 참조가 남습니다.
+    결과 조회는 ToolHistory.result_of()를 사용하세요.
+    """
     tool_name: str
     arguments: Dict[str, Any]
-    result: str
+    result: Optional[str]
     call_id: str
+    spill: Optional[SpillRef] = None
+    cache_hit: bool = False                               # 메모이제이션으로 응답했는지 여부
+    created_at: float = field(default_factory=time.time)  # 결과 데이터가 만들어진 시각
+    metrics: Optional[CallMetrics] = None                 # 지연 시간·결과 크기·오류 측정값 (재사용 시 None)
 
 
 class ToolHistory:
-    """도구 실행 히스토리 관리"""
+    """
+    도구 실행 히스토리 관리
 
-    def __init__(self):
-        self.executions: List[ToolExecution] = []
-        self.total_calls: int = 0
+    - 최근 max_executions개만 메모리에 유지하는 링 버퍼 (None이면 무제한)
+    - spill_threshold 바이트를 넘는 결과는 추가 전용 파일로 옮기고 필요할 때 읽음
+    - total_calls는 밀려난 기록까지 포함한 전체 호출 수
+    - (도구 이름, 인자) 해시 색인으로 같은 호출의 최근 기록을 O(1) 조회
+    """
 
-    def add_execution(self, execution: ToolExecution) -> None:
-        """히스토리에 실행 추가"""
-        self.executions.append(execution)
-        self.total_calls += 1
+    def __init__(
+        self,
+        max_executions: Optional[int] = DEFAULT_MAX_EXECUTIONS,
+        spill_threshold: Optional[int] = DEFAULT_SPILL_THRESHOLD,
+        spill_path: Optional[Path] = None
+    ):
+        if max_executions is not None and max_executions < 1:
+            raise ValueError("max_executions는 1 이상이어야 합니다. (무제한은 None)")
+        self.executions: Deque[ToolExecution] = deque(maxlen=max_executions)
+        self.total_calls: int = 0
+        self.evicted_calls: int = 0    # 링 버퍼에서 밀려난 기록 수
+        self.reserved_calls: int = 0   # 실행 중(예약된) 호출 수
+        self.spill_threshold = spill_threshold
+        self._spill = SpillFile(spill_path)
+        self._index: Dict[str, ToolExecution] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, limit: int) -> bool:
+        """완료 + 실행 중 호출 수가 limit 미만이면 한 건을 예약합니다."""
+        with self._lock:
+            if self.total_calls + self.reserved_calls >= limit:
+                return False
+            self.reserved_calls += 1
+            return True
+
+    def release(self) -> None:
+        """실행하지 못한 예약을 반환합니다."""
+        with self._lock:
+            self.reserved_calls -= 1
+
+    def add_execution(self, execution: ToolExecution, reserved: bool = False) -> None:
+        """히스토리에 실행 추가 (reserved=True면 예약 한 건을 소진)"""
+        result = execution.result
+        if (
+            self.spill_threshold is not None
+            and result is not None
+            and len(result) * 4 > self.spill_threshold           # UTF-8 최대 4바이트: 빠른 사전 판정
+            and len(result.encode("utf-8")) > self.spill_threshold
+        ):
+            execution.spill = self._spill.write(result)
+            execution.result = None
+
+        with self._lock:
+            if len(self.executions) == self.executions.maxlen:
+                evicted = self.executions[0]
+                evicted_key = call_key(evicted.tool_name, evicted.arguments)
+                if self._index.get(evicted_key) is evicted:
+                    del self._index[evicted_key]
+                self.evicted_calls += 1
+            self.executions.append(execution)
+            self._index[call_key(execution.tool_name, execution.arguments)] = execution
+            self.total_calls += 1
+            if reserved:
+                self.reserved_calls -= 1
+
+    def lookup(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[ToolExecution]:
+        """같은 (도구 이름, 인자)로 실행한 가장 최근 기록을 찾습니다."""
+        with self._lock:
+            return self._index.get(call_key(tool_name, arguments))
+
+    def result_of(self, execution: ToolExecution) -> Optional[str]:
+        """실행 기록의 결과를 반환합니다. (스필된 결과는 파일에서 읽음)"""
+        if execution.spill is not None:
+            return self._spill.read(execution.spill)
+        return execution.result
 
     def last_result(self) -> Optional[str]:
         """마지막 실행 결과 조회"""
         if not self.executions:
             return None
-        return self.executions[-1].result
+        return self.result_of(self.executions[-1])
+
+    def close(self) -> None:
+        """스필 파일을 정리합니다."""
+        self._spill.close()
 
     def __len__(self) -> int:
         return self.total_calls
@@ -212,8 +816,8 @@ class ToolAgentState:
     Tool 기반 Agent 상태
 
     불변 속성 (런타임 검증):
-    - tool_history.total_calls <= max_tool_calls
-    - len(tool_history.executions) == tool_history.total_calls
+    - tool_history.total_calls + tool_history.reserved_calls <= max_tool_calls
+    - len(tool_history.executions) + tool_history.evicted_calls == tool_history.total_calls
     """
     query: str
     tool_history: ToolHistory
@@ -233,17 +837,90 @@ class ToolAgentState:
         )
 
     def can_call_more_tools(self) -> bool:
-        """도구를 더 호출할 수 있는지 확인"""
-        return self.tool_history.total_calls < self.max_tool_calls
+        """도구를 더 호출할 수 있는지 확인 (실행 중인 호출 포함)"""
+        history = self.tool_history
+        return history.total_calls + history.reserved_calls < self.max_tool_calls
+
+    def reserve_tool_call(self) -> bool:
+        """
+        호출 한 건을 원자적으로 예약합니다.
+
+        동시 실행 시 can_call_more_tools() 확인과 기록 사이에 다른 호출이
+        끼어들어 한도를 넘지 않도록, 실행 전에 반드시 예약합니다.
+        """
+        return self.tool_history.reserve(self.max_tool_calls)
 
     def verify_invariants(self) -> bool:
         """런타임 불변 속성 검증"""
-        # 도구 호출 횟수 제한
-        if self.tool_history.total_calls > self.max_tool_calls:
+        # 도구 호출 횟수 제한 (실행 중인 호출 포함)
+        history = self.tool_history
+        if history.total_calls + history.reserved_calls > self.max_tool_calls:
             return False
 
-        # 히스토리 일관성
-        if len(self.tool_history.executions) != self.tool_history.total_calls:
+        # 히스토리 일관성 (링 버퍼에서 밀려난 기록 포함)
+        if len(history.executions) + history.evicted_calls != history.total_calls:
             return False
 
         return True
+
+
+# ============================================
+# 동시 실행
+# ============================================
+
+async def aexecute_tool_call(
+    state: ToolAgentState,
+    tool_name: str,
+    arguments: Dict[str, Any],
+    call_id: str,
+    memoizer: Optional[Any] = None
+) -> str:
+    """
+    도구 하나를 비동기로 실행하고 히스토리에 기록합니다.
+
+    호출 한도를 넘으면 도구를 실행하지 않고 안내 문자열을 반환합니다.
+    memoizer(memo.ToolMemoizer)를 주면 신선한 이전 결과가 있을 때 재사용합니다.
+    """
+    selected = find_tool(tool_name)
+    if selected is None:
+        return f"알 수 없는 도구입니다: {tool_name}"
+    if not state.reserve_tool_call():
+        return f"도구 호출 한도({state.max_tool_calls}회)에 도달했습니다."
+
+    try:
+        if memoizer is not None:
+            execution = await memoizer.ainvoke(selected, arguments, call_id)
+        else:
+            with collect_calls() as calls:
+                result = await selected.ainvoke(arguments)
+            execution = ToolExecution(
+                tool_name=tool_name,
+                arguments=arguments,
+                result=result,
+                call_id=call_id,
+                metrics=calls[-1] if calls else None
+            )
+    except BaseException:
+        state.tool_history.release()
+        raise
+
+    # result_of()는 add_execution 이후 스필되더라도 원문을 돌려줌
+    state.tool_history.add_execution(execution, reserved=True)
+    return state.tool_history.result_of(execution)
+
+
+async def aexecute_tool_calls(
+    state: ToolAgentState,
+    tool_calls: List[Dict[str, Any]],
+    memoizer: Optional[Any] = None
+) -> List[str]:
+    """
+    LLM이 한 단계에서 요청한 여러 도구 호출을 동시에 실행합니다.
+
+    tool_calls는 AIMessage.tool_calls 형식({"name", "args", "id"})이며,
+    결과는 요청 순서대로 반환됩니다. 전체 소요 시간은 가장 느린 호출과 같습니다.
+    """
+    return await asyncio.gather(*(
+        aexecute_tool_call(state, tc["name"], tc["args"], tc["id"], memoizer=memoizer)
+        for tc in tool_calls
+    ))
@@ -0,0 +1,436 @@
+"""
+웹 검색 기반 QA 워크플로우 (notebook 2)
+
+generate → qa_eval → (web_search → generate)* 그래프를 import 가능한 모듈로 제공합니다.
+
+run_workflow()는 한 번의 실행에서 노드 업데이트를 콜백으로 전달하고
+같은 실행의 최종 상태를 반환합니다. (stream 후 invoke를 다시 호출하면
+LLM·평가·검색 비용을 두 번 지불하게 됩니다)
+
+generate는 누적된 context 전체 대신 ContextAssembler가 토큰 예산 안에서 고른
+청크만 보내고, 두 번째 검색부터는 기존 답변 + 아직 보내지 않은 새 자료로 답변을 보완합니다.
+
+qa_eval은 PreEvaluator로 먼저 로컬 평가하고, 애매한 답변만 LLM으로 평가합니다.
+generate·qa_eval의 LLM 응답은 LLMResponseCache(SQLite)에 저장되어, 같은 질문이
+신선도 규칙 안에서 반복되면 LLM을 호출하지 않습니다.
+"""
+
+import functools
+from typing import Any, Callable, Dict, List, Literal, Optional
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langgraph.graph import END, START, StateGraph
+from pydantic import BaseModel, Field
+from typing_extensions import NotRequired, TypedDict
+
+from python.models.checkpoint import thread_config
+from python.models.context import ContextAssembler, normalize_url
+from python.models.llm_cache import LLMResponseCache, cache_key, get_llm_cache, model_id
+from python.models.pre_eval import PreEvaluator
+
+
+# ============================================
+# 상태
+# ============================================
+
+NextAction = Literal["enough", "search", "max_reached"]
+Evaluator = Literal["local", "llm"]
+
+
+class AgentState(TypedDict):
+    query: str                    # 사용자 질문
+    context: List[Dict[str, Any]] # 웹 검색 결과 누적 리스트
+    answer: str                   # 생성된 답변
+    search_threshold: int         # 웹 검색 트리거 기준 점수 (미만이면 검색)
+    iteration_count: int          # 현재 반복 횟수
+    max_iterations: int           # 최대 반복 횟수
+    evaluation_score: int         # 마지막 평가 점수
+    evaluation_comment: str       # 평가 코멘트
+    error: str                    # 에러 메시지
+    next_action: NotRequired[NextAction]  # qa_eval이 결정한 다음 단계 (라우팅용)
+    sent_chunks: NotRequired[List[str]]   # generate에 이미 보낸 context 청크 ID
+    evaluated_by: NotRequired[Evaluator]  # 마지막 평가 주체 (로컬 사전 평가 / LLM)
+
+
+def initial_state(query: str, search_threshold: int = 15, max_iterations: int = 3) -> AgentState:
+    """질문 하나에 대한 초기 상태"""
+    return {
+        "query": query,
+        "context": [],
+        "answer": "",
+        "search_threshold": search_threshold,
+        "iteration_count": 0,
+        "max_iterations": max_iterations,
+        "evaluation_score": 0,
+        "evaluation_comment": "",
+        "error": "",
+    }
+
+
+class EvaledAnswer(BaseModel):
+    """답변 평가 결과"""
+    score: int = Field(..., ge=0, le=20, description="각 기준별 점수를 합한 합산 점수 (0-20)")
+    comment: str = Field(description="평가기준에 따른 상세 코멘트")
+    needs_more_info: bool = Field(description="더 많은 정보가 필요한지 여부")
+
+
+# ============================================
+# 프롬프트
+# ============================================
+
+CONTEXT_PROMPT = PromptTemplate.from_template("""
+당신은 주식 투자 전문가입니다. 주어진 웹 검색 자료(context)에 기반하여 질문(question)에 대한 답을 제공하세요.
+
+검색 자료:
+{context}
+
+질문: {query}
+
+답변 작성 지침:
+1. 검색 자료의 정보를 정확히 인용하세요
+2. 구체적인 수치와 날짜를 포함하세요
+3. 출처가 명확하지 않은 추측은 피하세요
+4. 간결하고 명확하게 작성하세요
+""")
+
+REFINE_PROMPT = PromptTemplate.from_template("""
+당신은 주식 투자 전문가입니다. 기존 답변을 새로 찾은 웹 검색 자료(context)로 보완하여 질문(question)에 대한 답을 제공하세요.
+
+기존 답변:
+{answer}
+
+새 검색 자료:
+{context}
+
+질문: {query}
+
+답변 작성 지침:
+1. 기존 답변 중 검색 자료로 뒷받침되는 내용과 출처 번호는 유지하세요
+2. 새 검색 자료의 정보를 정확히 인용하고, 구체적인 수치와 날짜를 보완하세요
+3. 출처가 명확하지 않은 추측은 피하세요
+4. 간결하고 명확하게 작성하세요
+""")
+
+SIMPLE_PROMPT = PromptTemplate.from_template("""
+당신은 주식 투자 전문가입니다. 다음 질문에 답변하세요.
+
+질문: {query}
+
+답변 작성 지침:
+1. 일반적인 투자 원칙과 지식을 바탕으로 답변하세요
+2. 실시간 데이터가 필요한 경우 그 점을 명시하세요
+3. 간결하고 명확하게 작성하세요
+""")
+
+QA_EVAL_PROMPT = PromptTemplate(
+    input_variables=["question", "answer"],
+    template="""
+다음 질문과 답변을 평가해주세요:
+
+질문: {question}
+답변: {answer}
+
+평가 기준 (각 0-5점, 총 20점):
+1. 정확성 (0-5점): 답변이 질문에 정확히 답하고 있는가?
+2. 완전성 (0-5점): 답변이 충분히 상세하고 완전한가?
+3. 명확성 (0-5점): 답변이 이해하기 쉽고 명확한가?
+4. 관련성 (0-5점): 답변이 질문과 관련이 있는가?
+
+평가 시 고려사항:
+- 구체적인 수치, 날짜, 출처가 포함되어 있는가?
+- "인터넷 검색이 필요하다", "확인할 수 없다" 등의 답변은 낮은 점수
+- 실시간 주가, 최신 뉴스 등이 필요한 경우 needs_more_info를 true로 설정
+
+각 기준에 대해 점수를 매기고, 평가 기준별 점수를 모두 더한 합산 점수(0-20)와 개선사항을 제시하세요.
+"""
+)
+
+
+def decide_next_action(state: AgentState, evaluation: EvaledAnswer) -> NextAction:
+    """
+    평가 결과에 따른 다음 단계 (Idris: decideNextAction)
+
+    - 최대 반복 도달 → max_reached
+    - 점수 >= threshold이고 추가 정보 불필요 → enough
+    - 그 외 → search
+    """
+    if state.get("iteration_count", 0) >= state.get("max_iterations", 3):
+        return "max_reached"
+    if evaluation.score >= state.get("search_threshold", 15) and not evaluation.needs_more_info:
+        return "enough"
+    return "search"
+
+
+# ============================================
+# 그래프
+# ============================================
+
+SearchFunc = Callable[[str], List[Dict[str, Any]]]
+
+
+def build_graph(
+    llm: Optional[Any] = None,
+    eval_llm: Optional[Any] = None,
+    search: Optional[SearchFunc] = None,
+    checkpointer: Optional[Any] = None,
+    assembler: Optional[ContextAssembler] = None,
+    response_cache: Optional[LLMResponseCache] = None,
+    use_response_cache: bool = True,
+    pre_evaluator: Optional[PreEvaluator] = None,
+    use_pre_eval: bool = True
+):
+    """
+    웹 검색 QA 그래프를 컴파일합니다.
+
+    Args:
+        llm: 답변 생성 채팅 모델 (기본: gpt-4o-mini, temperature=0)
+        eval_llm: EvaledAnswer 구조화 출력 모델 (기본: llm.with_structured_output)
+        search: 쿼리 → 검색 결과 목록 함수 (기본: 공용 검색 클라이언트, 페이지 원문 포함)
+        checkpointer: LangGraph 체크포인터 (선택, 예: SqliteCheckpointSaver() → resume_workflow로 재개)
+        assembler: 검색 자료 → 프롬프트 컨텍스트 조립기 (기본: ContextAssembler(), 1500 토큰)
+        response_cache: LLM 응답 캐시 (기본: 공용 캐시 get_llm_cache())
+        use_response_cache: False면 응답 캐시를 사용하지 않음
+        pre_evaluator: LLM 평가 전 로컬 사전 평가기 (기본: PreEvaluator(), 적중률은 .stats)
+        use_pre_eval: False면 항상 LLM으로 평가
+    """
+    if llm is None:
+        from langchain_openai import ChatOpenAI
+        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    eval_model = f"{model_id(llm if eval_llm is None else eval_llm)}:EvaledAnswer"
+    if eval_llm is None:
+        eval_llm = llm.with_structured_output(EvaledAnswer)
+    if search is None:
+        from python.models.search import get_search_client
+        # 원문(raw_content)까지 받아야 조립기가 페이지 청크를 관련도 순으로 고를 수 있음
+        search = functools.partial(get_search_client().search, raw_content=True)
+    if assembler is None:
+        assembler = ContextAssembler()
+    cache = (response_cache or get_llm_cache()) if use_response_cache else None
+    if use_pre_eval and pre_evaluator is None:
+        pre_evaluator = PreEvaluator()
+    elif not use_pre_eval:
+        pre_evaluator = None
+    generate_model = model_id(llm)
+
+    context_chain = CONTEXT_PROMPT | llm | StrOutputParser()
+    refine_chain = REFINE_PROMPT | llm | StrOutputParser()
+    simple_chain = SIMPLE_PROMPT | llm | StrOutputParser()
+    eval_chain = QA_EVAL_PROMPT | eval_llm
+
+    def cached_invoke(
+        model: str,
+        prompt: PromptTemplate,
+        chain: Any,
+        inputs: Dict[str, Any],
+        query: str,
+        encode: Callable[[Any], Any] = lambda v: v,
+        decode: Callable[[Any], Any] = lambda v: v
+    ) -> Any:
+        """응답 캐시를 거쳐 chain을 실행합니다. (예외는 캐시하지 않음)"""
+        if cache is None:
+            return chain.invoke(inputs)
+        key = cache_key(model, prompt.template, inputs)
+        hit = cache.get(key)
+        if hit is not None:
+            return decode(hit)
+        result = chain.invoke(inputs)
+        cache.set(key, encode(result), cache.ttl_for(query), model=model)
+        return result
+
+    def generate(state: AgentState) -> Dict[str, Any]:
+        """
+        Context가 없으면 일반 지식으로, 처음이면 검색 자료 기반으로,
+        이후에는 기존 답변 + 새 자료로 답변을 생성합니다.
+        """
+        try:
+            iteration = state.get("iteration_count", 0) + 1
+            context = state.get("context", [])
+            if not context:
+                answer = cached_invoke(generate_model, SIMPLE_PROMPT, simple_chain, {"query": state["query"]}, state["query"])
+                return {"answer": answer, "iteration_count": iteration}
+
+            sent = state.get("sent_chunks", [])
+            assembled = assembler.assemble(state["query"], context, exclude=sent)
+            if not assembled:
+                # 보낼 새 자료가 없으면 같은 프롬프트를 다시 보내지 않고 기존 답변 유지
+                return {"answer": state.get("answer", ""), "iteration_count": iteration}
+            if sent:
+                answer = cached_invoke(generate_model, REFINE_PROMPT, refine_chain, {
+                    "answer": state.get("answer", ""),
+                    "context": assembled.text,
+                    "query": state["query"]
+                }, state["query"])
+            else:
+                answer = cached_invoke(
+                    generate_model, CONTEXT_PROMPT, context_chain,
+                    {"context": assembled.text, "query": state["query"]}, state["query"]
+                )
+            return {
+                "answer": answer,
+                "iteration_count": iteration,
+                "sent_chunks": sent + assembled.chunk_ids
+            }
+        except Exception as e:
+            return {
+                "error": f"Generate 함수 에러: {str(e)}",
+                "answer": "답변 생성 중 오류가 발생했습니다."
+            }
+
+    def qa_eval(state: AgentState) -> Dict[str, Any]:
+        """
+        답변을 평가하고 점수·코멘트·다음 단계를 상태에 기록합니다.
+
+        로컬 사전 평가로 결정되면 LLM을 호출하지 않습니다.
+        """
+        if state.get("error"):
+            return {"next_action": "max_reached"}
+        if pre_evaluator is not None:
+            local = pre_evaluator.evaluate(state["query"], state["answer"])
+            if local.decided:
+                evaluation = EvaledAnswer(
+                    score=local.score, comment=local.comment, needs_more_info=local.needs_more_info
+                )
+                return {
+                    "evaluation_score": evaluation.score,
+                    "evaluation_comment": evaluation.comment,
+                    "next_action": decide_next_action(state, evaluation),
+                    "evaluated_by": "local",
+                }
+        try:
+            evaluation = cached_invoke(
+                eval_model, QA_EVAL_PROMPT, eval_chain,
+                {"answer": state["answer"], "question": state["query"]}, state["query"],
+                encode=lambda e: e.model_dump(),
+                decode=EvaledAnswer.model_validate
+            )
+        except Exception as e:
+            return {"error": f"QA Eval 함수 에러: {str(e)}", "next_action": "max_reached"}
+        return {
+            "evaluation_score": evaluation.score,
+            "evaluation_comment": evaluation.comment,
+            "next_action": decide_next_action(state, evaluation),
+            "evaluated_by": "llm",
+        }
+
+    def web_search(state: AgentState) -> Dict[str, Any]:
+        """검색 결과 중 새 URL(정규화 기준)만 기존 context에 누적합니다."""
+        try:
+            results = search(state["query"])
+            if not results:
+                return {"error": "검색 결과가 없습니다."}
+
+            existing = state.get("context", [])
+            seen = {normalize_url(item.get("url")) for item in existing if item.get("url")}
+            new_results = []
+            for r in results:
+                key = normalize_url(r.get("url"))
+                if key and key in seen:
+                    continue
+                seen.add(key)
+                new_results.append(r)
+            return {"context": existing + new_results}
+        except Exception as e:
+            return {"error": f"Web Search 함수 에러: {str(e)}"}
+
+    def route(state: AgentState) -> NextAction:
+        return state.get("next_action", "max_reached")
+
+    builder = StateGraph(AgentState)
+    builder.add_node("generate", generate)
+    builder.add_node("qa_eval", qa_eval)
+    builder.add_node("web_search", web_search)
+
+    builder.add_edge(START, "generate")
+    builder.add_edge("generate", "qa_eval")
+    builder.add_conditional_edges(
+        "qa_eval",
+        route,
+        {
+            "enough": END,           # 충분한 답변 → 종료
+            "search": "web_search",  # 검색 필요 → 웹 검색
+            "max_reached": END       # 최대 반복 도달 → 종료
+        }
+    )
+    builder.add_edge("web_search", "generate")
+
+    return builder.compile(checkpointer=checkpointer)
+
+
+# ============================================
+# 실행
+# ============================================
+
+UpdateCallback = Callable[[str, Dict[str, Any]], None]
+
+
+def run_workflow(
+    graph: Any,
+    state: Optional[Dict[str, Any]],
+    on_update: Optional[UpdateCallback] = None,
+    config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    그래프를 한 번 실행하며 노드 업데이트를 on_update(노드 이름, 업데이트)로 전달하고
+    최종 상태를 반환합니다.
+
+    stream_mode=["updates", "values"]로 같은 실행에서 진행 상황과 최종 상태를 함께 받습니다.
+    state가 None이면 config의 thread_id 체크포인트부터 이어서 실행합니다.
+    """
+    final: Dict[str, Any] = dict(state or {})
+    for mode, chunk in graph.stream(state, config, stream_mode=["updates", "values"]):
+        if mode == "values":
+            final = chunk
+        elif on_update is not None:
+            for node, update in chunk.items():
+                on_update(node, update or {})
+    return final
+
+
+async def arun_workflow(
+    graph: Any,
+    state: Optional[Dict[str, Any]],
+    on_update: Optional[UpdateCallback] = None,
+    config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """run_workflow의 비동기 버전"""
+    final: Dict[str, Any] = dict(state or {})
+    async for mode, chunk in graph.astream(state, config, stream_mode=["updates", "values"]):
+        if mode == "values":
+            final = chunk
+        elif on_update is not None:
+            for node, update in chunk.items():
+                on_update(node, update or {})
+    return final
+
+
+def resume_workflow(
+    graph: Any,
+    thread_id: str,
+    on_update: Optional[UpdateCallback] = None
+) -> Dict[str, Any]:
+    """
+    체크포인터로 컴파일한 그래프를 thread_id의 마지막 체크포인트부터 이어서 실행합니다.
+
+    이미 끝난 스레드는 다시 실행하지 않고 최종 상태를 반환합니다.
+    """
+    config = thread_config(thread_id)
+    snapshot = graph.get_state(config)
+    if not snapshot.next:
+        return snapshot.values
+    return run_workflow(graph, None, on_update, config)
+
+
+def print_update(node: str, update: Dict[str, Any]) -> None:
+    """노드 업데이트를 진행 상황 로그로 출력합니다. (on_update 기본 예시)"""
+    if node == "generate":
+        print(f"\n[Generate] Iteration {update.get('iteration_count', '?')}")
+    elif node == "qa_eval":
+        if "evaluation_score" in update:
+            by = "로컬" if update.get("evaluated_by") == "local" else "LLM"
+            print(f"[QA Eval] 평가 점수: {update['evaluation_score']}/20 ({by}) → {update.get('next_action')}")
+            print(f"코멘트: {update.get('evaluation_comment', '')}")
+    elif node == "web_search" and "context" in update:
+        print(f"[Web Search] 총 Context: {len(update['context'])}개")
+    if update.get("error"):
+        print(f"❌ {update['error']}")
@@ -0,0 +1,18 @@
+"""
+테스트 공통 설정
+
+캐시·체크포인트 DB가 사용자 캐시 폴더에 쌓이지 않도록 임시 폴더를 쓰고,
+저장소 루트를 import 경로에 넣어 `python.models`를 불러올 수 있게 합니다.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# python.models 모듈은 import 시점에 INVEST_CACHE_DIR을 읽으므로 가장 먼저 설정
+os.environ.setdefault("INVEST_CACHE_DIR", tempfile.mkdtemp(prefix="invest-tests-"))
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,97 @@
+"""이동평균 신호 백테스트: 손으로 계산한 작은 패널로 격자 결과 검증"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from python.models.backtest import backtest_panel, moving_averages
+from python.models.screener import PricePanel
+
+nan = np.nan
+
+# window=2 → 평가 구간은 t=1..3 (다음 봉 수익률 3개)
+#   t=1: 11 > 10.5 (보유), t=2: 10 < 10.5 (현금), t=3: 12 > 11 (보유)
+#   일간 수익률: 10/11 - 1, 12/10 - 1, 13/12 - 1
+CLOSE = [10.0, 11.0, 10.0, 12.0, 13.0]
+DAILY = np.array([10 / 11 - 1, 12 / 10 - 1, 13 / 12 - 1])
+BUY_HOLD = 13 / 11 - 1
+
+
+def make_panel(*rows):
+    return PricePanel(
+        tickers=[f"T{i}" for i in range(len(rows))],
+        close=np.array(rows, dtype=float),
+        volume=np.ones((len(rows), len(rows[0]))),
+        last_dates=["2024-01-05"] * len(rows)
+    )
+
+
+def test_moving_averages_match_rolling_mean():
+    close = np.array([[1.0, 2.0, nan, 4.0, 5.0, 6.0], [3.0, 1.0, 4.0, 1.0, 5.0, 9.0]])
+    result = moving_averages(close, [2, 3, 7])
+    for i, w in enumerate([2, 3]):
+        expected = pd.DataFrame(close.T).rolling(w).mean().to_numpy().T
+        np.testing.assert_allclose(result[i], expected)
+    assert np.isnan(result[2]).all()
+
+
+def test_daily_signal_hand_computed():
+    result = backtest_panel(make_panel(CLOSE), windows=[2], holds=[1], cost_bps=0)
+
+    assert result.bars == 3
+    assert result.total_return[0, 0, 0] == pytest.approx((1 + DAILY[0]) * (1 + DAILY[2]) - 1)
+    assert result.buy_hold[0] == pytest.approx(BUY_HOLD)
+    # 보유 → 현금 → 보유: 진입 2회, 보유 비중 2/3, 보유한 두 구간 중 한 번 수익
+    assert result.trades[0, 0, 0] == 2
+    assert result.exposure[0, 0, 0] == pytest.approx(2 / 3)
+    assert result.hit_rate[0, 0, 0] == pytest.approx(0.5)
+    assert result.max_drawdown[0, 0, 0] == pytest.approx(DAILY[0])
+
+
+def test_cost_charged_on_every_position_change():
+    cost = 25 / 10_000
+    result = backtest_panel(make_panel(CLOSE), windows=[2], holds=[1], cost_bps=25)
+    # 진입(t=1) · 청산(t=2) · 재진입(t=3) 모두 편도 비용
+    expected = (1 + DAILY[0] - cost) * (1 - cost) * (1 + DAILY[2] - cost) - 1
+    assert result.total_return[0, 0, 0] == pytest.approx(expected)
+
+
+def test_hold_period_keeps_signal_from_interval_start():
+    result = backtest_panel(make_panel(CLOSE), windows=[2], holds=[2], cost_bps=0)
+
+    # 구간 [t1, t2]는 t1의 보유 신호를 유지, [t3]는 t3 신호로 보유 → 계속 보유
+    assert result.total_return[0, 0, 0] == pytest.approx(BUY_HOLD)
+    assert result.trades[0, 0, 0] == 1
+    assert result.exposure[0, 0, 0] == 1.0
+    # 구간 수익률 12/11 - 1, 13/12 - 1 모두 양수
+    assert result.hit_rate[0, 0, 0] == 1.0
+    assert result.max_drawdown[0, 0, 0] == pytest.approx(DAILY[0])
+
+
+def test_single_hold_period_without_cost_equals_buy_and_hold():
+    close = 100 * np.cumprod(np.r_[1.0, np.full(29, 1.01)])
+    result = backtest_panel(make_panel(close), windows=[5], holds=[1000], cost_bps=0)
+    assert result.total_return[0, 0, 0] == pytest.approx(result.buy_hold[0])
+    assert result.buy_hold[0] == pytest.approx(close[-1] / close[4] - 1)
+    assert result.trades[0, 0, 0] == 1
+
+
+def test_short_history_is_right_aligned():
+    # 두 번째 종목은 t=2부터 이력 → t=2까지 이동평균이 없어 현금, t=3에 22 > 21로 보유
+    result = backtest_panel(make_panel(CLOSE, [nan, nan, 20.0, 22.0, 21.0]), windows=[2], holds=[1], cost_bps=0)
+    assert result.total_return[0, 0, 1] == pytest.approx(21 / 22 - 1)
+    assert result.exposure[0, 0, 1] == pytest.approx(1 / 3)
+    assert result.buy_hold[1] == pytest.approx(21 / 20 - 1)
+
+
+def test_grid_shapes_and_validation():
+    close = 100 * np.cumprod(np.r_[1.0, np.full(59, 1.001)])
+    result = backtest_panel(make_panel(close, close[::-1]), windows=[20, 5, 5], holds=[5, 1], cost_bps=0)
+    assert result.windows == [5, 20] and result.holds == [1, 5]
+    assert result.total_return.shape == (2, 2, 2)
+    assert len(result.summary()) == 4
+
+    with pytest.raises(ValueError):
+        backtest_panel(make_panel(CLOSE), windows=[1])
+    with pytest.raises(ValueError):
+        backtest_panel(make_panel(CLOSE), windows=[5])
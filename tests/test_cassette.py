@@ -0,0 +1,91 @@
+"""카세트: 녹화 → 파일 → 재생 왕복"""
+
+from typing import Any, List
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from python.models.batch import react_input
+from python.models.cassette import CassetteFile, CassettePlayer, CassetteRecorder
+
+QUERY = "애플 주가 알려줘"
+# 콘텐츠 블록 목록으로 된 최종 답변 (Anthropic·OpenAI Responses API 형식)
+ANSWER_BLOCKS = [{"type": "text", "text": "AAPL 현재가는 "}, {"type": "text", "text": "190달러입니다."}]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """정해 둔 응답을 순서대로 돌려주는 채팅 모델"""
+
+    responses: List[AIMessage]
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = self.responses[self.calls]
+        self.calls += 1
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def script() -> ScriptedChatModel:
+    return ScriptedChatModel(responses=[
+        AIMessage(content="", tool_calls=[{"name": "get_price", "args": {"ticker": "AAPL"}, "id": "call_1"}]),
+        AIMessage(content=ANSWER_BLOCKS),
+    ])
+
+
+@tool
+def get_price(ticker: str, period: str = "1d") -> str:
+    """종목 가격 조회"""
+    return f"{ticker} ({period}): 190"
+
+
+@tool("get_price")
+def offline_price(ticker: str, period: str = "1d") -> str:
+    """종목 가격 조회"""
+    raise AssertionError("재생 중에는 도구를 실행하지 않아야 합니다.")
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    path = tmp_path / "runs.jsonl.gz"
+    recorder = CassetteRecorder(path)
+    agent = create_react_agent(recorder.wrap_model(script()), recorder.wrap_tools([get_price]))
+    with recorder.recording(QUERY):
+        state = agent.invoke(react_input(QUERY))
+    assert state["messages"][-1].content == ANSWER_BLOCKS
+
+    (recorded,) = CassetteFile(path).load()
+    return recorded
+
+
+def test_recording_keeps_content_blocks(cassette):
+    assert cassette.query == QUERY
+    assert cassette.responses[-1]["content"] == ANSWER_BLOCKS
+    assert cassette.observations[0]["arguments"] == {"ticker": "AAPL", "period": "1d"}
+    assert cassette.observations[0]["result"] == "AAPL (1d): 190"
+    assert cassette.answer == str(ANSWER_BLOCKS)
+
+
+def test_replay_round_trip(cassette):
+    player = CassettePlayer(strict=True)
+    agent = create_react_agent(player.model(), player.wrap_tools([offline_price]))
+
+    with player.playing(cassette):
+        state = agent.invoke(react_input(QUERY))
+    assert state["messages"][-1].content == ANSWER_BLOCKS
+
+    result = player.replay(agent, cassette)
+    assert result.status == "pass", result.problems()
+    assert result.input_drift == 0
+    assert result.tool_misses == 0
+    assert result.unused_observations == 0
@@ -0,0 +1,136 @@
+"""SQLite 체크포인터: 실패 후 재개, 프로세스 재시작 후 재개, 재개 시에만 도구 결과 재생"""
+
+import operator
+from typing import Annotated, List, TypedDict
+
+import pytest
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+
+from python.models.checkpoint import SqliteCheckpointSaver, ToolReplay, resume, resume_config, thread_config
+
+
+class State(TypedDict):
+    steps: Annotated[List[str], operator.add]
+
+
+def build_graph(saver, calls, fail_once):
+    """fetch → answer 두 단계 그래프. answer는 fail_once가 남아 있으면 실패합니다."""
+
+    def fetch(state: State):
+        calls.append("fetch")
+        return {"steps": ["fetch"]}
+
+    def answer(state: State):
+        calls.append("answer")
+        if fail_once:
+            fail_once.pop()
+            raise TimeoutError("LLM 응답 시간 초과")
+        return {"steps": ["answer"]}
+
+    builder = StateGraph(State)
+    builder.add_node("fetch", fetch)
+    builder.add_node("answer", answer)
+    builder.add_edge(START, "fetch")
+    builder.add_edge("fetch", "answer")
+    builder.add_edge("answer", END)
+    return builder.compile(checkpointer=saver)
+
+
+@pytest.fixture
+def saver(tmp_path):
+    saver = SqliteCheckpointSaver(tmp_path / "checkpoints.sqlite3")
+    yield saver
+    saver.close()
+
+
+def test_resume_reruns_only_the_failed_step(saver):
+    calls = []
+    graph = build_graph(saver, calls, fail_once=[True])
+    with pytest.raises(TimeoutError):
+        graph.invoke({"steps": []}, thread_config("t1"))
+    assert graph.get_state(thread_config("t1")).next == ("answer",)
+
+    result = resume(graph, "t1")
+    assert result["steps"] == ["fetch", "answer"]
+    assert calls == ["fetch", "answer", "answer"]
+
+
+def test_resume_after_restart_reads_checkpoints_from_disk(saver, tmp_path):
+    with pytest.raises(TimeoutError):
+        build_graph(saver, [], fail_once=[True]).invoke({"steps": []}, thread_config("t2"))
+    saver.close()
+
+    # 새 프로세스처럼 같은 DB 파일로 체크포인터와 그래프를 다시 만듦
+    reopened = SqliteCheckpointSaver(tmp_path / "checkpoints.sqlite3")
+    calls = []
+    result = resume(build_graph(reopened, calls, fail_once=[]), "t2")
+    reopened.close()
+    assert result["steps"] == ["fetch", "answer"]
+    assert calls == ["answer"]
+
+
+def test_resume_of_finished_thread_does_not_rerun(saver):
+    calls = []
+    graph = build_graph(saver, calls, fail_once=[])
+    graph.invoke({"steps": []}, thread_config("t3"))
+
+    assert resume(graph, "t3")["steps"] == ["fetch", "answer"]
+    assert calls == ["fetch", "answer"]
+
+
+def make_lookup(runs):
+    @tool
+    def lookup(ticker: str) -> str:
+        """종목 조회"""
+        runs.append(ticker)
+        return f"{ticker}: {len(runs)}"
+    return lookup
+
+
+def test_tool_replay_only_when_resuming(saver):
+    runs = []
+    replay = ToolReplay(saver)
+    (wrapped,) = replay.wrap_tools([make_lookup(runs)])
+
+    first = wrapped.invoke({"ticker": "AAPL"}, thread_config("t4"))
+    # 같은 스레드의 다음 일반 실행은 도구를 다시 실행해 최신 값을 기록
+    second = wrapped.invoke({"ticker": "AAPL"}, thread_config("t4"))
+    assert second != first
+    assert replay.replayed == 0
+
+    # 재개한 실행은 마지막으로 기록된 결과를 재생
+    assert wrapped.invoke({"ticker": "AAPL"}, resume_config("t4")) == second
+    assert wrapped.invoke({"ticker": "AAPL"}, resume_config("t5")) != second
+    assert runs == ["AAPL"] * 3
+    assert replay.replayed == 1
+    assert [e.result for e in replay.restore_history("t4").executions] == [second]
+
+
+def test_resume_replays_tool_calls_made_before_failure(saver):
+    runs, calls, fail_once = [], [], [True]
+    (lookup,) = ToolReplay(saver).wrap_tools([make_lookup(runs)])
+
+    def fetch(state: State):
+        # 한 노드에서 도구 호출 뒤 실패 → 노드 전체가 다시 실행되지만 도구는 재생
+        calls.append(lookup.invoke({"ticker": "AAPL"}))
+        if fail_once:
+            fail_once.pop()
+            raise TimeoutError("LLM 응답 시간 초과")
+        return {"steps": ["fetch"]}
+
+    builder = StateGraph(State)
+    builder.add_node("fetch", fetch)
+    builder.add_edge(START, "fetch")
+    builder.add_edge("fetch", END)
+    graph = builder.compile(checkpointer=saver)
+
+    with pytest.raises(TimeoutError):
+        graph.invoke({"steps": []}, thread_config("t6"))
+    assert resume(graph, "t6")["steps"] == ["fetch"]
+    assert runs == ["AAPL"]
+    assert calls == ["AAPL: 1", "AAPL: 1"]
+
+    # 재개가 끝난 뒤 같은 스레드의 새 질문은 도구를 다시 실행
+    graph.invoke({"steps": []}, thread_config("t6"))
+    assert runs == ["AAPL", "AAPL"]
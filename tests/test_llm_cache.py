@@ -0,0 +1,24 @@
+"""LLM 응답 캐시 키"""
+
+from python.models.llm_cache import cache_key
+
+TEMPLATE = "질문: {question}\n자료: {context}"
+
+
+def key(question: str, context: str = "자료") -> str:
+    return cache_key("FakeChatModel:fake:0", TEMPLATE, {"question": question, "context": context})
+
+
+def test_case_width_and_spacing_are_ignored():
+    assert key("Why is Apple stock up?") == key("  why  is APPLE\tstock up?")
+    # NFKC: 전각 문자와 반각 문자를 같게
+    assert key("ＡＡＰＬ 주가") == key("AAPL 주가")
+
+
+def test_reordered_questions_get_different_keys():
+    assert key("Why is Apple stock better than Google?") != key("why is google stock better than apple")
+    assert key("AAPL 매수 vs 매도") != key("AAPL 매도 vs 매수")
+
+
+def test_context_changes_key():
+    assert key("삼성전자 주가", "자료 1") != key("삼성전자 주가", "자료 2")
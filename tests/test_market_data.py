@@ -0,0 +1,105 @@
+"""Yahoo 접근 계층: 요청 오류와 업스트림 장애의 회로 차단기 기록"""
+
+import pandas as pd
+import pytest
+import requests
+
+from python.models.market_data import MarketDataClient, RetryPolicy, is_upstream_failure
+from python.models.rate_limit import TokenBucket
+from python.models.resilience import CircuitBreaker, CircuitOpenError, HedgePolicy, UpstreamTimeout
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+class FakeUpstream:
+    """티커별로 정해 둔 예외를 내고, 나머지는 한 줄짜리 시세를 반환"""
+
+    def __init__(self, errors=None):
+        self.errors = errors or {}
+
+    def history(self, ticker, interval, start=None, end=None):
+        if ticker in self.errors:
+            raise self.errors[ticker]
+        return pd.DataFrame({"Close": [1.0]}, index=pd.to_datetime(["2024-01-02"]))
+
+    def download(self, tickers, interval, start=None):
+        raise NotImplementedError
+
+    def info(self, ticker):
+        if ticker in self.errors:
+            raise self.errors[ticker]
+        return {"longName": ticker}
+
+
+def make_client(errors):
+    breaker = CircuitBreaker("yahoo", failure_threshold=2, reset_seconds=60)
+    client = MarketDataClient(
+        FakeUpstream(errors),
+        limiter=TokenBucket(),
+        retry=RetryPolicy(max_retries=0),
+        sleep=lambda _: None,
+        hedge=HedgePolicy(deadline=5, hedge_after=5),
+        breaker=breaker
+    )
+    return client, breaker
+
+
+START = pd.Timestamp("2024-01-01")
+
+
+@pytest.mark.parametrize("error", [
+    ValueError("$BAD: possibly delisted; no price data found"),
+    KeyError("regularMarketPrice"),
+    http_error(404),
+])
+def test_client_errors_do_not_open_breaker(error):
+    bad = [f"BAD{i}" for i in range(5)]
+    client, breaker = make_client({t: error for t in bad})
+    for ticker in bad:
+        with pytest.raises(type(error)):
+            client.history(ticker, start=START)
+
+    assert breaker.state == "closed"
+    assert breaker.stats.failures == 0
+    assert not client.history("AAPL", start=START).empty
+
+
+@pytest.mark.parametrize("error", [
+    ConnectionError("connection reset"),
+    requests.Timeout("read timed out"),
+    http_error(503),
+    UpstreamTimeout("timed out"),
+])
+def test_upstream_failures_open_breaker(error):
+    client, breaker = make_client({"AAPL": error, "MSFT": error})
+    for ticker in ("AAPL", "MSFT"):
+        with pytest.raises(type(error)):
+            client.history(ticker, start=START)
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        client.history("GOOG", start=START)
+    assert client.stats.rejected == 1
+
+
+def test_client_error_breaks_failure_streak():
+    client, breaker = make_client({"DOWN": ConnectionError("reset"), "BAD": ValueError("no data")})
+    with pytest.raises(ConnectionError):
+        client.info("DOWN")
+    with pytest.raises(ValueError):
+        client.info("BAD")
+    with pytest.raises(ConnectionError):
+        client.info("DOWN")
+    assert breaker.state == "closed"
+
+
+def test_is_upstream_failure():
+    assert is_upstream_failure(http_error(429))
+    assert is_upstream_failure(http_error(502))
+    assert is_upstream_failure(RuntimeError("Too Many Requests. Rate limited."))
+    assert not is_upstream_failure(http_error(404))
+    assert not is_upstream_failure(ValueError("no data"))
@@ -0,0 +1,40 @@
+"""도구 메트릭: 히스토그램 분위수와 JSONL 내보내기"""
+
+import json
+
+from python.models.metrics import LATENCY_BUCKETS, CallMetrics, Histogram, ToolMetrics
+
+
+def reject_constant(name: str):
+    # json.loads는 기본적으로 Infinity/NaN을 받아들이므로 표준 JSON만 허용하도록
+    raise ValueError(f"비표준 JSON 값: {name}")
+
+
+def test_quantile_uses_bucket_upper_bounds():
+    hist = Histogram((0.1, 1.0, 10.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        hist.observe(value)
+    assert hist.quantile(0.25) == 0.1
+    assert hist.quantile(0.5) == 1.0
+    assert hist.quantile(1.0) == 10.0
+    assert Histogram((1.0,)).quantile(0.5) == 0.0
+
+
+def test_quantile_above_last_bucket_is_finite():
+    hist = Histogram((0.1, 1.0))
+    hist.observe(120.0)
+    assert hist.quantile(0.5) == 1.0
+    assert hist.quantile(0.95) == 1.0
+    assert hist.cumulative()[-1] == ("+Inf", 1)
+
+
+def test_jsonl_export_is_strict_json():
+    metrics = ToolMetrics()
+    metrics.record(CallMetrics("screen_universe", wall_seconds=LATENCY_BUCKETS[-1] * 4, result_bytes=10 ** 6))
+    lines = metrics.to_jsonl().splitlines()
+    assert len(lines) == 1
+
+    row = json.loads(lines[0], parse_constant=reject_constant)
+    assert row["tool"] == "screen_universe"
+    assert row["latency_p95"] == LATENCY_BUCKETS[-1]
+    assert row["latency_seconds"]["buckets"]["+Inf"] == 1
@@ -0,0 +1,230 @@
+"""가격 저장소: 증분 동기화, 병합, 디스크 저장, 갱신 실패 시 저장 데이터 응답"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from python.models.market_data import MarketDataClient, RetryPolicy, get_market_data, set_market_data
+from python.models.price_store import FORMAT_VERSION, OHLCV_COLUMNS, PriceStore, bars_to_calendar_days
+from python.models.rate_limit import TokenBucket
+from python.models.resilience import CircuitBreaker
+
+
+def make_frame(index: pd.DatetimeIndex, first_close: float = 100.0) -> pd.DataFrame:
+    close = first_close + np.arange(len(index), dtype=float)
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000.0},
+        index=index
+    )
+
+
+class FakeUpstream:
+    """
+    티커별 전체 이력(full)에서 요청 구간을 잘라 주는 업스트림
+
+    yfinance처럼 history는 거래소 시간대(tz-aware) 인덱스를, end는 제외 구간으로 다룹니다.
+    fail이 참이면 연결 오류를 냅니다.
+    """
+
+    def __init__(self, full: dict):
+        self.full = full
+        self.calls = []
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def _range(self, ticker, start=None, end=None):
+        frame = self.full.get(ticker, make_frame(pd.DatetimeIndex([])))
+        if start is not None:
+            frame = frame[frame.index >= start]
+        if end is not None:
+            frame = frame[frame.index < end]
+        return frame
+
+    def history(self, ticker, interval, start=None, end=None):
+        with self._lock:
+            self.calls.append(("history", ticker, start, end))
+        if self.fail:
+            raise ConnectionError("upstream down")
+        frame = self._range(ticker, start, end).copy()
+        frame.index = frame.index.tz_localize("America/New_York")
+        return frame
+
+    def download(self, tickers, interval, start=None):
+        with self._lock:
+            self.calls.append(("download", tuple(tickers), start, None))
+        if self.fail:
+            raise ConnectionError("upstream down")
+        return pd.concat({t: self._range(t, start) for t in tickers if t in self.full}, axis=1)
+
+    def info(self, ticker):
+        return {}
+
+
+TODAY = pd.Timestamp.now().normalize()
+DAYS = pd.bdate_range(end=TODAY, periods=300)
+
+
+@pytest.fixture
+def upstream():
+    fake = FakeUpstream({"AAPL": make_frame(DAYS), "MSFT": make_frame(DAYS, 500.0)})
+    previous = get_market_data()
+    set_market_data(MarketDataClient(
+        fake,
+        limiter=TokenBucket(),
+        retry=RetryPolicy(max_retries=0),
+        sleep=lambda _: None,
+        breaker=CircuitBreaker("yahoo", failure_threshold=1000, reset_seconds=1)
+    ))
+    yield fake
+    set_market_data(previous)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "prices"
+
+
+def store_for(cache_dir, refresh_seconds=3600.0):
+    return PriceStore(cache_dir=cache_dir, refresh_seconds=refresh_seconds)
+
+
+def history_calls(upstream):
+    return [c for c in upstream.calls if c[0] == "history"]
+
+
+# ============================================
+# 증분 동기화
+# ============================================
+
+def test_initial_fill_fetches_only_needed_range_and_persists(upstream, cache_dir):
+    frame = store_for(cache_dir).history("AAPL", "10d")
+
+    ((_, ticker, start, end),) = upstream.calls
+    assert ticker == "AAPL" and end is None
+    assert start == TODAY - pd.Timedelta(days=bars_to_calendar_days(10))
+    assert list(frame.columns) == list(OHLCV_COLUMNS)
+    assert frame.index.tz is None
+    pd.testing.assert_frame_equal(frame, upstream.full["AAPL"].iloc[-10:], check_freq=False)
+
+    # 새 저장소(새 프로세스)는 디스크에서 읽고 다시 조회하지 않음
+    upstream.calls.clear()
+    again = store_for(cache_dir).history("AAPL", "10d")
+    assert upstream.calls == []
+    # 디스크에서 읽은 인덱스는 ns 단위
+    pd.testing.assert_frame_equal(again, frame, check_freq=False, check_index_type=False)
+
+
+def test_tail_sync_appends_new_bars_and_revises_last(upstream, cache_dir):
+    days = DAYS[:-2]
+    upstream.full["AAPL"] = make_frame(days)
+    store = store_for(cache_dir, refresh_seconds=0.0)
+    store.history("AAPL", "10d")
+
+    # 마지막 저장 봉이 장중에 바뀌고 새 봉 두 개가 생김
+    full = make_frame(DAYS)
+    full.loc[days[-1], "Close"] = -1.0
+    upstream.full["AAPL"] = full
+    upstream.calls.clear()
+    frame = store.history("AAPL", "10d")
+
+    ((_, _, start, end),) = upstream.calls
+    assert start == days[-1] and end is None
+    assert frame.index[-1] == DAYS[-1]
+    assert frame.loc[days[-1], "Close"] == -1.0
+    pd.testing.assert_frame_equal(frame, full.iloc[-10:], check_freq=False)
+
+
+def test_head_backfill_fetches_only_missing_prefix(upstream, cache_dir):
+    store = store_for(cache_dir)
+    store.history("AAPL", "10d")
+    # 처음 조회한 구간(10 거래일을 덮는 달력 기간)의 첫 봉
+    first_stored = DAYS[DAYS >= TODAY - pd.Timedelta(days=bars_to_calendar_days(10))][0]
+
+    upstream.calls.clear()
+    frame = store.history("AAPL", "200d")
+
+    ((_, _, start, end),) = upstream.calls
+    assert start == TODAY - pd.Timedelta(days=bars_to_calendar_days(200))
+    assert end == first_stored
+    pd.testing.assert_frame_equal(frame, upstream.full["AAPL"].iloc[-200:], check_freq=False)
+
+    # 이미 덮은 구간은 다시 조회하지 않음
+    upstream.calls.clear()
+    store.history("AAPL", "50d")
+    assert upstream.calls == []
+
+
+def test_failed_refresh_serves_stored_data(upstream, cache_dir):
+    store = store_for(cache_dir, refresh_seconds=0.0)
+    stored = store.history("AAPL", "10d")
+
+    upstream.fail = True
+    frame = store.history("AAPL", "10d")
+    pd.testing.assert_frame_equal(frame, stored)
+    assert store.stale_reads == 1
+
+    # 저장 데이터가 없으면 실패를 그대로 알림
+    with pytest.raises(ConnectionError):
+        store.history("MSFT", "10d")
+
+
+def test_history_many_downloads_missing_tickers_once(upstream, cache_dir):
+    store = store_for(cache_dir)
+    store.history("AAPL", "10d")
+
+    upstream.calls.clear()
+    frames = store.history_many(["AAPL", "MSFT", "AAPL", "NONE"], "10d")
+
+    assert upstream.calls == [("download", ("MSFT", "NONE"), TODAY - pd.Timedelta(days=bars_to_calendar_days(10)), None)]
+    assert set(frames) == {"AAPL", "MSFT"}
+    pd.testing.assert_frame_equal(frames["MSFT"], upstream.full["MSFT"].iloc[-10:], check_freq=False)
+
+
+def test_history_many_serves_stored_data_when_download_fails(upstream, cache_dir):
+    store = store_for(cache_dir, refresh_seconds=0.0)
+    stored = store.history_many(["AAPL", "MSFT"], "10d")
+
+    upstream.fail = True
+    frames = store.history_many(["AAPL", "MSFT"], "10d")
+    assert set(frames) == {"AAPL", "MSFT"}
+    pd.testing.assert_frame_equal(frames["AAPL"], stored["AAPL"])
+    assert store.stale_reads == 1
+
+
+# ============================================
+# 파일 형식
+# ============================================
+
+def test_file_without_format_version_is_refetched(upstream, cache_dir):
+    store_for(cache_dir).history("AAPL", "10d")
+    path = cache_dir / "AAPL__1d.npz"
+
+    # 버전 필드가 없는 이전(UTC 기준) 형식으로 다시 저장
+    with np.load(path) as data:
+        old = {k: data[k] for k in data.files if k != "version"}
+    old["dates"] = old["dates"] + pd.Timedelta(hours=5).value
+    np.savez(path, **old)
+
+    upstream.calls.clear()
+    frame = store_for(cache_dir).history("AAPL", "10d")
+    assert len(upstream.calls) == 1
+    assert (frame.index == DAYS[-10:]).all()
+    with np.load(path) as data:
+        assert int(data["version"]) == FORMAT_VERSION
+
+
+def test_stale_reads_counted_under_concurrency(upstream, cache_dir):
+    tickers = [f"T{i}" for i in range(16)]
+    upstream.full.update({t: make_frame(DAYS) for t in tickers})
+    store = store_for(cache_dir, refresh_seconds=0.0)
+    store.history_many(tickers, "10d")
+
+    upstream.fail = True
+    threads = [threading.Thread(target=store.history, args=(t, "10d")) for t in tickers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert store.stale_reads == len(tickers)
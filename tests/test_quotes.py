@@ -0,0 +1,72 @@
+"""시세 스트림: 재생 피드로 증분 이동평균과 전체 재계산 비교"""
+
+import math
+
+import pandas as pd
+import pytest
+
+from python.bench.fakes import synthetic_ohlcv
+from python.models.quotes import QuoteStream, ReplayQuoteSource, TickerState
+
+WINDOWS = (5, 20, 60)
+TICKERS = ("AAPL", "005930.KS")
+
+
+def replay(frames, warmup=61):
+    stream = QuoteStream(list(frames), windows=WINDOWS, source=ReplayQuoteSource(frames, warmup=warmup))
+    updates = []
+    stream.subscribe(updates.append)
+    while not stream.source.exhausted:
+        stream.poll_once()
+    return stream, updates
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return {t: synthetic_ohlcv(t, years=1) for t in TICKERS}
+
+
+def test_incremental_ma_matches_full_recompute(frames):
+    stream, _ = replay(frames)
+    for ticker, frame in frames.items():
+        snap = stream.snapshot(ticker)
+        assert snap.time == frame.index[-1]
+        assert snap.close == frame["Close"].iloc[-1]
+        assert snap.bars == len(frame)
+        for w in WINDOWS:
+            expected = frame["Close"].rolling(w).mean().iloc[-1]
+            assert snap.ma[w] == pytest.approx(expected, rel=1e-9)
+            assert snap.above[w] == (snap.close > snap.ma[w])
+
+
+def test_each_bar_applied_once(frames):
+    stream, updates = replay(frames)
+    total = sum(len(f) for f in frames.values())
+    assert stream.stats.bars_new == total
+    assert stream.stats.bars_revised == 0
+    assert stream.stats.errors == 0
+    # 워밍업 폴링 한 번 + 이후 폴링마다 종목별 새 봉 하나
+    assert len(updates) == stream.stats.updates == sum(len(f) - 61 + 1 for f in frames.values())
+
+
+def test_revised_last_bar_replaces_its_close():
+    state = TickerState("AAPL", (3,))
+    days = pd.bdate_range("2024-01-01", periods=3)
+    for day, close in zip(days, (1.0, 2.0, 3.0)):
+        assert state.apply(day, (close, close, close, close, 100.0)) == "new"
+    assert state.apply(days[-1], (3.0, 9.0, 3.0, 6.0, 150.0)) == "revised"
+    assert state.apply(days[-1], (3.0, 9.0, 3.0, 6.0, 150.0)) == "same"
+    assert state.apply(days[0], (1.0, 1.0, 1.0, 1.0, 100.0)) == "stale"
+    assert state.snapshot().ma[3] == pytest.approx(3.0)
+
+
+def test_non_finite_close_is_skipped(frames):
+    frame = frames["AAPL"].copy()
+    frame.iloc[-10, frame.columns.get_loc("Close")] = math.nan
+    stream, _ = replay({"AAPL": frame})
+
+    snap = stream.snapshot("AAPL")
+    assert snap.bars == len(frame) - 1
+    clean = frame["Close"].dropna()
+    for w in WINDOWS:
+        assert snap.ma[w] == pytest.approx(clean.iloc[-w:].mean(), rel=1e-9)
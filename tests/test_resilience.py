@@ -0,0 +1,189 @@
+"""회로 차단기 상태 전이와 헤지 요청"""
+
+import threading
+import time
+
+import pytest
+
+from python.models.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgeOutcome,
+    HedgePolicy,
+    UpstreamTimeout,
+    hedged,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def fail():
+    raise ConnectionError("upstream down")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("yahoo", failure_threshold=2, reset_seconds=30, clock=clock)
+
+
+# ============================================
+# 회로 차단기
+# ============================================
+
+def test_opens_after_consecutive_failures(breaker):
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == "closed"
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.call(lambda: "never")
+    assert info.value.retry_in == pytest.approx(30)
+    assert breaker.stats.as_dict() == {"calls": 2, "failures": 2, "rejected": 1, "opened": 1}
+
+
+def test_success_resets_failure_count(breaker):
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == "closed"
+
+
+def test_half_open_probe_closes_on_success(breaker, clock):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+    clock.now = 30
+    assert breaker.state == "half_open"
+
+    breaker.before_call()
+    # 시험 호출이 끝나기 전에는 다른 호출을 막음
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.call(lambda: "ok") == "ok"
+
+
+def test_half_open_probe_reopens_on_failure(breaker, clock):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+    clock.now = 30
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == "open"
+    assert breaker.stats.opened == 2
+
+    clock.now = 59
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now = 60
+    assert breaker.state == "half_open"
+
+
+def test_release_returns_probe_without_recording(breaker, clock):
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+    clock.now = 30
+    breaker.before_call()
+    breaker.release()
+
+    # 결과가 기록되지 않았으므로 다음 호출이 다시 시험 호출
+    assert breaker.state == "half_open"
+    assert breaker.stats.failures == 2
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == "closed"
+
+
+def test_rejects_invalid_threshold():
+    with pytest.raises(ValueError):
+        CircuitBreaker("yahoo", failure_threshold=0)
+
+
+# ============================================
+# 헤지 요청
+# ============================================
+
+def slow_first(first_delay: float, result: str = "ok"):
+    """첫 호출만 first_delay초 걸리는 fetch와 호출 수 목록"""
+    calls = []
+    lock = threading.Lock()
+
+    def fetch():
+        with lock:
+            calls.append(len(calls))
+            index = calls[-1]
+        if index == 0:
+            time.sleep(first_delay)
+            return f"{result}-0"
+        return f"{result}-{index}"
+    return fetch, calls
+
+
+def test_fast_call_is_not_hedged():
+    outcome = HedgeOutcome()
+    assert hedged(lambda: "ok", HedgePolicy(deadline=1, hedge_after=0.5), outcome=outcome) == "ok"
+    assert outcome.attempts == 1
+    assert outcome.winner == 0
+
+
+def test_hedge_beats_slow_first_attempt():
+    fetch, calls = slow_first(0.5)
+    outcome = HedgeOutcome()
+    started = time.monotonic()
+    result = hedged(fetch, HedgePolicy(deadline=2, hedge_after=0.05), outcome=outcome)
+
+    assert result == "ok-1"
+    assert outcome.attempts == 2
+    assert outcome.winner == 1
+    assert time.monotonic() - started < 0.4
+    assert len(calls) == 2
+
+
+def test_hedge_skipped_when_not_allowed():
+    fetch, calls = slow_first(0.2)
+    outcome = HedgeOutcome()
+    result = hedged(fetch, HedgePolicy(deadline=2, hedge_after=0.05), may_hedge=lambda: False, outcome=outcome)
+
+    assert result == "ok-0"
+    assert outcome.attempts == 1
+    assert len(calls) == 1
+
+
+def test_unhedged_policy_sends_one_request():
+    fetch, calls = slow_first(0.2)
+    outcome = HedgeOutcome()
+    assert hedged(fetch, HedgePolicy.unhedged(deadline=2), outcome=outcome) == "ok-0"
+    assert outcome.attempts == 1
+    assert len(calls) == 1
+
+
+def test_deadline_raises_upstream_timeout():
+    started = time.monotonic()
+    with pytest.raises(UpstreamTimeout):
+        hedged(lambda: time.sleep(0.5), HedgePolicy(deadline=0.1, hedge_after=0.05))
+    assert time.monotonic() - started < 0.4
+
+
+def test_all_attempts_failing_raises_last_error():
+    outcome = HedgeOutcome()
+    with pytest.raises(ConnectionError):
+        hedged(fail, HedgePolicy(deadline=1, hedge_after=0.05), outcome=outcome)
+    assert outcome.attempts == 1
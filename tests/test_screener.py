@@ -0,0 +1,107 @@
+"""종목군 스크리너: 손으로 계산한 작은 패널로 돌파·괴리율·정렬 검증"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from python.models.screener import PricePanel, load_panel, screen, screened_count
+
+nan = np.nan
+
+# window=3 기준
+#   A: 이전 봉 9 ≤ 이전 이동평균 29/3, 마지막 12 > 이동평균 31/3 → 골든 크로스, 괴리율 +16.13%
+#   B: 이전 봉 11 ≥ 31/3, 마지막 8 < 29/3 → 데드 크로스, 괴리율 -17.24%
+#   C: 꾸준히 상승, 14 > 13 → 이동평균 위 (돌파 아님), 괴리율 +7.69%
+#   D: 이력 2봉 → window + 1봉보다 짧아 제외
+CLOSE = np.array([
+    [10, 10, 10, 9, 12],
+    [10, 10, 10, 11, 8],
+    [10, 11, 12, 13, 14],
+    [nan, nan, nan, 20, 21],
+], dtype=float)
+VOLUME = np.array([
+    [1, 1, 1, 1, 4],
+    [1, 1, 1, 1, 1],
+    [1, 1, 2, 2, 2],
+    [nan, nan, nan, 5, 5],
+], dtype=float)
+
+
+@pytest.fixture
+def panel():
+    return PricePanel(
+        tickers=["A", "B", "C", "D"],
+        close=CLOSE,
+        volume=VOLUME,
+        last_dates=["2024-01-05"] * 4
+    )
+
+
+def tickers(matches):
+    return [m.ticker for m in matches]
+
+
+def test_cross_and_gap_values(panel):
+    matches = {m.ticker: m for m in screen(panel, window=3, condition="all", volume_window=2)}
+    assert set(matches) == {"A", "B", "C"}
+
+    a, b, c = matches["A"], matches["B"], matches["C"]
+    assert a.ma == pytest.approx(31 / 3)
+    assert a.gap_pct == pytest.approx((12 - 31 / 3) / (31 / 3) * 100)
+    assert b.gap_pct == pytest.approx((8 - 29 / 3) / (29 / 3) * 100)
+    assert c.gap_pct == pytest.approx(100 / 13)
+    assert (a.cross, b.cross, c.cross) == ("golden", "dead", "")
+    # 최근 2일 평균 거래량 / 3일 평균 거래량
+    assert a.volume_ratio == pytest.approx(2.5 / 2)
+    assert c.volume_ratio == pytest.approx(1.0)
+    # volume_window가 window보다 길면 window로 제한
+    assert screen(panel, window=3, condition="golden_cross")[0].volume_ratio == pytest.approx(1.0)
+
+
+def test_conditions_and_ordering(panel):
+    assert tickers(screen(panel, window=3, condition="above")) == ["A", "C"]
+    assert tickers(screen(panel, window=3, condition="below")) == ["B"]
+    assert tickers(screen(panel, window=3, condition="golden_cross")) == ["A"]
+    assert tickers(screen(panel, window=3, condition="dead_cross")) == ["B"]
+    # below·dead_cross 외에는 괴리율 높은 순
+    assert tickers(screen(panel, window=3, condition="all")) == ["A", "C", "B"]
+    assert tickers(screen(panel, window=3, condition="all", sort_by="volume", volume_window=2)) == ["A", "B", "C"]
+
+
+def test_gap_and_volume_filters(panel):
+    assert tickers(screen(panel, window=3, condition="all", min_gap_pct=0, max_gap_pct=10)) == ["C"]
+    assert tickers(screen(panel, window=3, condition="all", min_volume_ratio=1.1, volume_window=2)) == ["A"]
+    assert tickers(screen(panel, window=3, condition="all", limit=1)) == ["A"]
+
+
+def test_short_history_excluded(panel):
+    assert screened_count(panel, 3) == 3
+    assert screened_count(panel, 1) == 4
+    with pytest.raises(ValueError):
+        screen(panel, window=5)
+
+
+class FakeStore:
+    def __init__(self, frames):
+        self.frames = frames
+
+    def history_many(self, tickers, period="1mo", interval="1d", bars=None):
+        return {t: f.iloc[-bars:] if bars else f for t, f in self.frames.items() if t in tickers}
+
+
+def make_frame(closes):
+    index = pd.bdate_range("2024-01-01", periods=len(closes))
+    return pd.DataFrame({"Close": closes, "Volume": [100.0] * len(closes)}, index=index)
+
+
+def test_load_panel_right_aligns_short_histories():
+    store = FakeStore({"LONG": make_frame([1.0, 2.0, 3.0, 4.0]), "SHORT": make_frame([7.0, 8.0])})
+    panel = load_panel(["SHORT", "LONG", "NONE", "LONG"], store=store)
+
+    assert panel.tickers == ["SHORT", "LONG"]
+    assert panel.missing == ["NONE"]
+    np.testing.assert_array_equal(panel.close, [[nan, nan, 7.0, 8.0], [1.0, 2.0, 3.0, 4.0]])
+    assert panel.last_dates == ["2024-01-02", "2024-01-04"]
+
+    panel = load_panel(["LONG", "SHORT"], bars=3, store=store)
+    np.testing.assert_array_equal(panel.close, [[2.0, 3.0, 4.0], [nan, 7.0, 8.0]])
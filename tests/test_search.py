@@ -0,0 +1,141 @@
+"""검색 클라이언트: 요청 병합, 이전 결과 대체, 원문 포함 여부"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from python.models import search
+from python.models.resilience import CircuitBreaker
+from python.models.search import LocalSearchBackend, SearchClient
+
+
+DOCUMENTS = [
+    {"title": "삼성전자 실적", "url": "https://example.com/1", "content": "삼성전자 분기 실적 발표", "raw_content": "원문 1"},
+    {"title": "애플 신제품", "url": "https://example.com/2", "content": "애플 신제품 공개", "raw_content": "원문 2"},
+]
+
+
+class SlowBackend(LocalSearchBackend):
+    """호출마다 delay초 걸리고, fail이 참이면 실패하는 백엔드"""
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(DOCUMENTS)
+        self.delay = delay
+        self.fail = False
+
+    def search(self, query, raw_content=False):
+        time.sleep(self.delay)
+        if self.fail:
+            self.calls += 1
+            raise ConnectionError("backend down")
+        return super().search(query, raw_content)
+
+    async def asearch(self, query, raw_content=False):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            self.calls += 1
+            raise ConnectionError("backend down")
+        return super().search(query, raw_content)
+
+
+def make_client(backend, **kwargs):
+    return SearchClient(backend, breaker=CircuitBreaker("tavily", 3, 30), **kwargs)
+
+
+def test_concurrent_searches_are_coalesced():
+    backend = SlowBackend(delay=0.2)
+    client = make_client(backend)
+    results = []
+
+    def run(query):
+        results.append(client.search(query))
+
+    # 대소문자·공백만 다른 쿼리도 같은 검색
+    threads = [threading.Thread(target=run, args=(q,)) for q in ["삼성전자 실적"] * 3 + ["  삼성전자   실적 "]]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert backend.calls == 1
+    assert client.coalesced == 3
+    assert all(r == results[0] for r in results)
+
+
+def test_async_searches_are_coalesced():
+    backend = SlowBackend(delay=0.1)
+    client = make_client(backend)
+
+    async def main():
+        return await asyncio.gather(*(client.asearch("애플 신제품") for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert backend.calls == 1
+    assert client.coalesced == 4
+    assert all(r == results[0] for r in results)
+
+
+def test_stale_results_served_when_backend_fails():
+    backend = SlowBackend()
+    client = make_client(backend, ttl=0.0)
+    fresh = client.search("삼성전자 실적")
+
+    backend.fail = True
+    assert client.search("삼성전자 실적") == fresh
+    assert client.stale_served == 1
+    assert client.breaker.stats.failures == 1
+
+
+def test_failure_without_stale_results_is_raised():
+    backend = SlowBackend()
+    backend.fail = True
+    client = make_client(backend)
+    with pytest.raises(ConnectionError):
+        client.search("삼성전자 실적")
+    assert client.stale_served == 0
+
+
+def test_raw_content_is_cached_separately():
+    backend = SlowBackend()
+    client = make_client(backend)
+    summary = client.search("삼성전자 실적")
+    raw = client.search("삼성전자 실적", raw_content=True)
+
+    assert backend.calls == 2
+    assert all("raw_content" not in r for r in summary)
+    assert raw[0]["raw_content"] == "원문 1"
+
+
+def test_cancelled_leader_hands_over_to_follower():
+    backend = SlowBackend(delay=0.2)
+    client = make_client(backend)
+
+    async def main():
+        leader = asyncio.ensure_future(client.asearch("애플 신제품"))
+        await asyncio.sleep(0.05)
+        follower = asyncio.ensure_future(client.asearch("애플 신제품"))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        return await follower
+
+    results = asyncio.run(main())
+    assert results[0]["title"] == "애플 신제품"
+    assert client.breaker.stats.failures == 0
+    assert client.breaker.state == "closed"
+
+
+def test_set_search_backend_closes_previous_client(monkeypatch):
+    class ClosingBackend(LocalSearchBackend):
+        closed = 0
+
+        def close(self):
+            self.closed += 1
+
+    old = ClosingBackend(DOCUMENTS)
+    monkeypatch.setattr(search, "_default_client", SearchClient(old))
+    client = search.set_search_backend(LocalSearchBackend(DOCUMENTS))
+
+    assert old.closed == 1
+    assert search.get_search_client() is client